@@ -0,0 +1,276 @@
+# benchmarks/bench_e2e.py
+"""
+오프라인 end-to-end 벤치마크: 로컬 목업 사이트(mock_site.py) 를 상대로 실제 수집 경로 실행
+- api-dom / api-js / api-xhr : smartstore_review_api.scrape_reviews
+- gui                        : smartstore_gui.extract_reviews_to_csv (로그 창 대신 기록용 객체)
+- cli                        : smartstore_review_scraper.extract_reviews_to_csv
+- 대상마다 별도 프로세스로 실행 → 최대 RSS (파이썬 프로세스 / 브라우저 자식 프로세스 중 최대) 가 섞이지 않음
+- 페이지/초, 첫 페이지까지 시간, 페이지별 시간, 마무리 시간, 서버가 보낸 바이트/요청 수(종류별)
+- 단계별 시간(goto / review_frame / scroll / content / parse / paginate ...) 은 StageTimer 결과를 그대로 포함
+- 결과는 JSON 파일로 저장 (커밋 해시 포함 → 빌드끼리 비교)
+
+    python benchmarks/bench_e2e.py --pages 13 --latency 0.05 --targets api-dom,api-xhr,cli --out e2e.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_site import MockSmartStore
+
+TARGETS = ("api-dom", "api-js", "api-xhr", "gui", "cli")
+
+# GUI / CLI 로그에서 "페이지 하나 끝" 으로 보는 줄
+GUI_PAGE_DONE = ("└ 신규",)
+CLI_PAGE_DONE = ("➡ 페이지", "⛔ 다음 페이지 없음", "⏹")
+
+
+class Clock:
+    """시작 시각 기준 페이지 완료 시각 기록"""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.page_done = []
+        self.end = None
+
+    def tick(self):
+        self.page_done.append(time.perf_counter() - self.t0)
+
+    def stop(self):
+        self.end = time.perf_counter() - self.t0
+
+    def as_dict(self) -> dict:
+        done = self.page_done
+        steps = [b - a for a, b in zip([0.0] + done, done)]
+        return {
+            "seconds": round(self.end, 3),
+            "first_page_s": round(done[0], 3) if done else None,
+            "page_s": [round(s, 3) for s in steps[1:]],
+            "teardown_s": round(self.end - done[-1], 3) if done else None,
+        }
+
+
+class LogSink(io.TextIOBase):
+    """GUI 의 log() / CLI 의 print 출력을 받아서 페이지 완료 줄마다 시각 기록"""
+
+    def __init__(self, clock: Clock, markers):
+        self.clock = clock
+        self.markers = markers
+        self.lines = 0
+
+    def log(self, message: str):
+        self.lines += 1
+        if any(m in message for m in self.markers):
+            self.clock.tick()
+
+    def write(self, s: str) -> int:
+        for line in s.splitlines():
+            self.log(line)
+        return len(s)
+
+
+def peak_rss_kb() -> dict:
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS 는 바이트 단위
+    return {
+        "python_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        "browser_max_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+
+# ==========================================
+# 자식 프로세스: 대상 하나 실행
+# ==========================================
+async def run_api(url: str, pages: int, engine: str, clock: Clock) -> dict:
+    import smartstore_review_api as api
+
+    class Progress:
+        report = None
+
+        def progress(self, n, total):
+            clock.tick()
+
+    report = {}
+    await api.browser_pool.start()
+    try:
+        reviews = await api.scrape_reviews(url, pages, {}, engine, job=Progress(), report=report)
+    finally:
+        await api.context_cache.close()
+        await api.browser_pool.close()
+        api.shutdown_parse_pool()
+    clock.stop()
+    return {"reviews": len(reviews), "timings": report.pop("timings", None), "report": report}
+
+
+def run_gui(url: str, pages: int, tmp: str, clock: Clock) -> dict:
+    # smartstore_gui 는 import 때 PLAYWRIGHT_BROWSERS_PATH 를 앱 폴더(<repo>/browsers)로 바꿈
+    # → 벤치마크에서는 원래 값(기본 Playwright 캐시 등)을 그대로 씀
+    browsers = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    import smartstore_gui
+    if browsers is None:
+        os.environ.pop("PLAYWRIGHT_BROWSERS_PATH", None)
+    else:
+        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = browsers
+
+    smartstore_gui.get_save_path = lambda filename="reviews.csv": os.path.join(tmp, filename)
+    sink = LogSink(clock, GUI_PAGE_DONE)
+    path = smartstore_gui.extract_reviews_to_csv(sink, url, pages)
+    clock.stop()
+    return {"reviews": count_rows(path), "timings": read_timings(path), "log_lines": sink.lines}
+
+
+def run_cli(url: str, pages: int, tmp: str, clock: Clock) -> dict:
+    import smartstore_review_scraper
+
+    sink = LogSink(clock, CLI_PAGE_DONE)
+    with contextlib.redirect_stdout(sink):
+        path = smartstore_review_scraper.extract_reviews_to_csv(url, pages, out_path=os.path.join(tmp, "reviews.csv"))
+    clock.stop()
+    return {"reviews": count_rows(path), "timings": read_timings(path), "log_lines": sink.lines}
+
+
+def read_timings(path):
+    from smartstore_timing import timings_path
+
+    try:
+        with open(timings_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def count_rows(path) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8-sig") as f:
+        return max(0, sum(1 for _ in f) - 1)
+
+
+def child(target: str, url: str, pages: int) -> dict:
+    os.environ["SCRAPER_HEADLESS"] = "1"
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = Clock()
+        if target.startswith("api-"):
+            result = asyncio.run(run_api(url, pages, target[4:], clock))
+        elif target == "gui":
+            result = run_gui(url, pages, tmp, clock)
+        else:
+            result = run_cli(url, pages, tmp, clock)
+    result.update(clock.as_dict())
+    done = len(clock.page_done)
+    result["pages"] = done
+    result["pages_per_s"] = round(done / clock.end, 3) if clock.end else None
+    result["rss"] = peak_rss_kb()
+    return result
+
+
+# ==========================================
+# 부모 프로세스: 목업 서버 + 대상별 자식 프로세스
+# ==========================================
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_target(site: MockSmartStore, target: str, pages: int, timeout: float, tabs: int = 1) -> dict:
+    before = site.counters()
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", target, "--url", site.product_url(), "--pages", str(pages)]
+    env = dict(os.environ, FANOUT_TABS=str(tabs))  # API 대상의 상품당 병렬 탭 수
+    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, cwd=ROOT, env=env)
+    after = site.counters()
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        errors = [l for l in lines if "Error" in l or "Exception" in l]
+        return {"error": (errors or lines or [f"exit {proc.returncode}"])[-1].strip()}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["transfer"] = {
+        "bytes": after["bytes"] - before["bytes"],
+        "requests": after["requests"] - before["requests"],
+        "by_kind": {
+            k: {
+                "requests": v["requests"] - before["by_kind"].get(k, {}).get("requests", 0),
+                "bytes": v["bytes"] - before["by_kind"].get(k, {}).get("bytes", 0),
+            }
+            for k, v in after["by_kind"].items()
+        },
+    }
+    return result
+
+
+def summarize(runs: list) -> dict:
+    ok = [r for r in runs if "error" not in r]
+    if not ok:
+        return {"runs": runs}
+    return {
+        "median_seconds": statistics.median(r["seconds"] for r in ok),
+        "median_pages_per_s": statistics.median(r["pages_per_s"] for r in ok),
+        "runs": runs,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--targets", default=",".join(TARGETS), help="쉼표로 구분: " + ",".join(TARGETS))
+    ap.add_argument("--pages", type=int, default=13, help="10 보다 크면 '다음' 번호 묶음 이동까지 거침")
+    ap.add_argument("--cards", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.0, help="목업 서버 응답 지연 (초)")
+    ap.add_argument("--lazy", type=int, default=0, help="스크롤 전 처음 보여줄 카드 수 (0 이면 전부)")
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--tabs", type=int, default=1, help="api-* 대상의 상품당 병렬 탭 수 (FANOUT_TABS)")
+    ap.add_argument("--timeout", type=float, default=600)
+    ap.add_argument("--out", default="bench_e2e.json")
+    ap.add_argument("--child", choices=TARGETS, help=argparse.SUPPRESS)
+    ap.add_argument("--url", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        result = child(args.child, args.url, args.pages)
+        sys.stdout.flush()
+        sys.__stdout__.write(json.dumps(result, ensure_ascii=False) + "\n")
+        return
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        ap.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    config = {k: getattr(args, k) for k in ("pages", "cards", "latency", "lazy", "repeat", "tabs")}
+    results = {}
+    with MockSmartStore(args.pages, args.cards, args.latency, args.lazy) as site:
+        for target in targets:
+            runs = [run_target(site, target, args.pages, args.timeout, args.tabs) for _ in range(args.repeat)]
+            results[target] = summarize(runs)
+            print(f"{target}: {json.dumps({k: v for k, v in results[target].items() if k != 'runs'})}", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_frame_extract.py
+"""
+iframe 추출 경로 비교: content() + HTML 재파싱 vs in-frame evaluate()
+- 페이지당 파이프로 넘어오는 바이트 수, 소요 시간
+- 두 경로의 결과가 parse_review_card 와 같은지 확인
+
+    python benchmarks/bench_frame_extract.py --cards 20 --pages 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from playwright.async_api import async_playwright
+
+from review_corpus import build_page
+from smartstore_frame import CARD_FIELDS_JS
+from smartstore_review_parser import parse_reviews_html, review_from_fields
+
+
+async def run(args) -> dict:
+    stats = {"content": {"bytes": 0, "seconds": 0.0}, "evaluate": {"bytes": 0, "seconds": 0.0}}
+    mismatches = 0
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for n in range(args.pages):
+            await page.set_content(build_page(args.cards, n))
+
+            t0 = time.perf_counter()
+            html = await page.content()
+            expected = parse_reviews_html(html)
+            stats["content"]["seconds"] += time.perf_counter() - t0
+            stats["content"]["bytes"] += len(html.encode("utf-8"))
+
+            t0 = time.perf_counter()
+            rows = await page.evaluate(CARD_FIELDS_JS)
+            got = [review_from_fields(r) for r in rows]
+            stats["evaluate"]["seconds"] += time.perf_counter() - t0
+            stats["evaluate"]["bytes"] += len(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+
+            if got != expected:
+                mismatches += 1
+        await browser.close()
+
+    for s in stats.values():
+        s["bytes_per_page"] = s["bytes"] / args.pages
+        s["ms_per_page"] = s["seconds"] * 1000 / args.pages
+    return {"pages": args.pages, "cards_per_page": args.cards, "mismatched_pages": mismatches, **stats}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cards", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=30)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# benchmarks/bench_parser.py
+"""
+리뷰 카드 파서 비교: 공용 lxml 파서 vs 예전 BeautifulSoup 파서 (+ 선택: in-frame JS 추출)
+- 같은 입력에서 결과가 정확히 같은지 확인 (형태별: GUI/CLI, API, smartstore_review_api_2511252315)
+- 카드/초, 카드당 처리 시간, tracemalloc 으로 잰 파이썬 할당량 (최대 사용량 / 결과로 남는 양)
+  lxml(libxml2) 트리는 C 쪽 malloc 이라 tracemalloc 에 잡히지 않음 → lxml 수치는 파이썬 객체분만
+- 입력: corpus/*.html 고정 코퍼스 + review_corpus.py 합성 코퍼스 (--synthetic 카드 수)
+
+    python benchmarks/bench_parser.py [--repeat 200] [--synthetic 10,1000,100000] [--js] [corpus.html ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+from review_corpus import build_page
+from smartstore_review_parser import api_review_from_fields, card_fields_from_html, parse_reviews_html, review_from_fields
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+
+# -----------------------------------------------------------------
+# 예전 구현 (GUI / CLI / 디버그 스크립트 공통) - 비교 기준
+# -----------------------------------------------------------------
+def legacy_parse_review_card(card):
+    nickname_el = card.select_one(".Db9Dtnf7gY strong")
+    nickname = nickname_el.get_text(strip=True) if nickname_el else ""
+    date_el = card.select_one(".Db9Dtnf7gY span:nth-of-type(1)")
+    date = date_el.get_text(strip=True) if date_el else ""
+    rating_el = card.select_one("em.n6zq2yy0KA")
+    rating = rating_el.get_text(strip=True) if rating_el else ""
+    option = ""
+    option_box = card.select_one(".b_caIle8kC")
+    if option_box:
+        all_texts = list(option_box.stripped_strings)
+        option = all_texts[0] if all_texts else ""
+    buyer_el = card.select_one(".eWRrdDdSzW")
+    buyer_info = buyer_el.get_text(" ", strip=True) if buyer_el else ""
+    label_el = card.select_one(".h8uqAeqIe7")
+    label_info = label_el.get_text(" ", strip=True) if label_el else ""
+    auto_label = " | ".join(x for x in [buyer_info, label_info] if x)
+    content = ""
+    content_box = card.select_one(".KqJ8Qqw082")
+    if content_box:
+        spans = content_box.select("span")
+        if len(spans) >= 2:
+            tags = [s.get_text(strip=True) for s in spans[:-1]]
+            body = spans[-1].get_text(" ", strip=True)
+            content = " ".join(tags + [body])
+        elif len(spans) == 1:
+            content = spans[0].get_text(" ", strip=True)
+    image_count = 0
+    img_box = card.select_one(".s30AvhHfb0")
+    if img_box:
+        count_span = img_box.select_one(".lOzR1kO8jf")
+        if count_span:
+            number = "".join(c for c in count_span.get_text(strip=True) if c.isdigit())
+            if number:
+                image_count = int(number)
+        else:
+            imgs = img_box.select("img")
+            if len(imgs) >= 1:
+                image_count = 1
+    return {
+        "nickname": nickname,
+        "date": date,
+        "rating": rating,
+        "option": option,
+        "auto_label": auto_label,
+        "content": content,
+        "image_count": image_count,
+    }
+
+
+# 예전 구현 (smartstore_review_api.py)
+def legacy_api_parse_review_card(card):
+    try:
+        nickname = card.select_one(".Db9Dtnf7gY strong").get_text(strip=True)
+    except: nickname = "익명"
+    try: date = card.select_one(".Db9Dtnf7gY span:nth-of-type(1)").get_text(strip=True)
+    except: date = ""
+    try: rating = int(card.select_one("em.n6zq2yy0KA").get_text(strip=True))
+    except: rating = 5
+    content = ""
+    try:
+        content_box = card.select_one(".KqJ8Qqw082")
+        if content_box:
+            spans = content_box.select("span")
+            if len(spans) >= 2: content = spans[-1].get_text(" ", strip=True)
+            elif len(spans) == 1: content = spans[0].get_text(" ", strip=True)
+    except: pass
+    return {"user": nickname, "date": date, "rating": rating, "content": content}
+
+
+# 예전 구현 (smartstore_review_api_2511252315.py): 본문은 박스 전체 텍스트, 빈 옵션 박스 카드는 버림
+def legacy_2511252315_parse_review_card(card):
+    try:
+        nickname = card.select_one(".Db9Dtnf7gY strong")
+        nickname = nickname.get_text(strip=True) if nickname else ""
+
+        date_el = card.select_one(".Db9Dtnf7gY span:nth-of-type(1)")
+        date = date_el.get_text(strip=True) if date_el else ""
+
+        rating = card.select_one("em.n6zq2yy0KA")
+        rating = rating.get_text(strip=True) if rating else ""
+
+        option_box = card.select_one(".b_caIle8kC")
+        option = list(option_box.stripped_strings)[0] if option_box else ""
+
+        buyer_el = card.select_one(".eWRrdDdSzW")
+        buyer_info = buyer_el.get_text(" ", strip=True) if buyer_el else ""
+
+        tag_el = card.select_one(".h8uqAeqIe7")
+        tag_info = tag_el.get_text(" ", strip=True) if tag_el else ""
+
+        auto_label = " | ".join([x for x in [buyer_info, tag_info] if x.strip()])
+
+        content_box = card.select_one(".KqJ8Qqw082")
+        content = content_box.get_text(" ", strip=True) if content_box else ""
+
+        img_box = card.select_one(".s30AvhHfb0")
+        image_count = 0
+        if img_box:
+            count_span = img_box.select_one(".lOzR1kO8jf")
+            if count_span:
+                digits = "".join(c for c in count_span.get_text(strip=True) if c.isdigit())
+                image_count = int(digits or "0")
+            elif img_box.select("img"):
+                image_count = 1
+
+        return {
+            "nickname": nickname,
+            "date": date,
+            "rating": rating,
+            "option": option,
+            "auto_label": auto_label,
+            "content": content,
+            "image_count": image_count,
+        }
+    except Exception:
+        return None
+
+
+def legacy_cards(html):
+    return BeautifulSoup(html, "lxml").select(".IwcuBUIAKf")
+
+
+def lxml_api_parse(html):
+    return [api_review_from_fields(r) for r in card_fields_from_html(html)]
+
+
+def lxml_2511252315_parse(html):
+    return parse_reviews_html(html, content_mode="box", skip_empty_option=True)
+
+
+def legacy_2511252315_parse(html):
+    return [info for info in map(legacy_2511252315_parse_review_card, legacy_cards(html)) if info]
+
+
+# 이름 → (파서, 결과 형태). 형태별로 첫 번째 파서가 비교 기준
+PARSERS = {
+    "lxml": (parse_reviews_html, "gui"),
+    "lxml-api": (lxml_api_parse, "api"),
+    "bs4-legacy": (lambda html: [legacy_parse_review_card(c) for c in legacy_cards(html)], "gui"),
+    "bs4-legacy-api": (lambda html: [legacy_api_parse_review_card(c) for c in legacy_cards(html)], "api"),
+    "lxml-2511252315": (lxml_2511252315_parse, "2511252315"),
+    "bs4-legacy-2511252315": (legacy_2511252315_parse, "2511252315"),
+}
+
+
+def compare(expected: list, got: list) -> list:
+    mismatches = [{"card": i, "expected": a, "got": b} for i, (a, b) in enumerate(zip(expected, got)) if a != b]
+    if len(expected) != len(got):
+        mismatches.append({"cards": [len(expected), len(got)]})
+    return mismatches[:5] + ([{"more": len(mismatches) - 5}] if len(mismatches) > 5 else [])
+
+
+def measure(fn, html, repeat):
+    """(초, tracemalloc 최대 KB, 결과로 남은 KB). 할당은 한 번만 따로 잼 (시간 측정에 영향 없게)"""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    seconds = time.perf_counter() - t0
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn(html)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, (peak - base) / 1024, (current - base) / 1024
+
+
+def stats_for(seconds, peak_kb, kept_kb, cards, repeat, mismatches) -> dict:
+    n = cards * repeat
+    return {
+        "cards_per_s": round(n / seconds) if seconds and n else None,
+        "us_per_card": round(seconds / n * 1e6, 2) if n else None,
+        "peak_alloc_kb": round(peak_kb, 1),
+        "peak_alloc_bytes_per_card": round(peak_kb * 1024 / cards, 1) if cards else None,
+        "kept_alloc_kb": round(kept_kb, 1),
+        "mismatches": mismatches,
+    }
+
+
+async def measure_js(inputs, repeat):
+    """in-frame 추출 (smartstore_frame.CARD_FIELDS_JS). 브라우저 안 실행 + 결과 전달까지 포함한 시간"""
+    from playwright.async_api import async_playwright
+    from smartstore_frame import CARD_FIELDS_JS
+
+    out = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for html, expected, reps in inputs:
+            await page.set_content(html)
+            reps = min(reps, repeat)
+            t0 = time.perf_counter()
+            for _ in range(reps):
+                rows = await page.evaluate(CARD_FIELDS_JS)
+                got = [review_from_fields(r) for r in rows]
+            seconds = time.perf_counter() - t0
+            out.append((seconds, reps, compare(expected, got)))
+        await browser.close()
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("corpus", nargs="*")
+    ap.add_argument("--repeat", type=int, default=200, help="입력당 최대 반복 수")
+    ap.add_argument("--max-cards", type=int, default=200_000, help="입력당 파서별로 처리할 최대 카드 수 (큰 입력은 반복을 줄임)")
+    ap.add_argument("--synthetic", default="", help="합성 코퍼스 카드 수 (쉼표로 구분, 10~100000)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--js", action="store_true", help="in-frame JS 추출도 측정 (Chromium 필요)")
+    args = ap.parse_args()
+
+    inputs = []  # (이름, html)
+    paths = args.corpus or [os.path.join(CORPUS_DIR, f) for f in sorted(os.listdir(CORPUS_DIR)) if f.endswith(".html")]
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            inputs.append((os.path.relpath(path), f.read()))
+    for count in (int(c) for c in args.synthetic.split(",") if c.strip()):
+        if not 10 <= count <= 100_000:
+            ap.error("--synthetic counts must be between 10 and 100000")
+        inputs.append((f"synthetic:{count}", build_page(count, args.seed)))
+
+    report = {"inputs": [], "totals": {}, "mismatches": 0}
+    totals = {name: [0.0, 0] for name in PARSERS}
+    js_inputs = []
+
+    for name, html in inputs:
+        expected = {}
+        entry = {"input": name, "bytes": len(html.encode("utf-8")), "parsers": {}}
+        for parser, (fn, form) in PARSERS.items():
+            result = fn(html)
+            if form not in expected:
+                expected[form] = result
+                cards = len(result)
+            mismatches = compare(expected[form], result)
+            repeat = max(1, min(args.repeat, args.max_cards // max(cards, 1)))
+            seconds, peak_kb, kept_kb = measure(fn, html, repeat)
+            entry["parsers"][parser] = stats_for(seconds, peak_kb, kept_kb, cards, repeat, mismatches)
+            report["mismatches"] += len(mismatches)
+            totals[parser][0] += seconds
+            totals[parser][1] += cards * repeat
+        entry["cards"] = cards
+        report["inputs"].append(entry)
+        js_inputs.append((html, expected["gui"], max(1, min(args.repeat, args.max_cards // max(cards, 1)))))
+
+    if args.js:
+        for entry, (seconds, reps, mismatches) in zip(report["inputs"], asyncio.run(measure_js(js_inputs, args.repeat))):
+            entry["parsers"]["in-frame-js"] = stats_for(seconds, 0.0, 0.0, entry["cards"], reps, mismatches)
+            entry["parsers"]["in-frame-js"]["peak_alloc_kb"] = None  # 브라우저 프로세스 안이라 측정 안 함
+            report["mismatches"] += len(mismatches)
+
+    for parser, (seconds, n) in totals.items():
+        report["totals"][parser] = {"cards_per_s": round(n / seconds) if seconds else None,
+                                    "us_per_card": round(seconds / n * 1e6, 2) if n else None}
+    legacy, shared = totals["bs4-legacy"][0], totals["lxml"][0]
+    if shared:
+        report["speedup"] = round(legacy / shared, 2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if report["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
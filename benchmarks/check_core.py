@@ -0,0 +1,254 @@
+# benchmarks/check_core.py
+"""
+브라우저 없이 돌리는 자체 점검 (중복 제거 / 결과 캐시 / SQLite 작업 큐)
+- smartstore_dedup: bloom 크기 계산과 실제 오탐률, exact / bloom DedupIndex 동작
+- smartstore_result_cache: TTL, 메모리 상한(LRU), 디스크 계층 재로딩, complete 플래그, invalidate
+- smartstore_jobs.SqliteJobQueue: 같은 key 재사용, claim (UPDATE … RETURNING, 쿠키 삭제, job 당 한 번),
+  죽은 워커의 running job 재큐잉, finish / 결과 TTL 삭제
+- 실패한 항목을 JSON 으로 출력하고 하나라도 있으면 exit 1 (bench_parser 의 mismatch 검사와 같은 방식)
+
+    python benchmarks/check_core.py [--bloom 200000] [--seed 0]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smartstore_dedup import BLOOM, EXACT, BloomFilter, DedupIndex, review_fingerprint
+from smartstore_jobs import DONE, FAILED, QUEUED, RUNNING, SqliteJobQueue, shard_for
+from smartstore_result_cache import ResultCache
+
+URL = "https://smartstore.naver.com/shop/products/{}"
+
+
+class Checks:
+    def __init__(self):
+        self.results = []
+
+    def check(self, section: str, name: str, ok: bool, **detail):
+        self.results.append({"section": section, "check": name, "ok": bool(ok), **detail})
+
+    @property
+    def failures(self):
+        return [r for r in self.results if not r["ok"]]
+
+
+def random_fps(rng: random.Random, n: int):
+    return {rng.getrandbits(64) - (1 << 63) for _ in range(n)}
+
+
+# -----------------------------------------------------------------
+# smartstore_dedup
+# -----------------------------------------------------------------
+def check_dedup(c: Checks, capacity: int, seed: int):
+    rng = random.Random(seed)
+    for error_rate in (0.01, 0.0001):
+        bloom = BloomFilter(capacity, error_rate)
+        # 최적 크기 m = -n ln p / (ln 2)^2, k = m/n ln 2
+        bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        c.check("dedup", f"bloom bits p={error_rate}", abs(bloom.bits - bits) <= 1, bits=bloom.bits, expected=round(bits))
+        c.check("dedup", f"bloom hashes p={error_rate}", bloom.hashes == round(bits / capacity * math.log(2)),
+                hashes=bloom.hashes)
+
+        added = random_fps(rng, capacity)
+        for fp in added:
+            bloom.add(fp)
+        missing = [fp for fp in added if fp not in bloom]
+        c.check("dedup", f"bloom no false negatives p={error_rate}", not missing, missing=len(missing))
+
+        probes = [fp for fp in random_fps(rng, capacity) if fp not in added]
+        rate = sum(fp in bloom for fp in probes) / len(probes)
+        # 표본 오차를 감안해 목표의 2배 + 3σ 까지 허용
+        limit = 2 * error_rate + 3 * math.sqrt(error_rate / len(probes))
+        c.check("dedup", f"bloom false-positive rate p={error_rate}", rate <= limit, measured=rate, limit=round(limit, 6))
+
+    a = review_fingerprint("닉네임", "24.01.01.", "옵션: 빨강", "본문  내용\n둘째 줄")
+    b = review_fingerprint(" 닉네임", "24.01.01.", "옵션: 빨강", "본문 내용 둘째 줄")
+    d = review_fingerprint("닉네임", "24.01.01.", "옵션: 빨강", "본문 내용 둘째 줄!")
+    c.check("dedup", "fingerprint ignores whitespace", a == b)
+    c.check("dedup", "fingerprint uses the whole body", a != d)
+
+    fps = list(random_fps(rng, 5000))
+    stream = fps + fps[:1000]  # 뒤 1000건은 진짜 중복
+    for mode in (EXACT, BLOOM):
+        index = DedupIndex(mode, capacity=len(fps), error_rate=0.0001)
+        new = [index.add(fp) for fp in stream]
+        c.check("dedup", f"{mode} duplicates rejected", not any(new[len(fps):]), duplicates=index.duplicates)
+        c.check("dedup", f"{mode} contains", all(fp in index for fp in fps[:100]))
+        if mode == EXACT:
+            c.check("dedup", "exact keeps every unique", all(new[:len(fps)]) and len(index) == len(fps), added=len(index))
+        else:
+            # bloom 은 오탐만큼 새 리뷰를 버릴 수 있음 (5000건, p=0.0001 → 기대값 0.5건)
+            lost = len(fps) - sum(new[:len(fps)])
+            c.check("dedup", "bloom loses at most a few", lost <= 5, lost=lost)
+            c.check("dedup", "bloom memory fixed", index.stats()["memory_bytes"] == index._bloom.nbytes)
+
+    try:
+        DedupIndex("prefix")
+        c.check("dedup", "unknown mode rejected", False)
+    except ValueError:
+        c.check("dedup", "unknown mode rejected", True)
+
+
+# -----------------------------------------------------------------
+# smartstore_result_cache
+# -----------------------------------------------------------------
+def pages_of(product: int, depth: int, per_page: int = 3):
+    return [[{"product": product, "page": p, "i": i, "content": "x" * 50} for i in range(per_page)]
+            for p in range(1, depth + 1)]
+
+
+def check_result_cache(c: Checks, tmp: str):
+    cache = ResultCache(ttl=60)
+    cache.put(URL.format(1), pages_of(1, 3))
+    hit = cache.get(URL.format(1) + "?tab=review", 2)
+    c.check("cache", "shallower request served", hit is not None and len(hit[0]) == 6)
+    c.check("cache", "deeper request misses when incomplete", cache.get(URL.format(1), 5) is None)
+    cache.put(URL.format(1), pages_of(1, 1))
+    c.check("cache", "shallow put keeps deeper entry", cache.get(URL.format(1), 3) is not None)
+
+    # 중간에 멈춘 결과 (10페이지 요청에 2페이지만 받음): 받은 깊이까지만 응답, 끝을 확인하지 않았으면 complete 아님
+    cache.put(URL.format(2), pages_of(2, 2))
+    c.check("cache", "early stop not served deeper", cache.get(URL.format(2), 10) is None
+            and cache.get(URL.format(2), 3) is None and cache.get(URL.format(2), 2) is not None)
+    cache.put(URL.format(4), [])
+    c.check("cache", "zero-page run not cached", cache.get(URL.format(4), 1) is None and cache.get(URL.format(4), 10) is None)
+    cache.put(URL.format(2), pages_of(2, 2), complete=True)
+    hit = cache.get(URL.format(2), 10)
+    c.check("cache", "complete result serves deeper requests", hit is not None and len(hit[0]) == 6)
+
+    short = ResultCache(ttl=0.2)
+    short.put(URL.format(3), pages_of(3, 1))
+    c.check("cache", "fresh entry hit", short.get(URL.format(3), 1) is not None)
+    time.sleep(0.3)
+    c.check("cache", "expired entry miss", short.get(URL.format(3), 1) is None and short.stats()["entries"] == 0)
+    expiring = ResultCache(ttl=0.2, disk_dir=os.path.join(tmp, "expiring"))
+    expiring.put(URL.format(5), pages_of(5, 1))
+    time.sleep(0.3)
+    c.check("cache", "expired disk file removed", expiring.get(URL.format(5), 1) is None
+            and not os.listdir(os.path.join(tmp, "expiring")))
+
+    size = len(json.dumps(pages_of(10, 2), ensure_ascii=False).encode("utf-8"))  # 두 자리 상품 번호 기준
+    lru = ResultCache(ttl=60, max_bytes=size * 3)
+    for product in (10, 11, 12):
+        lru.put(URL.format(product), pages_of(product, 2))
+    lru.get(URL.format(10), 2)  # 10 을 최근 사용으로
+    lru.put(URL.format(13), pages_of(13, 2))
+    c.check("cache", "LRU evicts least recently used",
+            lru.get(URL.format(11), 2) is None and lru.get(URL.format(10), 2) is not None,
+            stats=lru.stats())
+    c.check("cache", "LRU stays under max_bytes", lru.stats()["bytes"] <= lru.max_bytes)
+    huge = ResultCache(ttl=60, max_bytes=10)
+    huge.put(URL.format(14), pages_of(14, 2))
+    c.check("cache", "oversized entry not kept in memory", huge.stats()["entries"] == 0)
+
+    disk_dir = os.path.join(tmp, "result_cache")
+    first = ResultCache(ttl=60, max_bytes=size + 64, disk_dir=disk_dir)
+    first.put(URL.format(20), pages_of(20, 2), complete=True)
+    first.put(URL.format(21), pages_of(21, 2))  # 20 은 메모리에서 밀려남 → 디스크에서 다시 읽음
+    hit = first.get(URL.format(20), 4)
+    c.check("cache", "evicted entry reloaded from disk", hit is not None and len(hit[0]) == 6)
+    tiny = ResultCache(ttl=60, max_bytes=10, disk_dir=disk_dir)
+    hit = tiny.get(URL.format(20), 2)
+    c.check("cache", "oversized disk entry served without memory", hit is not None and tiny.stats()["entries"] == 0)
+    second = ResultCache(ttl=60, disk_dir=disk_dir)
+    c.check("cache", "disk entry survives restart (complete kept)", second.get(URL.format(20), 9) is not None)
+    c.check("cache", "disk entry depth kept", second.get(URL.format(21), 3) is None and second.get(URL.format(21), 2) is not None)
+    c.check("cache", "invalidate one", second.invalidate(URL.format(20)) == 1 and second.get(URL.format(20), 1) is None)
+    removed = second.invalidate()
+    c.check("cache", "invalidate all clears disk",
+            removed == 1 and not [n for n in os.listdir(disk_dir) if n.endswith(".json")], removed=removed)
+
+
+# -----------------------------------------------------------------
+# smartstore_jobs.SqliteJobQueue
+# -----------------------------------------------------------------
+def stored_cookie(path: str, job_id: str):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT cookie_data FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+
+def check_jobs(c: Checks, tmp: str):
+    path = os.path.join(tmp, "jobs.sqlite3")
+    api = SqliteJobQueue(path, shards=2, result_ttl=0.2, max_queued=10)
+    worker = SqliteJobQueue(path, shards=2)  # 다른 프로세스 대신 다른 연결
+    cookies = {"NID_AUT": "secret"}
+
+    url = URL.format(100)
+    shard = shard_for("100", 2)
+    job = api.submit(url, 3, "auto", cookies, key="k1")
+    again = api.submit(url, 3, "auto", cookies, key="k1")
+    c.check("jobs", "same key reuses queued job", job.id == again.id and job.state == QUEUED)
+    c.check("jobs", "cookie stored while queued", json.loads(stored_cookie(path, job.id)) == cookies)
+    c.check("jobs", "other shard claims nothing", worker.claim(1 - shard) is None)
+
+    claimed = worker.claim(shard)
+    c.check("jobs", "claim returns the job", claimed is not None and claimed.id == job.id and claimed.state == RUNNING)
+    c.check("jobs", "claimed job keeps cookies in memory", claimed is not None and claimed.cookie_data == cookies)
+    c.check("jobs", "cookie scrubbed on claim", stored_cookie(path, job.id) is None)
+    c.check("jobs", "job claimed only once", api.claim(shard) is None)
+    c.check("jobs", "running job still deduped", api.submit(url, 3, "auto", cookies, key="k1").id == job.id)
+
+    claimed.progress(2, 7)
+    c.check("jobs", "progress visible to api", api.get(job.id).count == 7)
+
+    # 워커가 죽었다고 보고 다시 queued 로
+    requeued = worker.requeue_orphans(shard)
+    c.check("jobs", "orphan requeued", requeued == 1 and api.get(job.id).state == QUEUED, requeued=requeued)
+    retry = worker.claim(shard)
+    c.check("jobs", "requeued job reclaimed without cookies", retry is not None and retry.id == job.id
+            and retry.cookie_data == {})
+
+    worker.finish(retry, result=[{"content": "a"}, {"content": "b"}])
+    done = api.get(job.id)
+    c.check("jobs", "finish stores result", done.state == DONE and done.result == [{"content": "a"}, {"content": "b"}]
+            and done.count == 2)
+    fresh = api.submit(url, 3, "auto", cookies, key="k1")
+    c.check("jobs", "finished key gets a new job", fresh.id != job.id)
+    failed = worker.claim(shard)
+    c.check("jobs", "new job claimed", failed is not None and failed.id == fresh.id)
+    if failed is not None:
+        worker.finish(failed, error="boom")
+    c.check("jobs", "finish with error", api.get(fresh.id).state == FAILED and api.get(fresh.id).error == "boom"
+            and stored_cookie(path, fresh.id) is None)
+
+    time.sleep(0.3)
+    api.submit(URL.format(102), 1, "auto", {}, key="k3")  # submit 이 오래된 결과를 정리
+    c.check("jobs", "finished jobs purged after result_ttl", api.get(job.id) is None and api.get(fresh.id) is None)
+
+    crowded = SqliteJobQueue(os.path.join(tmp, "full.sqlite3"), shards=1, max_queued=2)
+    crowded.submit(URL.format(200), 1, "auto", {}, key="a")
+    crowded.submit(URL.format(201), 1, "auto", {}, key="b")
+    try:
+        crowded.submit(URL.format(202), 1, "auto", {}, key="c")
+        c.check("jobs", "queue full rejected", False)
+    except Exception as e:
+        c.check("jobs", "queue full rejected", type(e).__name__ == "QueueFull", error=type(e).__name__)
+
+    for queue in (api, worker, crowded):
+        queue._conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bloom", type=int, default=200_000, help="bloom 오탐률 측정에 넣을 fingerprint 수")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    c = Checks()
+    with tempfile.TemporaryDirectory() as tmp:
+        check_dedup(c, args.bloom, args.seed)
+        check_result_cache(c, tmp)
+        check_jobs(c, tmp)
+
+    report = {"checks": len(c.results), "failures": c.failures}
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if c.failures else 0)
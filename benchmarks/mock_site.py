@@ -0,0 +1,255 @@
+# benchmarks/mock_site.py
+"""
+로컬 스마트스토어 흉내 사이트 (오프라인 벤치마크용)
+- /products/<id>          : 상품 페이지 ([data-name='REVIEW'] 탭 클릭 시 리뷰 iframe 삽입)
+- /review/frame?product=  : 리뷰 iframe. 카드(.IwcuBUIAKf) 는 JSON 을 받아 JS 로 렌더링
+- /review/api/list        : 리뷰 JSON (smartstore_review_xhr 가 읽는 키 사용) → xhr 엔진도 동작
+- 페이지네이션 .LiT9lKOVbw a.U7Lsd_y9Gg (현재 페이지 aria-current="true"). 실제 사이트처럼 번호는 10개씩,
+  묶음 앞뒤로 '이전' / '다음' 링크 (다음 묶음 첫 페이지로 이동)
+- 응답 지연(latency), 페이지 수, 페이지당 카드 수, 스크롤 지연 로딩(lazy) 설정 가능
+- 보낸 바이트 / 요청 수 집계 (경로 종류별)
+
+    python benchmarks/mock_site.py --pages 20 --latency 0.05   # 단독 실행
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+NICKS = ["wlgh", "dbsg", "kimm", "pppp", "qwer", "zxcv", "minj", "hana", "sool", "yoon"]
+WORDS = ["배송이", "빠르고", "품질이", "좋아요", "생각보다", "작아요", "재구매", "의사", "있습니다", "만족합니다",
+         "색감이", "예뻐요", "포장도", "꼼꼼했어요", "가격", "대비", "괜찮네요", "사이즈는", "정사이즈", "입니다"]
+OPTIONS = ["색상: 블랙 / 사이즈: M", "색상: 화이트 / 사이즈: L", "구성: 1+1", "용량: 500ml"]
+
+IMAGE_BYTES = b"\xff\xd8\xff" + b"\0" * 20_000  # 리뷰 사진 대신 20KB 더미
+FONT_BYTES = b"\0" * 60_000
+
+PRODUCT_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>목업 상품 {product}</title>
+<link rel="preload" href="/static/font.woff2" as="font" crossorigin>
+<script src="/static/analytics.js"></script>
+</head><body>
+<h1>목업 상품 {product}</h1>
+<img src="/static/hero.jpg" width="600">
+<div style="height:1500px">상품 상세</div>
+<ul><li><a href="#" data-name="REVIEW" id="review-tab">리뷰</a></li></ul>
+<div id="review-area"></div>
+<script>
+document.getElementById('review-tab').addEventListener('click', function (e) {{
+  e.preventDefault();
+  var area = document.getElementById('review-area');
+  if (!area.firstChild) {{
+    var f = document.createElement('iframe');
+    f.src = '/review/frame?product={product}';
+    f.style.width = '1000px'; f.style.height = '900px';
+    area.appendChild(f);
+  }}
+}});
+</script>
+</body></html>"""
+
+FRAME_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"></head><body>
+<ul id="cards"></ul>
+<div id="more" style="height:40px"></div>
+<div class="LiT9lKOVbw" id="bar"></div>
+<script>
+var PRODUCT = {product!r}, LAZY = {lazy}, LAZY_DELAY = {lazy_delay}, GROUP = 10;
+var pending = [], shown = 0, timer = null;
+function esc(s) {{ return String(s).replace(/[&<>"]/g, function (c) {{ return {{'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'}}[c]; }}); }}
+function card(r) {{
+  var d = r.createDate, tags = '';
+  if (r.reviewType === 'AFTER_USE') tags += '<span>한달사용</span>';
+  if (r.repurchase) tags += '<span>재구매</span>';
+  var opt = r.productOptionContent ? '<div class="b_caIle8kC"><span>' + esc(r.productOptionContent) + '</span></div>' : '';
+  var n = r.reviewAttaches.length, img = '';
+  if (n > 1) img = '<div class="s30AvhHfb0"><img src="' + r.reviewAttaches[0] + '"><span class="lOzR1kO8jf">' + n + '</span></div>';
+  else if (n === 1) img = '<div class="s30AvhHfb0"><img src="' + r.reviewAttaches[0] + '"></div>';
+  return '<li class="IwcuBUIAKf"><div class="Db9Dtnf7gY"><strong>' + esc(r.writerMemberNickname) + '</strong>'
+    + '<span>' + d.slice(2, 4) + '.' + d.slice(5, 7) + '.' + d.slice(8, 10) + '.</span><span>신고</span></div>'
+    + '<div><em class="n6zq2yy0KA">' + r.reviewScore + '</em></div>' + opt
+    + '<div class="KqJ8Qqw082">' + tags + '<span>' + esc(r.reviewContent) + '</span></div>' + img + '</li>';
+}}
+function showMore() {{
+  timer = null;
+  var ul = document.getElementById('cards');
+  var next = pending.slice(shown, shown + (LAZY || pending.length));
+  ul.insertAdjacentHTML('beforeend', next.map(card).join(''));
+  shown += next.length;
+}}
+function render(data, page) {{
+  document.getElementById('cards').innerHTML = '';
+  pending = data.contents; shown = 0; showMore();
+  var start = Math.floor((page - 1) / GROUP) * GROUP + 1, end = Math.min(start + GROUP - 1, data.totalPages), bar = '';
+  if (start > 1) bar += '<a href="#" class="jFLfdWHAWX" data-page="' + (start - 1) + '">이전</a>';
+  for (var p = start; p <= end; p++)
+    bar += '<a href="#" class="U7Lsd_y9Gg" data-page="' + p + '" aria-current="' + (p === page) + '">' + p + '</a>';
+  if (end < data.totalPages) bar += '<a href="#" class="jFLfdWHAWX" data-page="' + (end + 1) + '">다음</a>';
+  document.getElementById('bar').innerHTML = bar;
+  window.scrollTo(0, 0);
+}}
+function load(page) {{
+  fetch('/review/api/list?product=' + PRODUCT + '&page=' + page)
+    .then(function (r) {{ return r.json(); }})
+    .then(function (data) {{ render(data, page); }});
+}}
+window.addEventListener('scroll', function () {{
+  if (!LAZY || timer || shown >= pending.length) return;
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) timer = setTimeout(showMore, LAZY_DELAY);
+}});
+document.addEventListener('click', function (e) {{
+  var a = e.target.closest('.LiT9lKOVbw a[data-page]');
+  if (a) {{ e.preventDefault(); load(parseInt(a.getAttribute('data-page'), 10)); }}
+}});
+load(1);
+</script>
+</body></html>"""
+
+
+def make_reviews(product: str, page: int, count: int) -> list:
+    """(상품, 페이지) 마다 항상 같은 리뷰 목록"""
+    rng = random.Random(f"{product}:{page}")
+    base = date(2024, 11, 30)
+    reviews = []
+    for i in range(count):
+        n_img = rng.choice([0, 0, 1, 2, 5])
+        reviews.append({
+            "id": f"{product}-{page}-{i}",
+            "writerMemberNickname": f"{rng.choice(NICKS)}****",
+            "createDate": (base - timedelta(days=page * 3 + i // 7)).isoformat() + "T10:00:00.000+00:00",
+            "reviewScore": rng.choice([5, 5, 5, 4, 4, 3, 1]),
+            "productOptionContent": rng.choice(OPTIONS) if rng.random() < 0.6 else "",
+            "reviewType": "AFTER_USE" if rng.random() < 0.2 else "NORMAL",
+            "repurchase": rng.random() < 0.15,
+            "reviewContent": f"{page}-{i} " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 40))),
+            "reviewAttaches": [f"/img/{product}/{page}/{i}/{k}.jpg" for k in range(n_img)],
+        })
+    return reviews
+
+
+class MockSmartStore:
+    def __init__(self, pages: int = 10, cards_per_page: int = 20, latency: float = 0.0, lazy: int = 0,
+                 lazy_delay: int = 150, host: str = "127.0.0.1", port: int = 0):
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.latency = latency
+        self.lazy = lazy
+        self.lazy_delay = lazy_delay
+        self._lock = threading.Lock()
+        self.bytes_sent = 0
+        self.requests = 0
+        self.by_kind = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def product_url(self, product: str = "12345") -> str:
+        return f"{self.base_url}/products/{product}"
+
+    def start(self) -> "MockSmartStore":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, kind: str, size: int):
+        with self._lock:
+            self.bytes_sent += size
+            self.requests += 1
+            k = self.by_kind.setdefault(kind, {"requests": 0, "bytes": 0})
+            k["requests"] += 1
+            k["bytes"] += size
+
+    def counters(self) -> dict:
+        with self._lock:
+            return {"bytes": self.bytes_sent, "requests": self.requests,
+                    "by_kind": {k: dict(v) for k, v in self.by_kind.items()}}
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, kind: str, body: bytes, ctype: str, status: int = 200):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+                site._count(kind, len(body))
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                path = parts.path
+                if path.startswith("/products/"):
+                    time.sleep(site.latency)
+                    product = path.rsplit("/", 1)[-1]
+                    self._send("document", PRODUCT_HTML.format(product=product).encode("utf-8"), "text/html; charset=utf-8")
+                elif path == "/review/frame":
+                    time.sleep(site.latency)
+                    product = query.get("product", ["0"])[0]
+                    body = FRAME_HTML.format(product=product, lazy=site.lazy, lazy_delay=site.lazy_delay)
+                    self._send("document", body.encode("utf-8"), "text/html; charset=utf-8")
+                elif path == "/review/api/list":
+                    time.sleep(site.latency)
+                    product = query.get("product", ["0"])[0]
+                    page = max(1, min(site.pages, int(query.get("page", ["1"])[0])))
+                    data = {"contents": make_reviews(product, page, site.cards_per_page),
+                            "page": page, "totalPages": site.pages, "totalElements": site.pages * site.cards_per_page}
+                    self._send("xhr", json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+                elif path.startswith("/img/") or path == "/static/hero.jpg":
+                    self._send("image", IMAGE_BYTES, "image/jpeg")
+                elif path == "/static/font.woff2":
+                    self._send("font", FONT_BYTES, "font/woff2")
+                elif path == "/static/analytics.js":
+                    self._send("script", b"window.__analytics = 1;", "application/javascript")
+                else:
+                    self._send("other", b"not found", "text/plain", 404)
+
+        return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--cards", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--lazy", type=int, default=0, help="처음에 보여줄 카드 수 (0 이면 한 번에 전부)")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    site = MockSmartStore(args.pages, args.cards, args.latency, args.lazy, port=args.port).start()
+    print(f"mock product page: {site.product_url()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/review_corpus.py
+"""
+합성 리뷰 카드 코퍼스 생성기 (iframe HTML, 카드 10 ~ 100,000 개)
+- 실제 카드 마크업(.IwcuBUIAKf) 을 그대로 흉내내고, 파서가 타는 분기를 골고루 섞음
+  · 옵션 박스(.b_caIle8kC) 있음/없음, 옵션 span 여러 개
+  · 구매자 정보(.eWRrdDdSzW) / 라벨(.h8uqAeqIe7) 있음/없음
+  · 본문 박스(.KqJ8Qqw082) 의 태그 span 0~3 개 + 본문 span, 줄바꿈(<br>)·엔티티·이모지 포함
+  · 사진 박스(.s30AvhHfb0) 없음 / img 한 장 / 개수 표시(.lOzR1kO8jf) 있음
+  · 닉네임 비어 있음/닉네임 요소 없음, 별점 없음, 빈 옵션 박스, 본문 박스 안 span 밖 텍스트 같은 드문 경우도 조금씩
+- seed 가 같으면 항상 같은 HTML
+
+    python benchmarks/review_corpus.py --cards 100000 --out /tmp/cards_100k.html
+"""
+
+import argparse
+import random
+
+NICKS = ["wlgh", "dbsg", "kimm", "pppp", "qwer", "zxcv", "minj", "hana", "sool", "yoon", "jjin", "mmoo"]
+PHRASES = [
+    "배송이 생각보다 빨라서 좋았어요", "포장이 꼼꼼하게 되어 있었습니다", "색감이 사진이랑 거의 똑같아요",
+    "사이즈는 평소 입는 대로 주문하시면 됩니다", "가격 대비 품질이 괜찮네요", "재구매 의사 있습니다",
+    "조금 작게 나온 것 같아요", "마감이 아쉽지만 쓰기에는 문제 없어요", "냄새가 좀 나서 하루 환기했어요",
+    "부모님 선물로 드렸는데 좋아하세요", "두 번째 구매입니다", "세탁 후에도 줄어들지 않았어요",
+    "한 달 써보고 후기 남겨요", "배송 중에 박스가 살짝 찌그러졌어요", "생각보다 가볍고 튼튼합니다",
+    "아이가 매일 잘 쓰고 있어요", "배터리가 오래가서 만족", "설명서가 한글이라 편했어요",
+]
+EXTRAS = ["👍", "😊", "ㅎㅎ", "ㅠㅠ", "!!", "~", "&amp;", "&lt;3", "1+1", "(강추)"]
+OPTIONS = [
+    ["색상: 블랙", "사이즈: M"], ["색상: 아이보리", "사이즈: L"], ["구성: 1+1"], ["용량: 500ml", "수량: 2개"],
+    ["타입: 기본형"], ["색상: 네이비 / 사이즈: free"],
+]
+TAGS = ["한달사용", "재구매", "스토어PICK", "BEST"]
+BUYERS = ["키 160cm · 평소 사이즈 M", "키 175cm · 몸무게 70kg · 평소 사이즈 L", "20대 · 여성", "피부타입 건성"]
+LABELS = ["사이즈 정사이즈예요", "색상 화면과 같아요", "두께감 적당해요"]
+
+
+def review_text(rng: random.Random) -> str:
+    """짧은 한 줄 ~ 여러 문단 본문 (<br> 로 줄바꿈)"""
+    sentences = []
+    for _ in range(rng.choice([1, 1, 2, 3, 5, 8, 15])):
+        s = rng.choice(PHRASES)
+        if rng.random() < 0.3:
+            s += " " + rng.choice(EXTRAS)
+        sentences.append(s)
+    parts = []
+    for s in sentences:
+        parts.append(s)
+        parts.append("<br>" if rng.random() < 0.25 else ". ")
+    return "".join(parts[:-1])
+
+
+def build_card(i: int, rng: random.Random) -> str:
+    nickname = "" if rng.random() < 0.01 else f"{rng.choice(NICKS)}****"
+    writer = "" if rng.random() < 0.005 else f"<strong>{nickname}</strong>"
+    date = f"{rng.choice([23, 24, 25])}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}."
+    rating = "" if rng.random() < 0.01 else f'<div><em class="n6zq2yy0KA">{rng.choice([5, 5, 5, 4, 4, 3, 2, 1])}</em></div>'
+
+    option = ""
+    if rng.random() < 0.005:
+        option = '<div class="b_caIle8kC"><span> </span></div>'
+    elif rng.random() < 0.6:
+        option = '<div class="b_caIle8kC">' + "".join(f"<span>{o}</span>" for o in rng.choice(OPTIONS)) + "</div>"
+
+    labels = ""
+    if rng.random() < 0.4:
+        labels += f'<div class="eWRrdDdSzW"><span>{rng.choice(BUYERS)}</span></div>'
+    if rng.random() < 0.2:
+        labels += f'<div class="h8uqAeqIe7"><em>{rng.choice(LABELS)}</em></div>'
+
+    tags = "".join(f"<span>{t}</span>" for t in rng.sample(TAGS, rng.choice([0, 0, 0, 1, 1, 2, 3])))
+    loose = "<em>수정됨</em>" if rng.random() < 0.01 else ""
+    content = f'<div class="KqJ8Qqw082">{tags}{loose}<span>{review_text(rng)}</span></div>'
+
+    kind = rng.random()
+    if kind < 0.5:
+        images = ""
+    elif kind < 0.75:
+        images = '<div class="s30AvhHfb0"><img src="data:," alt=""></div>'
+    else:
+        count = rng.randint(2, 20)
+        label = str(count) if rng.random() < 0.7 else f"사진 {count}장"
+        images = f'<div class="s30AvhHfb0"><img src="data:," alt=""><span class="lOzR1kO8jf">{label}</span></div>'
+
+    return (
+        f'<li class="IwcuBUIAKf" data-id="{i}">'
+        f'<div class="Db9Dtnf7gY">{writer}<span>{date}</span><span>신고</span></div>'
+        f"{rating}{option}{labels}{content}{images}"
+        "</li>"
+    )
+
+
+def build_page(n_cards: int, seed: int = 0, filler: bool = True) -> str:
+    """카드 n_cards 개가 든 iframe HTML. filler 면 실제 iframe 처럼 카드 외 마크업/스크립트도 포함"""
+    rng = random.Random(seed)
+    cards = "".join(build_card(seed * 1000 + i, rng) for i in range(n_cards))
+    head = body = ""
+    if filler:
+        head = f"<script>var x = {'1,' * 2000}1;</script><style>.filler {{ color: #333; }}</style>"
+        body = "".join(f'<div class="filler"><p>{"광고 " * 20}</p></div>' for _ in range(50))
+    return (
+        f'<html><head><meta charset="utf-8">{head}</head><body>{body}'
+        f'<ul>{cards}</ul><div class="LiT9lKOVbw"><a class="U7Lsd_y9Gg" aria-current="true">1</a></div></body></html>'
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cards", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-filler", action="store_true")
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args()
+    if not 10 <= args.cards <= 100_000:
+        ap.error("--cards must be between 10 and 100000")
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(build_page(args.cards, args.seed, not args.no_filler))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# smartstore_browser_check.py
+"""
+브라우저 엔진(Chromium) 설치 여부 빠른 확인
+- 매번 Chromium 을 띄워보는 대신, 설치된 Playwright 가 기대하는 revision 의 폴더
+  (<browsers>/chromium-<revision>) 와 설치 완료 마커, 실행 파일이 있는지만 확인
+- 한 번 실제로 띄워 본 결과는 stamp 파일에 남기고, revision / 실행 파일이 바뀌었을 때만 다시 띄워 봄
+"""
+
+import json
+import os
+import platform
+import time
+from typing import Callable, Optional
+
+STAMP_NAME = ".browser_check.json"
+MARKER_NAME = "INSTALLATION_COMPLETE"
+
+# Playwright 버전에 따라 압축 폴더 이름이 달라서 후보를 모두 확인
+_MAC_CFT = ("Google Chrome for Testing.app", "Contents", "MacOS", "Google Chrome for Testing")
+EXECUTABLE_CANDIDATES = {
+    "Linux": [("chrome-linux64", "chrome"), ("chrome-linux-arm64", "chrome"), ("chrome-linux", "chrome")],
+    "Darwin": [
+        ("chrome-mac-arm64",) + _MAC_CFT,
+        ("chrome-mac-x64",) + _MAC_CFT,
+        ("chrome-mac", "Chromium.app", "Contents", "MacOS", "Chromium"),
+    ],
+    "Windows": [("chrome-win64", "chrome.exe"), ("chrome-win", "chrome.exe")],
+}
+
+
+def playwright_version() -> str:
+    try:
+        from playwright._repo_version import version
+        return version
+    except Exception:
+        return ""
+
+
+def expected_revision() -> Optional[str]:
+    """설치된 playwright 패키지의 driver/package/browsers.json 에 적힌 chromium revision"""
+    try:
+        import playwright
+        path = os.path.join(os.path.dirname(playwright.__file__), "driver", "package", "browsers.json")
+        with open(path, encoding="utf-8") as f:
+            browsers = json.load(f)["browsers"]
+    except Exception:
+        return None
+    for b in browsers:
+        if b.get("name") == "chromium":
+            return str(b.get("revision"))
+    return None
+
+
+def find_chromium(browser_folder: str, revision: str) -> Optional[str]:
+    """설치가 끝난 chromium-<revision> 의 실행 파일 경로 (없으면 None)"""
+    base = os.path.join(browser_folder, f"chromium-{revision}")
+    if not os.path.exists(os.path.join(base, MARKER_NAME)):
+        return None
+    for parts in EXECUTABLE_CANDIDATES.get(platform.system(), []):
+        exe = os.path.join(base, *parts)
+        if os.path.isfile(exe):
+            return exe
+    return None
+
+
+def _fingerprint(revision: str, exe: str) -> dict:
+    return {
+        "revision": revision,
+        "executable": exe,
+        "mtime": os.path.getmtime(exe),
+        "playwright": playwright_version(),
+    }
+
+
+def read_stamp(browser_folder: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(browser_folder, STAMP_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_stamp(browser_folder: str, revision: str, exe: str):
+    stamp = dict(_fingerprint(revision, exe), verified_at=time.time())
+    try:
+        with open(os.path.join(browser_folder, STAMP_NAME), "w", encoding="utf-8") as f:
+            json.dump(stamp, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+def clear_stamp(browser_folder: str):
+    try:
+        os.remove(os.path.join(browser_folder, STAMP_NAME))
+    except OSError:
+        pass
+
+
+def check_browser(browser_folder: str) -> str:
+    """
+    'ok'      : stamp 가 현재 revision / 실행 파일과 일치 (실행 확인 불필요)
+    'verify'  : 실행 파일은 있지만 아직 확인 안 됨 (stamp 없음/오래됨) → 한 번 띄워 보고 stamp
+    'missing' : 이 Playwright 버전에 맞는 Chromium 이 없음 → 설치 필요
+    """
+    revision = expected_revision()
+    if revision is None:
+        return "verify"  # browsers.json 을 못 읽는 환경이면 예전처럼 실제 실행으로 확인
+    exe = find_chromium(browser_folder, revision)
+    if exe is None:
+        return "missing"
+    stamp = read_stamp(browser_folder)
+    if stamp is None:
+        return "verify"
+    current = _fingerprint(revision, exe)
+    if any(stamp.get(k) != v for k, v in current.items()):
+        return "verify"
+    return "ok"
+
+
+def verify_browser(browser_folder: str, launch: Callable[[], None]) -> bool:
+    """launch() 로 실제 실행해 보고 성공하면 stamp 기록"""
+    try:
+        launch()
+    except Exception:
+        clear_stamp(browser_folder)
+        return False
+    revision = expected_revision()
+    exe = find_chromium(browser_folder, revision) if revision else None
+    if exe:
+        write_stamp(browser_folder, revision, exe)
+    return True
@@ -0,0 +1,336 @@
+# smartstore_browser_pool.py
+"""
+Long-lived Chromium pool for the scraper API
+- FastAPI lifespan 에서 한 번 띄워두고 요청마다 브라우저를 빌려줌
+- 브라우저당 동시 컨텍스트 수 제한 (least-loaded 선택)
+- 빌려줄 때마다 health-check, 죽은 브라우저는 재기동
+- 일정 횟수 사용한 브라우저는 유휴 상태가 되면 교체 (메모리 누수 방지)
+- 쿠키 세트별 컨텍스트 캐시 (LRU/TTL + storage_state 스냅샷)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+logger = logging.getLogger("scraper")
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        launcher: Callable[[Playwright], Awaitable[Browser]],
+        size: int = 2,
+        contexts_per_browser: int = 4,
+        max_uses: int = 200,
+    ):
+        self._launcher = launcher
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_uses = max_uses
+
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[Browser] = []
+        self._load: Dict[Browser, int] = {}
+        self._uses: Dict[Browser, int] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = asyncio.Lock()
+        self._retire_hooks: List[Callable[[Browser], Awaitable]] = []
+        self.launches = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.size * self.contexts_per_browser
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self):
+        async with self._lock:
+            if self._playwright is not None:
+                return
+            self._playwright = await async_playwright().start()
+            self._slots = asyncio.Semaphore(self.capacity)
+            for _ in range(self.size):
+                self._browsers.append(await self._launch())
+            logger.info(f"🧭 브라우저 풀 시작 (size={self.size}, contexts/browser={self.contexts_per_browser})")
+
+    async def close(self):
+        async with self._lock:
+            for browser in self._browsers:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+            self._browsers.clear()
+            self._load.clear()
+            self._uses.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            logger.info("🧭 브라우저 풀 종료")
+
+    async def _launch(self) -> Browser:
+        browser = await self._launcher(self._playwright)
+        self.launches += 1
+        self._load[browser] = 0
+        self._uses[browser] = 0
+        return browser
+
+    def on_retire(self, hook: Callable[[Browser], Awaitable]):
+        """브라우저를 닫기 직전에 호출할 hook 등록 (컨텍스트 캐시의 storage_state 스냅샷 등)"""
+        self._retire_hooks.append(hook)
+
+    async def _replace(self, browser: Browser) -> Browser:
+        """죽었거나 수명이 다한 브라우저를 같은 자리에 새로 띄움"""
+        idx = self._browsers.index(browser)
+        for hook in self._retire_hooks:
+            try:
+                await hook(browser)
+            except Exception as e:
+                logger.warning(f"⚠️ 브라우저 교체 전 정리 실패: {e}")
+        self._load.pop(browser, None)
+        self._uses.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception:
+            pass
+        fresh = await self._launch()
+        self._browsers[idx] = fresh
+        return fresh
+
+    def owns(self, browser: Browser) -> bool:
+        return browser in self._load and browser.is_connected()
+
+    async def _pick(self, prefer: Optional[Browser]) -> Browser:
+        async with self._lock:
+            # prefer 도 컨텍스트 상한 안에서만 (꽉 찼으면 가장 한가한 브라우저 → 캐시는 새 컨텍스트를 만듦)
+            if (prefer is not None and prefer in self._load and prefer.is_connected()
+                    and self._load[prefer] < self.contexts_per_browser):
+                return prefer
+            browser = min(self._browsers, key=lambda b: self._load[b])
+            if not browser.is_connected():
+                logger.warning("⚠️ 브라우저 연결 끊김 감지 → 재기동")
+                browser = await self._replace(browser)
+            return browser
+
+    async def _release(self, browser: Browser):
+        async with self._lock:
+            if browser not in self._load:
+                return
+            self._load[browser] -= 1
+            if self._load[browser] == 0 and self._uses[browser] >= self.max_uses:
+                logger.info("♻️ 사용 횟수 초과 브라우저 교체")
+                await self._replace(browser)
+
+    @asynccontextmanager
+    async def acquire(self, prefer: Optional[Browser] = None):
+        """
+        브라우저 한 대를 빌려줌. 반환 전까지 해당 브라우저의 컨텍스트 슬롯 하나를 점유.
+        prefer 가 살아있으면 그 브라우저를 우선 사용 (캐시된 컨텍스트 재사용 등).
+        """
+        if not self.started:
+            await self.start()
+        async with self._slots:
+            browser = await self._pick(prefer)
+            self._load[browser] += 1
+            self._uses[browser] += 1
+            try:
+                yield browser
+            finally:
+                await self._release(browser)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "launches": self.launches,
+            "active_contexts": sum(self._load.values()),
+            "browsers": [
+                {"connected": b.is_connected(), "load": self._load.get(b, 0), "uses": self._uses.get(b, 0)}
+                for b in self._browsers
+            ],
+        }
+
+
+# =================================================================
+# 쿠키 세트별 컨텍스트 캐시
+# =================================================================
+def cookie_key(cookies: List[dict]) -> str:
+    """정규화된 쿠키 목록의 해시 (순서 무관)"""
+    canon = sorted(
+        (c["domain"], c["path"], c["name"], str(c["value"])) for c in cookies
+    )
+    return hashlib.sha256(json.dumps(canon, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class _CachedContext:
+    __slots__ = ("context", "browser", "created", "last_used", "refs", "evicted", "tainted")
+
+    def __init__(self, context: BrowserContext, browser: Browser):
+        self.context = context
+        self.browser = browser
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.refs = 0
+        self.evicted = False
+        self.tainted = False
+
+
+class ContextCache:
+    """
+    같은 쿠키로 반복 호출하는 계정은 이미 쿠키/세션이 올라간 컨텍스트를 재사용.
+    - 살아있는 컨텍스트: LRU + 유휴 TTL, 최대 max_size 개
+    - 밀려난 컨텍스트는 storage_state 스냅샷으로 남겨서 다음 생성 때 세션 복원
+    """
+
+    def __init__(
+        self,
+        pool: BrowserPool,
+        factory: Callable[..., Awaitable[BrowserContext]],
+        max_size: int = 16,
+        ttl: float = 900.0,
+        max_snapshots: int = 256,
+    ):
+        self._pool = pool
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.max_snapshots = max_snapshots
+
+        self._entries: "OrderedDict[str, _CachedContext]" = OrderedDict()
+        self._snapshots: "OrderedDict[str, dict]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}  # 쿠키 세트별로 page() 안에 있는 호출 수
+        self.hits = 0
+        self.misses = 0
+        # 사용 횟수로 브라우저를 교체할 때 그 브라우저의 컨텍스트 세션을 스냅샷으로 넘김
+        pool.on_retire(self._retire_browser)
+
+    def _alive(self, entry: _CachedContext) -> bool:
+        return (
+            not entry.evicted
+            and self._pool.owns(entry.browser)
+            and time.monotonic() - entry.last_used < self.ttl
+        )
+
+    async def _close_entry(self, key: str, entry: _CachedContext):
+        entry.evicted = True
+        if entry.refs > 0:
+            return  # 사용 중이면 반납될 때 닫음
+        try:
+            if entry.browser.is_connected() and not entry.tainted:
+                self._snapshots[key] = await entry.context.storage_state()
+                self._snapshots.move_to_end(key)
+                while len(self._snapshots) > self.max_snapshots:
+                    old, _ = self._snapshots.popitem(last=False)
+                    self._drop_lock(old)
+            await entry.context.close()
+        except Exception:
+            pass
+
+    def _drop_lock(self, key: str):
+        """컨텍스트도 스냅샷도 없고 쓰는 호출도 없는 쿠키 세트의 잠금은 버림 (쿠키 세트 수만큼 쌓이지 않게)"""
+        if not self._lock_users.get(key) and key not in self._entries and key not in self._snapshots:
+            self._locks.pop(key, None)
+            self._lock_users.pop(key, None)
+
+    async def _evict(self):
+        for key, entry in list(self._entries.items()):
+            if not self._alive(entry):
+                self._entries.pop(key)
+                await self._close_entry(key, entry)
+        while len(self._entries) > self.max_size:
+            victim = next((k for k, e in self._entries.items() if e.refs == 0), None)
+            if victim is None:
+                break
+            await self._close_entry(victim, self._entries.pop(victim))
+
+    @asynccontextmanager
+    async def page(self, cookies: List[dict]):
+        """쿠키 세트에 맞는 (가능하면 재사용된) 컨텍스트에서 새 탭을 열어줌"""
+        key = cookie_key(cookies)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                entry = self._entries.get(key)
+                if entry is not None and not self._alive(entry):
+                    self._entries.pop(key)
+                    await self._close_entry(key, entry)
+                    entry = None
+                prefer = entry.browser if entry is not None else None
+
+            async with self._pool.acquire(prefer=prefer) as browser:
+                async with lock:
+                    entry = self._entries.get(key)
+                    if entry is None or entry.browser is not browser or not self._alive(entry):
+                        if entry is not None:
+                            self._entries.pop(key)
+                            await self._close_entry(key, entry)
+                        self.misses += 1
+                        context = await self._factory(browser, cookies, storage_state=self._snapshots.get(key))
+                        entry = _CachedContext(context, browser)
+                        self._entries[key] = entry
+                    else:
+                        self.hits += 1
+                    entry.refs += 1
+                    self._entries.move_to_end(key)
+                    await self._evict()
+
+                try:
+                    page = await entry.context.new_page()
+                    try:
+                        yield page
+                    finally:
+                        try:
+                            await page.close()
+                        except Exception:
+                            pass
+                finally:
+                    entry.refs -= 1
+                    entry.last_used = time.monotonic()
+                    if entry.evicted and entry.refs == 0:
+                        await self._close_entry(key, entry)
+        finally:
+            self._lock_users[key] -= 1
+            self._drop_lock(key)
+
+    async def _retire_browser(self, browser: Browser):
+        """교체될 브라우저의 컨텍스트를 캐시에서 빼면서 storage_state 스냅샷을 남김 → 새 브라우저에서 세션 복원"""
+        for key, entry in list(self._entries.items()):
+            if entry.browser is browser:
+                self._entries.pop(key)
+                await self._close_entry(key, entry)
+
+    async def discard(self, context: BrowserContext):
+        """에러/차단이 난 컨텍스트는 캐시에서 빼고 스냅샷도 버림"""
+        for key, entry in list(self._entries.items()):
+            if entry.context is context:
+                self._entries.pop(key)
+                self._snapshots.pop(key, None)
+                entry.tainted = True
+                await self._close_entry(key, entry)
+                self._drop_lock(key)
+
+    async def close(self):
+        for key, entry in list(self._entries.items()):
+            entry.refs = 0
+            await self._close_entry(key, entry)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "contexts": len(self._entries),
+            "snapshots": len(self._snapshots),
+            "locks": len(self._locks),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,189 @@
+# smartstore_dedup.py
+"""
+리뷰 중복 제거 (GUI / CLI / API / 디버그 스크립트 공용)
+- 정규화한 (닉네임, 날짜, 옵션, 본문 전체) → 64bit fingerprint
+  예전 content[:10] / [:15] / [:20] 접두어 키처럼 서로 다른 리뷰가 겹치지 않고, 원문 문자열도 들고 있지 않음
+- DedupIndex: exact(정확, int set) / bloom(메모리 고정, 오탐률 error_rate) 모드
+- DedupReport: 중복 리뷰 위치 + 예전 접두어 키였다면 잘못 버려졌을 리뷰(거짓 충돌) 리포트
+"""
+
+import hashlib
+import math
+import os
+import unicodedata
+from typing import Dict, List, Tuple
+
+EXACT, BLOOM = "exact", "bloom"
+
+DEDUP_MODE = os.getenv("DEDUP_MODE", EXACT)
+DEDUP_CAPACITY = int(os.getenv("DEDUP_CAPACITY", "1000000"))
+DEDUP_ERROR_RATE = float(os.getenv("DEDUP_ERROR_RATE", "0.0001"))
+
+_MASK64 = (1 << 64) - 1
+
+
+def _norm(value) -> str:
+    return " ".join(unicodedata.normalize("NFC", str(value or "")).split())
+
+
+def review_fingerprint(nickname, date, option, content) -> int:
+    """정규화된 (닉네임, 날짜, 옵션, 본문 전체) → 부호 있는 64bit 정수"""
+    key = "\x1f".join(_norm(x) for x in (nickname, date, option, content))
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def fingerprint_review(review: dict) -> int:
+    """GUI/CLI 형태 dict 의 fingerprint"""
+    return review_fingerprint(review["nickname"], review["date"], review["option"], review["content"])
+
+
+class BloomFilter:
+    """fingerprint 자체가 해시값이므로 상위/하위 32bit 로 double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.bits / capacity * math.log(2))))
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, fp: int):
+        u = fp & _MASK64
+        h1 = u & 0xFFFFFFFF
+        h2 = (u >> 32) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, fp: int) -> bool:
+        """새로 켠 비트가 있으면 True (= 처음 보는 값)"""
+        new = False
+        for pos in self._positions(fp):
+            byte, bit = pos >> 3, 1 << (pos & 7)
+            if not self._array[byte] & bit:
+                self._array[byte] |= bit
+                new = True
+        return new
+
+    def __contains__(self, fp: int) -> bool:
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fp))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._array)
+
+
+class DedupIndex:
+    """
+    fingerprint 집합.
+    bloom 모드는 capacity 개까지 오탐률 error_rate 이하 (오탐 = 새 리뷰를 중복으로 보고 버림), 메모리는 고정.
+    """
+
+    def __init__(self, mode: str = EXACT, capacity: int = DEDUP_CAPACITY, error_rate: float = DEDUP_ERROR_RATE):
+        if mode not in (EXACT, BLOOM):
+            raise ValueError(f"dedup mode must be '{EXACT}' or '{BLOOM}'")
+        self.mode = mode
+        self.capacity = capacity
+        self._set = set() if mode == EXACT else None
+        self._bloom = BloomFilter(capacity, error_rate) if mode == BLOOM else None
+        self.added = 0
+        self.duplicates = 0
+
+    @classmethod
+    def from_env(cls) -> "DedupIndex":
+        return cls(DEDUP_MODE, DEDUP_CAPACITY, DEDUP_ERROR_RATE)
+
+    def add(self, fp: int) -> bool:
+        """처음 보는 fingerprint 면 추가하고 True, 이미 본 것이면 False"""
+        if self._set is not None:
+            new = fp not in self._set
+            if new:
+                self._set.add(fp)
+        else:
+            new = self._bloom.add(fp)
+        if new:
+            self.added += 1
+        else:
+            self.duplicates += 1
+        return new
+
+    def add_review(self, review: dict) -> bool:
+        return self.add(fingerprint_review(review))
+
+    def __contains__(self, fp: int) -> bool:
+        return fp in (self._set if self._set is not None else self._bloom)
+
+    def __len__(self) -> int:
+        return self.added
+
+    def stats(self) -> dict:
+        if self._bloom is not None:
+            memory = self._bloom.nbytes
+        else:
+            memory = self._set.__sizeof__() + 32 * len(self._set)  # set 본체 + int 객체 (대략)
+        return {"mode": self.mode, "added": self.added, "duplicates": self.duplicates, "memory_bytes": memory}
+
+
+Position = Tuple[int, int]  # (페이지, 페이지 내 순번)
+
+
+class DedupReport:
+    """
+    디버그용 중복/충돌 리포트 (review_dedup_inspector1.py).
+    - duplicates: fingerprint 가 같은 리뷰 (진짜 중복)
+    - legacy_collisions: fingerprint 는 다른데 예전 접두어 키(닉네임|날짜|본문[:prefix])가 같아서
+      예전 코드라면 잘못 버렸을 리뷰
+    """
+
+    def __init__(self, legacy_prefix: int = 20):
+        self.legacy_prefix = legacy_prefix
+        self.index = DedupIndex(EXACT)
+        self._first: Dict[int, Tuple[Position, dict]] = {}
+        self._legacy: Dict[str, Tuple[int, Position]] = {}
+        self.duplicates: List[Tuple[Position, Position, dict]] = []
+        self.legacy_collisions: List[Tuple[Position, Position, str]] = []
+
+    def legacy_key(self, review: dict) -> str:
+        return f"{review['nickname']}|{review['date']}|{review['content'][:self.legacy_prefix]}"
+
+    def add(self, review: dict, page: int, idx: int) -> bool:
+        fp = fingerprint_review(review)
+        pos = (page, idx)
+        new = self.index.add(fp)
+        if new:
+            self._first[fp] = (pos, review)
+        else:
+            self.duplicates.append((self._first[fp][0], pos, review))
+
+        key = self.legacy_key(review)
+        prev = self._legacy.get(key)
+        if prev is None:
+            self._legacy[key] = (fp, pos)
+        elif prev[0] != fp:
+            self.legacy_collisions.append((prev[1], pos, key))
+        return new
+
+    def format(self) -> str:
+        lines = ["=========================", "중복 결과", "========================="]
+        if self.duplicates:
+            for prev, curr, review in self.duplicates:
+                lines.append(f"- {review['nickname']} | {review['date']} | {' '.join(review['content'].split())[:50]}")
+                lines.append(f"  이전 리뷰 위치: 페이지 {prev[0]}, #{prev[1]}")
+                lines.append(f"  중복 리뷰 위치: 페이지 {curr[0]}, #{curr[1]}")
+        else:
+            lines.append("중복 없음!")
+
+        lines += ["", f"예전 접두어 키(본문 앞 {self.legacy_prefix}자) 거짓 충돌: {len(self.legacy_collisions)}건"]
+        for prev, curr, key in self.legacy_collisions:
+            lines.append(f"- Key: {key}")
+            lines.append(f"  페이지 {prev[0]}, #{prev[1]} ↔ 페이지 {curr[0]}, #{curr[1]} (서로 다른 리뷰)")
+
+        s = self.index.stats()
+        lines += ["", f"리뷰 {s['added'] + s['duplicates']}건 / 고유 {s['added']}건 / 중복 {s['duplicates']}건"]
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict:
+        return {
+            "unique": self.index.added,
+            "duplicates": [{"first": list(a), "dup": list(b)} for a, b, _ in self.duplicates],
+            "legacy_collisions": [{"first": list(a), "other": list(b), "key": k} for a, b, k in self.legacy_collisions],
+        }
@@ -0,0 +1,282 @@
+# smartstore_export.py
+"""
+리뷰 파일 저장
+- CsvReviewWriter: 페이지가 끝날 때마다 바로 CSV 에 이어 쓰고 flush + fsync
+  중간에 죽어도 그때까지의 페이지는 온전한 CSV 로 남고, 리뷰 목록을 메모리에 쌓아두지 않음
+- 엑셀 호환을 위해 utf-8-sig (BOM) 유지
+- 타입이 있는 형식: JSONL / Parquet / Arrow IPC (Parquet·Arrow 는 zstd 압축, pyarrow 필요)
+  rating → int8, date("24.11.25.") → date, image_count → int, product_id / scraped_at 컬럼 추가
+- 상품별 파티션 데이터셋에 이어 쓰기: <root>/product_id=<id>/<수집시각>-<id>.<확장자>
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import re
+import uuid
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional, Sequence
+
+# reviews.csv 컬럼 (parse_reviews_html / review_from_fields 의 키 순서)
+CSV_COLUMNS = ("nickname", "date", "rating", "option", "auto_label", "content", "image_count")
+
+
+class CsvReviewWriter:
+    def __init__(self, path: str, columns: Sequence[str] = CSV_COLUMNS, fsync: bool = True):
+        self.path = path
+        self.columns = tuple(columns)
+        self.fsync = fsync
+        self.count = 0
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        # 줄바꿈은 예전 pandas.to_csv 와 같게 (os.linesep)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore", lineterminator=os.linesep)
+        self._writer.writeheader()
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def write_page(self, reviews: Iterable[dict]) -> int:
+        """한 페이지 분량을 쓰고 디스크까지 내림. 쓴 행 수를 돌려줌"""
+        n = 0
+        for review in reviews:
+            self._writer.writerow(review)
+            n += 1
+        self._sync()
+        self.count += n
+        return n
+
+    def close(self):
+        if not self._file.closed:
+            self._sync()
+            self._file.close()
+
+    def __enter__(self) -> "CsvReviewWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==========================================
+# 타입이 있는 형식 (JSONL / Parquet / Arrow IPC)
+# ==========================================
+EXPORT_FORMATS = ("csv", "jsonl", "parquet", "arrow")
+EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet", "arrow": ".arrow"}
+TYPED_COLUMNS = ("product_id", "scraped_at", "nickname", "date", "rating", "option", "auto_label", "content", "image_count")
+
+EXPORT_COMPRESSION = os.getenv("EXPORT_COMPRESSION", "zstd")
+
+_DATE = re.compile(r"(\d{2,4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})")
+
+
+def parse_review_date(value) -> Optional[date]:
+    """'24.11.25.' / '2024.11.25' / '2024-11-25' → date"""
+    m = _DATE.search(str(value or ""))
+    if not m:
+        return None
+    year, month, day = (int(x) for x in m.groups())
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_rating(value) -> Optional[int]:
+    try:
+        rating = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return rating if 0 <= rating <= 5 else None
+
+
+def typed_review(review: dict, product_id: str, scraped_at: datetime) -> dict:
+    """GUI/CLI 형태 dict → TYPED_COLUMNS 순서의 타입 변환된 dict"""
+    try:
+        image_count = int(review.get("image_count") or 0)
+    except (TypeError, ValueError):
+        image_count = 0
+    return {
+        "product_id": product_id,
+        "scraped_at": scraped_at,
+        "nickname": review.get("nickname") or "",
+        "date": parse_review_date(review.get("date")),
+        "rating": parse_rating(review.get("rating")),
+        "option": review.get("option") or "",
+        "auto_label": review.get("auto_label") or "",
+        "content": review.get("content") or "",
+        "image_count": image_count,
+    }
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet / Arrow 저장에는 pyarrow 가 필요합니다 (pip install pyarrow)") from e
+    return pyarrow
+
+
+def format_available(fmt: str) -> bool:
+    """추가 패키지까지 설치돼 있어 바로 쓸 수 있는 형식인지 (pyarrow 는 import 하지 않고 설치 여부만 확인)"""
+    if fmt in ("parquet", "arrow"):
+        return importlib.util.find_spec("pyarrow") is not None
+    return fmt in EXPORT_FORMATS
+
+
+def available_formats() -> tuple:
+    """이 환경에서 저장할 수 있는 형식 (pyarrow 가 없는 배포 앱에서는 csv / jsonl 만)"""
+    return tuple(f for f in EXPORT_FORMATS if format_available(f))
+
+
+def check_export_format(fmt: str):
+    """수집 시작 전에 형식/의존성 확인 → 브라우저 세션이 다 끝난 뒤에 ImportError 가 나지 않게"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {EXPORT_FORMATS}")
+    if fmt in ("parquet", "arrow"):
+        _pyarrow()
+
+
+def arrow_schema(with_product_id: bool = True):
+    pa = _pyarrow()
+    fields = [
+        ("product_id", pa.string()),
+        ("scraped_at", pa.timestamp("ms", tz="UTC")),
+        ("nickname", pa.string()),
+        ("date", pa.date32()),
+        ("rating", pa.int8()),
+        ("option", pa.string()),
+        ("auto_label", pa.string()),
+        ("content", pa.string()),
+        ("image_count", pa.int16()),
+    ]
+    return pa.schema(fields if with_product_id else fields[1:])
+
+
+class _TypedWriter:
+    def __init__(self, path: str, product_id: str, scraped_at: Optional[datetime] = None, with_product_id: bool = True):
+        self.path = path
+        self.product_id = product_id
+        self.scraped_at = scraped_at or datetime.now(timezone.utc)
+        # 파티션 데이터셋에서는 product_id 가 디렉터리 이름에 들어가므로 파일에서는 뺌
+        self.with_product_id = with_product_id
+        self.count = 0
+
+    def _records(self, reviews: Iterable[dict]) -> list:
+        records = [typed_review(r, self.product_id, self.scraped_at) for r in reviews]
+        if not self.with_product_id:
+            for r in records:
+                del r["product_id"]
+        return records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlReviewWriter(_TypedWriter):
+    """한 줄에 리뷰 하나. CSV 와 같이 페이지마다 flush + fsync"""
+
+    def __init__(self, path: str, product_id: str, scraped_at: Optional[datetime] = None, fsync: bool = True,
+                 with_product_id: bool = True):
+        super().__init__(path, product_id, scraped_at, with_product_id)
+        self.fsync = fsync
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write_page(self, reviews: Iterable[dict]) -> int:
+        records = self._records(reviews)
+        for r in records:
+            r["scraped_at"] = r["scraped_at"].isoformat()
+            r["date"] = r["date"].isoformat() if r["date"] else None
+            self._file.write(json.dumps(r, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.count += len(records)
+        return len(records)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ArrowReviewWriter(_TypedWriter):
+    """
+    Parquet(fmt="parquet") / Arrow IPC 파일(fmt="arrow"). 페이지마다 row group / record batch 하나.
+    두 형식 모두 footer 가 있어야 읽을 수 있으므로 <path>.part 에 쓰다가 close 때 이름을 바꿈.
+    """
+
+    def __init__(self, path: str, product_id: str, fmt: str = "parquet", scraped_at: Optional[datetime] = None,
+                 compression: str = EXPORT_COMPRESSION, with_product_id: bool = True):
+        super().__init__(path, product_id, scraped_at, with_product_id)
+        pa = _pyarrow()
+        self._pa = pa
+        self.fmt = fmt
+        self.schema = arrow_schema(with_product_id)
+        self._part = path + ".part"
+        if fmt == "parquet":
+            self._writer = pa.parquet.ParquetWriter(self._part, self.schema, compression=compression)
+        elif fmt == "arrow":
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(self._part, self.schema, options=options)
+        else:
+            raise ValueError(f"unknown arrow format: {fmt}")
+
+    def write_page(self, reviews: Iterable[dict]) -> int:
+        records = self._records(reviews)
+        if records:
+            self._writer.write_batch(self._pa.RecordBatch.from_pylist(records, schema=self.schema))
+        self.count += len(records)
+        return len(records)
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        os.replace(self._part, self.path)
+
+
+def dataset_file_path(root: str, product_id: str, fmt: str, scraped_at: datetime) -> str:
+    """상품별 파티션 디렉터리 안의 새 파일 경로 (기존 파일은 건드리지 않고 추가만)"""
+    safe_id = re.sub(r"[^0-9A-Za-z._-]", "_", product_id)
+    folder = os.path.join(root, f"product_id={safe_id}")
+    os.makedirs(folder, exist_ok=True)
+    name = f"{scraped_at.strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}{EXTENSIONS[fmt]}"
+    return os.path.join(folder, name)
+
+
+def open_review_writer(fmt: str, path: Optional[str] = None, product_id: str = "", dataset: Optional[str] = None,
+                       scraped_at: Optional[datetime] = None):
+    """
+    fmt 형식의 writer. dataset 을 주면 path 대신 <dataset>/product_id=<id>/ 아래 새 파일에 씀.
+    모든 writer 는 write_page(reviews) / count / close() 를 가짐.
+    """
+    check_export_format(fmt)
+    scraped_at = scraped_at or datetime.now(timezone.utc)
+    if dataset:
+        path = dataset_file_path(dataset, product_id, fmt, scraped_at)
+    if fmt == "csv":
+        return CsvReviewWriter(path)
+    if fmt == "jsonl":
+        return JsonlReviewWriter(path, product_id, scraped_at, with_product_id=not dataset)
+    return ArrowReviewWriter(path, product_id, fmt, scraped_at, with_product_id=not dataset)
+
+
+def open_dataset(root: str, fmt: str = "parquet"):
+    """파티션 데이터셋 읽기 (product_id 를 숫자가 아닌 문자열로 해석)"""
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(pa.schema([("product_id", pa.string())]), flavor="hive")
+    ds_format = {"arrow": "ipc", "jsonl": "json"}.get(fmt, fmt)
+    return ds.dataset(root, format=ds_format, partitioning=partitioning)
@@ -0,0 +1,329 @@
+# smartstore_frame.py
+"""
+리뷰 iframe 조작 헬퍼 (sync / async 공용)
+- 페이지 이동 후 고정 sleep 대신 '실제로 넘어갔는지' 신호를 기다림
+  · 페이지네이션(.LiT9lKOVbw)의 현재 페이지 번호 변경
+  · 첫 리뷰 카드(.IwcuBUIAKf) 내용 변경
+- 신호가 안 오면 timeout 후 그냥 진행 (기존 sleep 과 같은 fallback)
+- 지연 로딩 스크롤도 고정 횟수/대기 대신 카드 수가 더 늘지 않으면 바로 멈춤 (adaptive_scroll)
+"""
+
+import os
+
+# 신호가 끝내 안 올 때(마크업 변경, 페이지끼리 첫 카드가 같음 등) 기다리는 최대 시간. 예전 고정 sleep(2.5초) 수준
+PAGE_ADVANCE_TIMEOUT = int(os.getenv("PAGE_ADVANCE_TIMEOUT_MS", "3000"))  # ms
+
+# 현재 페이지 번호 + 첫 카드 식별값
+PAGE_STATE_JS = """
+() => {
+    const bar = document.querySelector('.LiT9lKOVbw');
+    let current = '';
+    if (bar) {
+        const el = bar.querySelector('[aria-current="true"], [aria-selected="true"], strong');
+        if (el) current = el.textContent.trim();
+    }
+    const card = document.querySelector('.IwcuBUIAKf');
+    const first = card ? card.textContent.trim().slice(0, 200) : '';
+    return {page: current, first: first};
+}
+"""
+
+PAGE_ADVANCED_JS = f"""
+(prev) => {{
+    const cur = ({PAGE_STATE_JS.strip()})();
+    if (!cur.first) return false;
+    return cur.first !== prev.first || (cur.page !== '' && cur.page !== prev.page);
+}}
+"""
+
+
+async def page_state(frame) -> dict:
+    try:
+        return await frame.evaluate(PAGE_STATE_JS)
+    except Exception:
+        return {"page": "", "first": ""}
+
+
+async def wait_for_page_advance(frame, before: dict, timeout: int = PAGE_ADVANCE_TIMEOUT) -> bool:
+    """클릭 이후 페이지가 바뀌면 즉시 True, timeout 이면 False"""
+    try:
+        await frame.wait_for_function(PAGE_ADVANCED_JS, arg=before, timeout=timeout, polling=100)
+        return True
+    except Exception:
+        return False
+
+
+# 번호는 10개씩 묶어서 보이고, '다음' 은 다음 묶음의 첫 페이지로 이동
+NEXT_GROUP_SELECTOR = ".LiT9lKOVbw a:has-text('다음')"
+
+# 페이지네이션 바의 현재 번호와 보이는 번호 목록
+PAGINATION_JS = """
+() => {
+    const bar = document.querySelector('.LiT9lKOVbw');
+    if (!bar) return null;
+    const numbers = Array.from(bar.querySelectorAll('a'), (a) => parseInt(a.textContent.trim(), 10))
+        .filter((n) => !isNaN(n));
+    const el = bar.querySelector('[aria-current="true"], [aria-selected="true"], strong');
+    const current = el ? parseInt(el.textContent.trim(), 10) : NaN;
+    return {current: isNaN(current) ? null : current, numbers: numbers};
+}
+"""
+
+
+async def jump_to_page(frame, target: int, max_clicks: int = 60) -> bool:
+    """
+    target 페이지로 이동. 번호가 보이면 바로 누르고, 아니면 '다음' (다음 번호 묶음) 이나
+    보이는 가장 뒤 번호를 눌러 가며 접근. 도착하면 True, 더 갈 수 없거나 클릭해도 넘어가지 않으면 False
+    """
+    for _ in range(max_clicks):
+        try:
+            info = await frame.evaluate(PAGINATION_JS)
+        except Exception:
+            return False
+        if not info:
+            return target == 1
+        current = info["current"] or 1
+        if current == target:
+            return True
+        numbers = [n for n in info["numbers"] if n != current]
+        if target in numbers:
+            link = frame.locator(f".LiT9lKOVbw a:text-is('{target}')").first
+        else:
+            ahead = [n for n in numbers if n > current]
+            next_group = frame.locator(NEXT_GROUP_SELECTOR).first
+            if await next_group.count() > 0 and (not ahead or max(ahead) < target):
+                link = next_group
+            elif ahead:
+                link = frame.locator(f".LiT9lKOVbw a:text-is('{max(ahead)}')").first
+            else:
+                return False
+        before = await page_state(frame)
+        try:
+            await link.click()
+        except Exception:
+            return False
+        if not await wait_for_page_advance(frame, before):
+            return False  # 같은 클릭을 반복하며 timeout 을 쌓지 않음
+    return False
+
+
+def page_state_sync(frame) -> dict:
+    try:
+        return frame.evaluate(PAGE_STATE_JS)
+    except Exception:
+        return {"page": "", "first": ""}
+
+
+def wait_for_page_advance_sync(frame, before: dict, timeout: int = PAGE_ADVANCE_TIMEOUT) -> bool:
+    try:
+        frame.wait_for_function(PAGE_ADVANCED_JS, arg=before, timeout=timeout, polling=100)
+        return True
+    except Exception:
+        return False
+
+
+def click_next_group_sync(frame) -> bool:
+    """보이는 번호 묶음의 끝에서 '다음' 클릭 (다음 묶음 첫 페이지). 링크가 없으면 False"""
+    link = frame.locator(NEXT_GROUP_SELECTOR).first
+    if link.count() == 0:
+        return False
+    before = page_state_sync(frame)
+    link.click()
+    wait_for_page_advance_sync(frame, before)
+    return True
+
+
+# =================================================================
+# 적응형 스크롤
+# - iframe 안에서 한 번의 evaluate 로 스크롤 루프를 돌림 (단계마다 왕복하지 않음)
+# - 스크롤 후 카드(.IwcuBUIAKf) 수가 늘거나 interval 이 다 지날 때까지 대기
+#   (MutationObserver 로 DOM 이 바뀔 때마다 카드 수를 다시 셈 → 스피너/스켈레톤 삽입만으로는 대기가 끝나지 않음)
+# - interval 내내 카드 수가 그대로일 때만: 페이지네이션 바가 보이거나 바닥이면 멈춤, 아니면 stable 회 연속이면 멈춤
+# - SCROLL_MODE=fixed 면 예전 고정 스크롤 (비교용)
+# =================================================================
+SCROLL_MODE = os.getenv("SCROLL_MODE", "adaptive")
+SCROLL_OPTIONS = {
+    "step": int(os.getenv("SCROLL_STEP", "800")),
+    "interval": int(os.getenv("SCROLL_INTERVAL_MS", "300")),
+    "stable": int(os.getenv("SCROLL_STABLE_ROUNDS", "2")),
+    "maxSteps": int(os.getenv("SCROLL_MAX_STEPS", "12")),
+    "maxMs": int(os.getenv("SCROLL_MAX_MS", "4000")),
+}
+
+ADAPTIVE_SCROLL_JS = """
+async (opt) => {
+    const count = () => document.querySelectorAll('.IwcuBUIAKf').length;
+    const barVisible = () => {
+        const bar = document.querySelector('.LiT9lKOVbw');
+        if (!bar) return false;
+        const r = bar.getBoundingClientRect();
+        return r.height > 0 && r.top < window.innerHeight && r.bottom > 0;
+    };
+    const atBottom = () => {
+        const root = document.scrollingElement || document.documentElement;
+        return window.innerHeight + window.scrollY >= root.scrollHeight - 2;
+    };
+    // 다음 DOM 변화 또는 ms 경과 중 먼저 오는 쪽까지 대기
+    let wake = null;
+    const observer = new MutationObserver(() => { if (wake) wake(); });
+    observer.observe(document.body || document.documentElement, {childList: true, subtree: true});
+    const nextChange = (ms) => new Promise((resolve) => {
+        const timer = setTimeout(resolve, ms);
+        wake = () => { clearTimeout(timer); resolve(); };
+    }).then(() => { wake = null; });
+    const t0 = performance.now();
+    let cards = count(), stable = 0, steps = 0;
+    try {
+        while (steps < opt.maxSteps && performance.now() - t0 < opt.maxMs) {
+            window.scrollBy(0, opt.step);
+            steps++;
+            const waitStart = performance.now();
+            let now = count();
+            while (now <= cards) {
+                const left = opt.interval - (performance.now() - waitStart);
+                if (left <= 0) break;
+                await nextChange(left);
+                now = count();
+            }
+            if (now > cards) {
+                cards = now;
+                stable = 0;
+                continue;
+            }
+            stable++;
+            if (cards > 0 && (barVisible() || atBottom())) break;
+            if (stable >= opt.stable) break;
+        }
+    } finally {
+        observer.disconnect();
+    }
+    return {steps: steps, cards: cards, ms: Math.round(performance.now() - t0), bar: barVisible()};
+}
+"""
+
+
+class ScrollStats:
+    """페이지별 스크롤 횟수/시간 누적, 고정 스크롤(baseline 초/페이지) 대비 절약 시간"""
+
+    def __init__(self, baseline: float):
+        self.baseline = baseline
+        self.pages = 0
+        self.steps = 0
+        self.seconds = 0.0
+        self.fallbacks = 0
+
+    def add(self, result: dict, seconds: float):
+        self.pages += 1
+        self.steps += result.get("steps", 0)
+        self.seconds += seconds
+        if result.get("error"):
+            self.fallbacks += 1
+
+    def saved(self) -> float:
+        return self.baseline * self.pages - self.seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": SCROLL_MODE,
+            "pages": self.pages,
+            "steps": self.steps,
+            "seconds": round(self.seconds, 3),
+            "baseline_seconds": round(self.baseline * self.pages, 3),
+            "saved_seconds": round(self.saved(), 3),
+            "fallbacks": self.fallbacks,
+        }
+
+
+async def adaptive_scroll(frame, options: dict = SCROLL_OPTIONS) -> dict:
+    """{steps, cards, ms, bar}. 실패하면 {"error": ...} → 호출 쪽에서 고정 스크롤로"""
+    try:
+        result = await frame.evaluate(ADAPTIVE_SCROLL_JS, options)
+    except Exception as e:
+        return {"steps": 0, "error": str(e)}
+    return result if isinstance(result, dict) else {"steps": 0, "error": "no result"}
+
+
+def adaptive_scroll_sync(frame, options: dict = SCROLL_OPTIONS) -> dict:
+    try:
+        result = frame.evaluate(ADAPTIVE_SCROLL_JS, options)
+    except Exception as e:
+        return {"steps": 0, "error": str(e)}
+    return result if isinstance(result, dict) else {"steps": 0, "error": "no result"}
+
+
+# =================================================================
+# 카드 필드 in-frame 추출
+# - iframe.content() 로 문서 전체를 넘기지 않고 카드 필드 값만 배열로 받음
+# - 결과 행은 smartstore_review_parser.FIELDS 순서
+# - BeautifulSoup get_text(strip=True) / stripped_strings 규칙을 그대로 따름
+# =================================================================
+CARD_FIELDS_JS = """
+() => {
+    const strings = (el) => {
+        const out = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        let node;
+        while ((node = walker.nextNode())) {
+            const tag = node.parentNode && node.parentNode.nodeName;
+            if (tag === 'SCRIPT' || tag === 'STYLE') continue;
+            const t = node.nodeValue.trim();
+            if (t) out.push(t);
+        }
+        return out;
+    };
+    const text = (el, sep) => el ? strings(el).join(sep) : '';
+
+    return Array.from(document.querySelectorAll('.IwcuBUIAKf'), (card) => {
+        const q = (sel) => card.querySelector(sel);
+
+        const optionBox = q('.b_caIle8kC');
+        const option = optionBox ? (strings(optionBox)[0] || '') : '';
+        const autoLabel = [text(q('.eWRrdDdSzW'), ' '), text(q('.h8uqAeqIe7'), ' ')]
+            .filter(Boolean).join(' | ');
+
+        let tags = [];
+        let body = '';
+        const contentBox = q('.KqJ8Qqw082');
+        if (contentBox) {
+            const spans = Array.from(contentBox.querySelectorAll('span'));
+            if (spans.length >= 2) {
+                tags = spans.slice(0, -1).map((s) => text(s, ''));
+                body = text(spans[spans.length - 1], ' ');
+            } else if (spans.length === 1) {
+                body = text(spans[0], ' ');
+            }
+        }
+
+        let imageCount = 0;
+        const imgBox = q('.s30AvhHfb0');
+        if (imgBox) {
+            const countSpan = imgBox.querySelector('.lOzR1kO8jf');
+            if (countSpan) {
+                const digits = text(countSpan, '').replace(/[^0-9]/g, '');
+                if (digits) imageCount = parseInt(digits, 10);
+            } else if (imgBox.querySelector('img')) {
+                imageCount = 1;
+            }
+        }
+
+        return [
+            q('.Db9Dtnf7gY strong') ? text(q('.Db9Dtnf7gY strong'), '') : null,
+            text(q('.Db9Dtnf7gY span:nth-of-type(1)'), ''),
+            text(q('em.n6zq2yy0KA'), ''),
+            option,
+            autoLabel,
+            tags,
+            body,
+            imageCount,
+        ];
+    });
+}
+"""
+
+
+async def extract_card_fields(frame) -> list:
+    return [tuple(row) for row in await frame.evaluate(CARD_FIELDS_JS)]
+
+
+def extract_card_fields_sync(frame) -> list:
+    return [tuple(row) for row in frame.evaluate(CARD_FIELDS_JS)]
@@ -1,387 +1,504 @@
-import sys
-import os
-import platform
-import time
-import pandas as pd
-import threading
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-
-# =================================================================
-# [1] 브라우저 설치 경로 설정 (Mac 호환성)
-# =================================================================
-def get_browser_path():
-    system_os = platform.system()
-    if system_os == 'Darwin':
-        user_home = os.path.expanduser("~")
-        base_path = os.path.join(user_home, "Library", "Application Support", "SmartStoreScraper")
-    else:
-        if getattr(sys, 'frozen', False):
-            base_path = os.path.dirname(sys.executable)
-        else:
-            base_path = os.path.dirname(os.path.abspath(__file__))
-
-    browser_folder = os.path.join(base_path, "browsers")
-    try:
-        os.makedirs(browser_folder, exist_ok=True)
-    except Exception:
-        pass
-    return browser_folder
-
-BROWSER_FOLDER = get_browser_path()
-os.environ["PLAYWRIGHT_BROWSERS_PATH"] = BROWSER_FOLDER
-
-# =================================================================
-# [2] 결과 파일 저장 경로 설정
-# =================================================================
-def get_save_path(filename="reviews.csv"):
-    user_home = os.path.expanduser("~")
-    download_folder = os.path.join(user_home, "Downloads")
-    if not os.path.exists(download_folder):
-        download_folder = os.path.join(user_home, "Desktop")
-    return os.path.join(download_folder, filename)
-
-# =================================================================
-# [3] 스크롤 기능
-# =================================================================
-def smooth_scroll(target_frame, steps=10, delay=0.2):
-    try:
-        for _ in range(steps):
-            target_frame.evaluate("window.scrollBy(0, 800)")
-            time.sleep(delay)
-    except Exception:
-        pass
-
-# =================================================================
-# [4] GUI 클래스
-# =================================================================
-class ScraperGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("네이버 스마트스토어 리뷰 수집기 (Anti-Bot Applied)")
-        self.root.geometry("600x550")
-        self.root.resizable(False, False)
-
-        # 맥북 단축키(Command+C, V) 활성화
-        self.setup_copy_paste(root)
-
-        style = ttk.Style()
-        style.configure("TLabel", font=("Malgun Gothic", 10))
-        style.configure("TButton", font=("Malgun Gothic", 10, "bold"))
-
-        # 입력 프레임
-        input_frame = ttk.LabelFrame(root, text="수집 설정", padding=(10, 10))
-        input_frame.pack(fill="x", padx=10, pady=10)
-
-        # URL 입력창
-        ttk.Label(input_frame, text="상품 URL:").grid(row=0, column=0, sticky="w", pady=5)
-        self.url_entry = ttk.Entry(input_frame, width=50)
-        self.url_entry.grid(row=0, column=1, padx=5, pady=5)
-        
-        # [핵심] URL 입력창에 우클릭 메뉴 연결
-        self.bind_right_click(self.url_entry)
-
-        # 페이지 수 입력창
-        ttk.Label(input_frame, text="수집 페이지 수:").grid(row=1, column=0, sticky="w", pady=5)
-        self.limit_entry = ttk.Entry(input_frame, width=10)
-        self.limit_entry.insert(0, "13") 
-        self.limit_entry.grid(row=1, column=1, sticky="w", padx=5, pady=5)
-        
-        # [핵심] 페이지 수 입력창에도 우클릭 메뉴 연결
-        self.bind_right_click(self.limit_entry)
-
-        # 시작 버튼
-        self.start_btn = ttk.Button(input_frame, text="수집 시작", command=self.start_thread)
-        self.start_btn.grid(row=2, column=0, columnspan=2, pady=10, sticky="ew")
-
-        # 로그 프레임
-        log_frame = ttk.LabelFrame(root, text="진행 상황", padding=(10, 10))
-        log_frame.pack(fill="both", expand=True, padx=10, pady=5)
-
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, state='disabled', font=("Consolas", 9))
-        self.log_text.pack(fill="both", expand=True)
-
-        self.log("프로그램이 준비되었습니다.")
-        self.log("💡 Tip: 붙여넣기가 안 되면 '우클릭'을 해보세요!")
-        save_path = get_save_path()
-        self.log(f"💾 저장 위치: {save_path}")
-
-    # -----------------------------------------------------------
-    # [기능 1] 맥북용 Command+C, V 단축키 강제 활성화
-    # -----------------------------------------------------------
-    def setup_copy_paste(self, root):
-        if platform.system() == 'Darwin':  # Mac OS인 경우
-            try:
-                # Command+C (복사)
-                root.bind_class("Entry", "<Command-c>", lambda e: e.widget.event_generate("<<Copy>>"))
-                root.bind_class("Text", "<Command-c>", lambda e: e.widget.event_generate("<<Copy>>"))
-                
-                # Command+V (붙여넣기)
-                root.bind_class("Entry", "<Command-v>", lambda e: e.widget.event_generate("<<Paste>>"))
-                root.bind_class("Text", "<Command-v>", lambda e: e.widget.event_generate("<<Paste>>"))
-                
-                # Command+A (전체 선택)
-                root.bind_class("Entry", "<Command-a>", lambda e: e.widget.event_generate("<<SelectAll>>"))
-                root.bind_class("Text", "<Command-a>", lambda e: e.widget.event_generate("<<SelectAll>>"))
-            except Exception:
-                pass
-
-    # -----------------------------------------------------------
-    # [기능 2] 마우스 우클릭 메뉴 (붙여넣기) 추가
-    # -----------------------------------------------------------
-    def bind_right_click(self, widget):
-        # 우클릭 메뉴 생성
-        menu = tk.Menu(widget, tearoff=0)
-        menu.add_command(label="잘라내기 (Cut)", command=lambda: widget.event_generate("<<Cut>>"))
-        menu.add_command(label="복사 (Copy)", command=lambda: widget.event_generate("<<Copy>>"))
-        menu.add_command(label="붙여넣기 (Paste)", command=lambda: widget.event_generate("<<Paste>>"))
-        
-        def show_menu(event):
-            menu.post(event.x_root, event.y_root)
-
-        # Mac은 Button-2 또는 Button-3, 윈도우는 Button-3
-        if platform.system() == "Darwin":
-            widget.bind("<Button-2>", show_menu)
-            widget.bind("<Button-3>", show_menu)
-        else:
-            widget.bind("<Button-3>", show_menu)
-
-    # -----------------------------------------------------------
-    # 로그 및 스레드 처리 (이전과 동일)
-    # -----------------------------------------------------------
-    def log(self, message):
-        self.root.after(0, self._update_log, message)
-
-    def _update_log(self, message):
-        self.log_text.configure(state='normal')
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.configure(state='disabled')
-
-    def start_thread(self):
-        url = self.url_entry.get().strip()
-        limit = self.limit_entry.get().strip()
-
-        if not url:
-            messagebox.showwarning("경고", "URL을 입력해주세요!")
-            return
-        if not limit.isdigit():
-            messagebox.showwarning("경고", "페이지 수는 숫자만 입력해주세요!")
-            return
-
-        self.start_btn.config(state="disabled")
-        self.log("\n[작업 시작] --------------------------------")
-        
-        t = threading.Thread(target=self.run_scraper, args=(url, int(limit)))
-        t.daemon = True
-        t.start()
-
-    def run_scraper(self, url, limit_pages):
-        try:
-            self.install_browser_if_needed()
-            extract_reviews_to_csv(self, url, limit_pages)
-            save_path = get_save_path()
-            self.root.after(0, lambda: messagebox.showinfo("완료", f"수집 완료!\n파일 위치: {save_path}"))
-        except Exception as e:
-            self.log(f"❌ 에러 발생: {e}")
-            self.root.after(0, lambda: messagebox.showerror("에러", f"오류가 발생했습니다.\n{e}"))
-        finally:
-            self.root.after(0, lambda: self.start_btn.config(state="normal"))
-
-    def install_browser_if_needed(self):
-        self.log("⚙️ 브라우저 엔진 상태 확인 중...")
-        try:
-            with sync_playwright() as p:
-                p.chromium.launch(headless=True).close()
-            self.log("✅ 브라우저 엔진 정상.")
-        except Exception:
-            self.log("🚀 브라우저 엔진 자동 설치 시작 (1~2분 소요)...")
-            try:
-                from playwright.__main__ import main
-                old_argv = sys.argv
-                sys.argv = ["playwright", "install", "chromium"]
-                try:
-                    main()
-                except SystemExit:
-                    pass
-                finally:
-                    sys.argv = old_argv
-                self.log("✅ 브라우저 설치 완료!")
-            except Exception as e:
-                self.log(f"❌ 설치 실패: {e}")
-                raise e
-
-# =================================================================
-# [5] 웹 스크래핑 로직 (Anti-Bot 기능 추가됨)
-# =================================================================
-def parse_review_card(card):
-    nickname_el = card.select_one(".Db9Dtnf7gY strong")
-    nickname = nickname_el.get_text(strip=True) if nickname_el else ""
-    date_el = card.select_one(".Db9Dtnf7gY span:nth-of-type(1)")
-    date = date_el.get_text(strip=True) if date_el else ""
-    rating_el = card.select_one("em.n6zq2yy0KA")
-    rating = rating_el.get_text(strip=True) if rating_el else ""
-    option = ""
-    option_box = card.select_one(".b_caIle8kC")
-    if option_box:
-        all_texts = list(option_box.stripped_strings)
-        option = all_texts[0] if all_texts else ""
-    buyer_el = card.select_one(".eWRrdDdSzW")
-    buyer_info = buyer_el.get_text(" ", strip=True) if buyer_el else ""
-    label_el = card.select_one(".h8uqAeqIe7")
-    label_info = label_el.get_text(" ", strip=True) if label_el else ""
-    auto_label = " | ".join(x for x in [buyer_info, label_info] if x)
-    content = ""
-    content_box = card.select_one(".KqJ8Qqw082")
-    if content_box:
-        spans = content_box.select("span")
-        if len(spans) >= 2:
-            tags = [s.get_text(strip=True) for s in spans[:-1]]
-            body = spans[-1].get_text(" ", strip=True)
-            content = " ".join(tags + [body])
-        elif len(spans) == 1:
-            content = spans[0].get_text(" ", strip=True)
-    image_count = 0
-    img_box = card.select_one(".s30AvhHfb0")
-    if img_box:
-        count_span = img_box.select_one(".lOzR1kO8jf")
-        if count_span:
-            number = "".join(c for c in count_span.get_text(strip=True) if c.isdigit())
-            if number:
-                image_count = int(number)
-        else:
-            imgs = img_box.select("img")
-            if len(imgs) >= 1:
-                image_count = 1
-    return {
-        "nickname": nickname,
-        "date": date,
-        "rating": rating,
-        "option": option,
-        "auto_label": auto_label,
-        "content": content,
-        "image_count": image_count,
-    }
-
-def load_review_frame(gui, page):
-    gui.log("🔎 리뷰탭 탐색 중…")
-    for _ in range(40):
-        btn = page.locator('[data-name="REVIEW"]').first
-        if btn.is_visible():
-            btn.scroll_into_view_if_needed()
-            time.sleep(0.5)
-            btn.click()
-            gui.log("✔ 리뷰탭 클릭 성공")
-            break
-        page.mouse.wheel(0, 600)
-        time.sleep(0.2)
-    else:
-        gui.log("❌ 리뷰탭 못 찾음")
-        return page
-
-    gui.log("⌛ 리뷰 iframe 로딩 대기…")
-    for _ in range(80):
-        for f in page.frames:
-            lower = f.url.lower()
-            if ("review" in lower) or ("reviews" in lower) or ("pstatic" in lower):
-                gui.log(f"✔ iframe 감지됨")
-                return f
-        time.sleep(0.25)
-    return page
-
-def load_next_page(gui, target_frame, current_page_num):
-    next_page_num = current_page_num + 1
-    next_btn = target_frame.locator(f'.LiT9lKOVbw a:has-text("{next_page_num}")').first
-    if next_btn.count() > 0:
-        gui.log(f"➡ 페이지 {next_page_num} 이동")
-        next_btn.click()
-        time.sleep(2)
-        return True
-    else:
-        return False
-
-# + [수정됨] Anti-Bot 설정이 적용된 함수
-def extract_reviews_to_csv(gui, url, limit_pages=13):
-    reviews = []
-    seen = set()
-
-    # + 실제 사람처럼 보이기 위한 User-Agent 설정
-    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        
-        # + [핵심 수정] 새로운 컨텍스트에 User-Agent와 화면 크기, 로케일 설정
-        context = browser.new_context(
-            user_agent=USER_AGENT,
-            viewport={"width": 1920, "height": 1080},
-            locale="ko-KR"
-        )
-        
-        page = context.new_page()
-
-        # + [핵심 수정] navigator.webdriver 속성을 숨겨서 봇 탐지 우회
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            })
-        """)
-
-        gui.log(f"⏳ 페이지 접속 중: {url}")
-        try:
-            # 타임아웃 60초, DOM 로드 완료 시점까지 대기
-            page.goto(url, timeout=60000, wait_until="domcontentloaded")
-        except Exception:
-            gui.log("⚠️ 접속 지연 (계속 진행)")
-        
-        # + 혹시 차단 페이지로 갔는지 확인하는 로직 추가
-        time.sleep(2)
-        if "상품이 존재하지 않습니다" in page.title() or page.locator("text=상품이 존재하지 않습니다").count() > 0:
-             gui.log("❌ 차단됨: 네이버가 봇 접근을 막았습니다.")
-             gui.log("👉 해결책: 잠시 후 다시 시도하거나, 크롬 익스텐션 방식을 사용하세요.")
-             browser.close()
-             return
-
-        time.sleep(3)
-        target_frame = load_review_frame(gui, page)
-        
-        if target_frame is page and target_frame.url == url and page.locator(".IwcuBUIAKf").count() == 0:
-            gui.log("❌ 리뷰 섹션 로드 실패.")
-            browser.close()
-            return
-            
-        for n in range(1, limit_pages + 1):
-            gui.log(f"📌 페이지 {n} 수집 중…")
-            gui.log("   (스크롤 내리는 중...)")
-            smooth_scroll(target_frame, steps=10, delay=0.2)
-            soup = BeautifulSoup(target_frame.content(), "lxml")
-            review_cards = soup.select(".IwcuBUIAKf")
-            
-            current_page_reviews = 0
-            for card in review_cards:
-                info = parse_review_card(card)
-                if not info: continue
-                key = f"{info['nickname']}|{info['date']}|{info['content'][:10]}"
-                if key not in seen:
-                    seen.add(key)
-                    reviews.append(info)
-                    current_page_reviews += 1
-            gui.log(f"   └ 신규: {current_page_reviews}건 (누적: {len(reviews)}건)")
-            if not load_next_page(gui, target_frame, n):
-                gui.log("⛔ 다음 페이지 없음")
-                break
-        browser.close()
-
-    save_path = get_save_path("reviews.csv")
-    df = pd.DataFrame(reviews)
-    df.to_csv(save_path, index=False, encoding="utf-8-sig")
-    gui.log("====================================")
-    gui.log(f"✅ 총 {len(reviews)}건 수집 완료")
-    gui.log(f"📁 파일 저장 완료: {save_path}")
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = ScraperGUI(root)
-    root.mainloop()
+import time
+from smartstore_startup import StartupReport
+
+# 시작 시간 측정 (창이 뜨기 전 import 구간 + 첫 창 표시 + 백그라운드 로딩)
+STARTUP = StartupReport()
+
+import sys
+import os
+import json
+import platform
+import threading
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox
+STARTUP.span("tkinter")
+
+from smartstore_browser_check import check_browser, verify_browser
+from smartstore_frame import (
+    SCROLL_MODE, ScrollStats, adaptive_scroll_sync, click_next_group_sync, page_state_sync, wait_for_page_advance_sync,
+)
+from smartstore_review_store import ReviewStore, product_id_from_url
+from smartstore_dedup import DedupIndex, fingerprint_review
+from smartstore_export import EXTENSIONS, available_formats, check_export_format, open_review_writer
+from smartstore_timing import StageTimer, timings_path
+STARTUP.span("app modules")
+
+# playwright / lxml 파서는 무거우므로 창을 먼저 띄우고 백그라운드에서 import (처음 쓸 때 import 해도 동작)
+HEAVY_MODULES = ("playwright.sync_api", "smartstore_review_parser")
+
+# =================================================================
+# [1] 브라우저 설치 경로 설정 (Mac 호환성)
+# =================================================================
+def get_browser_path():
+    system_os = platform.system()
+    if system_os == 'Darwin':
+        user_home = os.path.expanduser("~")
+        base_path = os.path.join(user_home, "Library", "Application Support", "SmartStoreScraper")
+    else:
+        if getattr(sys, 'frozen', False):
+            base_path = os.path.dirname(sys.executable)
+        else:
+            base_path = os.path.dirname(os.path.abspath(__file__))
+
+    browser_folder = os.path.join(base_path, "browsers")
+    try:
+        os.makedirs(browser_folder, exist_ok=True)
+    except Exception:
+        pass
+    return browser_folder
+
+BROWSER_FOLDER = get_browser_path()
+os.environ["PLAYWRIGHT_BROWSERS_PATH"] = BROWSER_FOLDER
+
+# 화면 없이 실행 (로컬 목업 벤치마크용, 기본은 화면 보임)
+HEADLESS = os.getenv("SCRAPER_HEADLESS", "0") == "1"
+
+# 증분 수집용 리뷰 저장소 (브라우저 폴더 옆)
+STORE_PATH = os.path.join(os.path.dirname(BROWSER_FOLDER), "reviews.sqlite3")
+
+# 시작 시간 기록 (빌드 간 비교용, 실행마다 한 줄씩 추가)
+STARTUP_REPORT_PATH = os.path.join(os.path.dirname(BROWSER_FOLDER), "startup_timing.jsonl")
+
+# =================================================================
+# [2] 결과 파일 저장 경로 설정
+# =================================================================
+def get_save_path(filename="reviews.csv"):
+    user_home = os.path.expanduser("~")
+    download_folder = os.path.join(user_home, "Downloads")
+    if not os.path.exists(download_folder):
+        download_folder = os.path.join(user_home, "Desktop")
+    return os.path.join(download_folder, filename)
+
+# =================================================================
+# [3] 스크롤 기능
+# =================================================================
+# 예전 고정 스크롤: 800px x 10회, 0.2초 간격 (절약 시간 계산 기준)
+FIXED_SCROLL_STEPS, FIXED_SCROLL_DELAY = 10, 0.2
+
+def smooth_scroll(target_frame, steps=FIXED_SCROLL_STEPS, delay=FIXED_SCROLL_DELAY):
+    try:
+        for _ in range(steps):
+            target_frame.evaluate("window.scrollBy(0, 800)")
+            time.sleep(delay)
+    except Exception:
+        pass
+
+def scroll_reviews(target_frame, stats):
+    """카드 수가 더 늘지 않을 때까지 스크롤. SCROLL_MODE=fixed 이거나 실패하면 smooth_scroll"""
+    t = time.perf_counter()
+    result = adaptive_scroll_sync(target_frame) if SCROLL_MODE != "fixed" else None
+    if result is None or "error" in result:
+        smooth_scroll(target_frame)
+        result = dict(result or {}, steps=FIXED_SCROLL_STEPS)
+    seconds = time.perf_counter() - t
+    stats.add(result, seconds)
+    return result, seconds
+
+# =================================================================
+# [4] GUI 클래스
+# =================================================================
+class ScraperGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("네이버 스마트스토어 리뷰 수집기 (Anti-Bot Applied)")
+        self.root.geometry("600x550")
+        self.root.resizable(False, False)
+
+        # 맥북 단축키(Command+C, V) 활성화
+        self.setup_copy_paste(root)
+
+        style = ttk.Style()
+        style.configure("TLabel", font=("Malgun Gothic", 10))
+        style.configure("TButton", font=("Malgun Gothic", 10, "bold"))
+
+        # 입력 프레임
+        input_frame = ttk.LabelFrame(root, text="수집 설정", padding=(10, 10))
+        input_frame.pack(fill="x", padx=10, pady=10)
+
+        # URL 입력창
+        ttk.Label(input_frame, text="상품 URL:").grid(row=0, column=0, sticky="w", pady=5)
+        self.url_entry = ttk.Entry(input_frame, width=50)
+        self.url_entry.grid(row=0, column=1, padx=5, pady=5)
+        
+        # [핵심] URL 입력창에 우클릭 메뉴 연결
+        self.bind_right_click(self.url_entry)
+
+        # 페이지 수 입력창
+        ttk.Label(input_frame, text="수집 페이지 수:").grid(row=1, column=0, sticky="w", pady=5)
+        self.limit_entry = ttk.Entry(input_frame, width=10)
+        self.limit_entry.insert(0, "13") 
+        self.limit_entry.grid(row=1, column=1, sticky="w", padx=5, pady=5)
+        
+        # [핵심] 페이지 수 입력창에도 우클릭 메뉴 연결
+        self.bind_right_click(self.limit_entry)
+
+        # 증분 수집 (이미 저장된 리뷰만 나오는 페이지에서 중단)
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            input_frame, text="증분 수집 (이미 수집한 리뷰가 나오면 중단)", variable=self.incremental_var
+        ).grid(row=2, column=0, columnspan=2, sticky="w", pady=5)
+
+        # 저장 형식 (csv 외에는 rating/date 등이 타입 변환되어 저장됨). pyarrow 가 없으면 parquet/arrow 는 숨김
+        ttk.Label(input_frame, text="저장 형식:").grid(row=3, column=0, sticky="w", pady=5)
+        self.format_var = tk.StringVar(value="csv")
+        ttk.Combobox(
+            input_frame, textvariable=self.format_var, values=available_formats(), state="readonly", width=8
+        ).grid(row=3, column=1, sticky="w", padx=5, pady=5)
+
+        # 시작 버튼
+        self.start_btn = ttk.Button(input_frame, text="수집 시작", command=self.start_thread)
+        self.start_btn.grid(row=4, column=0, columnspan=2, pady=10, sticky="ew")
+
+        # 로그 프레임
+        log_frame = ttk.LabelFrame(root, text="진행 상황", padding=(10, 10))
+        log_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, state='disabled', font=("Consolas", 9))
+        self.log_text.pack(fill="both", expand=True)
+
+        self.log("프로그램이 준비되었습니다.")
+        self.log("💡 Tip: 붙여넣기가 안 되면 '우클릭'을 해보세요!")
+        save_path = get_save_path()
+        self.log(f"💾 저장 위치: {save_path}")
+
+        # mainloop 가 돌기 시작하면 (= 창이 뜬 직후) 무거운 모듈 로딩 + 브라우저 엔진 확인/설치
+        self.preloaded = threading.Event()
+        self.browser_ready = threading.Event()
+        self.browser_error = None
+        self.root.after(0, self.on_first_window)
+
+    # -----------------------------------------------------------
+    # 시작 직후 백그라운드 작업
+    # -----------------------------------------------------------
+    def on_first_window(self):
+        STARTUP.mark("first_window")
+        t = threading.Thread(target=self.startup_tasks, daemon=True)
+        t.start()
+
+    def startup_tasks(self):
+        self.preload_heavy_modules()
+        try:
+            self.install_browser_if_needed()
+        except Exception as e:
+            self.browser_error = e
+        finally:
+            self.browser_ready.set()
+
+    def preload_heavy_modules(self):
+        try:
+            for module in HEAVY_MODULES:
+                STARTUP.timed_import(module)
+            STARTUP.mark("preloaded")
+            self.log(f"⏱ 시작 시간: {STARTUP.summary()}")
+            STARTUP.save(STARTUP_REPORT_PATH)
+        except Exception as e:
+            self.log(f"⚠️ 모듈 미리 로딩 실패 (수집 시작 시 다시 시도): {e}")
+        finally:
+            self.preloaded.set()
+
+    # -----------------------------------------------------------
+    # [기능 1] 맥북용 Command+C, V 단축키 강제 활성화
+    # -----------------------------------------------------------
+    def setup_copy_paste(self, root):
+        if platform.system() == 'Darwin':  # Mac OS인 경우
+            try:
+                # Command+C (복사)
+                root.bind_class("Entry", "<Command-c>", lambda e: e.widget.event_generate("<<Copy>>"))
+                root.bind_class("Text", "<Command-c>", lambda e: e.widget.event_generate("<<Copy>>"))
+                
+                # Command+V (붙여넣기)
+                root.bind_class("Entry", "<Command-v>", lambda e: e.widget.event_generate("<<Paste>>"))
+                root.bind_class("Text", "<Command-v>", lambda e: e.widget.event_generate("<<Paste>>"))
+                
+                # Command+A (전체 선택)
+                root.bind_class("Entry", "<Command-a>", lambda e: e.widget.event_generate("<<SelectAll>>"))
+                root.bind_class("Text", "<Command-a>", lambda e: e.widget.event_generate("<<SelectAll>>"))
+            except Exception:
+                pass
+
+    # -----------------------------------------------------------
+    # [기능 2] 마우스 우클릭 메뉴 (붙여넣기) 추가
+    # -----------------------------------------------------------
+    def bind_right_click(self, widget):
+        # 우클릭 메뉴 생성
+        menu = tk.Menu(widget, tearoff=0)
+        menu.add_command(label="잘라내기 (Cut)", command=lambda: widget.event_generate("<<Cut>>"))
+        menu.add_command(label="복사 (Copy)", command=lambda: widget.event_generate("<<Copy>>"))
+        menu.add_command(label="붙여넣기 (Paste)", command=lambda: widget.event_generate("<<Paste>>"))
+        
+        def show_menu(event):
+            menu.post(event.x_root, event.y_root)
+
+        # Mac은 Button-2 또는 Button-3, 윈도우는 Button-3
+        if platform.system() == "Darwin":
+            widget.bind("<Button-2>", show_menu)
+            widget.bind("<Button-3>", show_menu)
+        else:
+            widget.bind("<Button-3>", show_menu)
+
+    # -----------------------------------------------------------
+    # 로그 및 스레드 처리 (이전과 동일)
+    # -----------------------------------------------------------
+    def log(self, message):
+        self.root.after(0, self._update_log, message)
+
+    def _update_log(self, message):
+        self.log_text.configure(state='normal')
+        self.log_text.insert(tk.END, message + "\n")
+        self.log_text.see(tk.END)
+        self.log_text.configure(state='disabled')
+
+    def start_thread(self):
+        url = self.url_entry.get().strip()
+        limit = self.limit_entry.get().strip()
+
+        if not url:
+            messagebox.showwarning("경고", "URL을 입력해주세요!")
+            return
+        if not limit.isdigit():
+            messagebox.showwarning("경고", "페이지 수는 숫자만 입력해주세요!")
+            return
+
+        self.start_btn.config(state="disabled")
+        self.log("\n[작업 시작] --------------------------------")
+        
+        t = threading.Thread(target=self.run_scraper, args=(url, int(limit), self.incremental_var.get(), self.format_var.get()))
+        t.daemon = True
+        t.start()
+
+    def run_scraper(self, url, limit_pages, incremental=False, fmt="csv"):
+        try:
+            # 브라우저 확인/설치는 프로그램 시작 시 백그라운드에서 진행됨
+            if not self.browser_ready.is_set():
+                self.log("⌛ 브라우저 엔진 준비 대기 중...")
+                self.browser_ready.wait()
+            if self.browser_error is not None:
+                self.browser_error = None
+                self.install_browser_if_needed()  # 시작 때 실패했으면 한 번 더 시도
+            save_path = extract_reviews_to_csv(self, url, limit_pages, incremental, fmt)
+            if save_path is None:
+                return
+            self.root.after(0, lambda: messagebox.showinfo("완료", f"수집 완료!\n파일 위치: {save_path}"))
+        except Exception as e:
+            self.log(f"❌ 에러 발생: {e}")
+            self.root.after(0, lambda: messagebox.showerror("에러", f"오류가 발생했습니다.\n{e}"))
+        finally:
+            self.root.after(0, lambda: self.start_btn.config(state="normal"))
+
+    def install_browser_if_needed(self):
+        # 설치 폴더/revision/stamp 만 보고 판단, 실제 실행은 stamp 가 없거나 오래됐을 때만
+        status = check_browser(BROWSER_FOLDER)
+        if status == "ok":
+            self.log("✅ 브라우저 엔진 정상.")
+            return
+
+        from playwright.sync_api import sync_playwright
+
+        def launch():
+            with sync_playwright() as p:
+                p.chromium.launch(headless=True).close()
+
+        if status == "verify":
+            self.log("⚙️ 브라우저 엔진 상태 확인 중...")
+            if verify_browser(BROWSER_FOLDER, launch):
+                self.log("✅ 브라우저 엔진 정상.")
+                return
+
+        self.log("🚀 브라우저 엔진 자동 설치 시작 (1~2분 소요)...")
+        try:
+            from playwright.__main__ import main
+            old_argv = sys.argv
+            sys.argv = ["playwright", "install", "chromium"]
+            try:
+                main()
+            except SystemExit:
+                pass
+            finally:
+                sys.argv = old_argv
+        except Exception as e:
+            self.log(f"❌ 설치 실패: {e}")
+            raise e
+        if not verify_browser(BROWSER_FOLDER, launch):
+            self.log("❌ 설치 후에도 브라우저 실행 실패")
+            raise RuntimeError("브라우저 엔진 설치/실행 실패")
+        self.log("✅ 브라우저 설치 완료!")
+
+# =================================================================
+# [5] 웹 스크래핑 로직 (Anti-Bot 기능 추가됨)
+# =================================================================
+def load_review_frame(gui, page):
+    gui.log("🔎 리뷰탭 탐색 중…")
+    for _ in range(40):
+        btn = page.locator('[data-name="REVIEW"]').first
+        if btn.is_visible():
+            btn.scroll_into_view_if_needed()
+            time.sleep(0.5)
+            btn.click()
+            gui.log("✔ 리뷰탭 클릭 성공")
+            break
+        page.mouse.wheel(0, 600)
+        time.sleep(0.2)
+    else:
+        gui.log("❌ 리뷰탭 못 찾음")
+        return page
+
+    gui.log("⌛ 리뷰 iframe 로딩 대기…")
+    for _ in range(80):
+        for f in page.frames:
+            lower = f.url.lower()
+            if ("review" in lower) or ("reviews" in lower) or ("pstatic" in lower):
+                gui.log(f"✔ iframe 감지됨")
+                return f
+        time.sleep(0.25)
+    return page
+
+def load_next_page(gui, target_frame, current_page_num):
+    next_page_num = current_page_num + 1
+    next_btn = target_frame.locator(f'.LiT9lKOVbw a:has-text("{next_page_num}")').first
+    if next_btn.count() > 0:
+        gui.log(f"➡ 페이지 {next_page_num} 이동")
+        before = page_state_sync(target_frame)
+        next_btn.click()
+        if not wait_for_page_advance_sync(target_frame, before):
+            gui.log("   (페이지 전환 신호 없음 → 계속 진행)")
+        return True
+    elif click_next_group_sync(target_frame):
+        gui.log(f"➡ 페이지 {next_page_num} 이동 (다음 번호 묶음)")
+        return True
+    else:
+        return False
+
+def extract_reviews_to_csv(gui, url, limit_pages=13, incremental=False, fmt="csv"):
+    check_export_format(fmt)  # 브라우저를 띄우기 전에 형식/pyarrow 확인
+    # 증분 수집: 저장소에 없던 리뷰만 모으고, 전부 저장된 페이지가 나오면 중단
+    # 중간에 return(차단/리뷰 섹션 없음) 하거나 에러가 나도 저장소는 항상 닫음
+    store = ReviewStore(STORE_PATH) if incremental else None
+    try:
+        return _extract_reviews(gui, url, limit_pages, store, fmt)
+    finally:
+        if store is not None:
+            store.close()
+
+# + [수정됨] Anti-Bot 설정이 적용된 함수
+def _extract_reviews(gui, url, limit_pages, store, fmt):
+    from playwright.sync_api import sync_playwright
+    from smartstore_review_parser import parse_reviews_html
+
+    seen = DedupIndex.from_env()
+    timer = StageTimer()
+    scroll = ScrollStats(FIXED_SCROLL_STEPS * FIXED_SCROLL_DELAY)
+    save_path = get_save_path("reviews" + EXTENSIONS[fmt])
+    product_id = product_id_from_url(url)
+
+    # + 실제 사람처럼 보이기 위한 User-Agent 설정
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+    with sync_playwright() as p:
+        with timer.span("launch"):
+            browser = p.chromium.launch(headless=HEADLESS)
+        
+        # + [핵심 수정] 새로운 컨텍스트에 User-Agent와 화면 크기, 로케일 설정
+        context = browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={"width": 1920, "height": 1080},
+            locale="ko-KR"
+        )
+        
+        page = context.new_page()
+
+        # + [핵심 수정] navigator.webdriver 속성을 숨겨서 봇 탐지 우회
+        page.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            })
+        """)
+
+        gui.log(f"⏳ 페이지 접속 중: {url}")
+        try:
+            # 타임아웃 60초, DOM 로드 완료 시점까지 대기
+            with timer.span("goto"):
+                page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        except Exception:
+            gui.log("⚠️ 접속 지연 (계속 진행)")
+        
+        # + 혹시 차단 페이지로 갔는지 확인하는 로직 추가
+        with timer.span("block_check"):
+            time.sleep(2)
+            blocked = "상품이 존재하지 않습니다" in page.title() or page.locator("text=상품이 존재하지 않습니다").count() > 0
+        if blocked:
+             gui.log("❌ 차단됨: 네이버가 봇 접근을 막았습니다.")
+             gui.log("👉 해결책: 잠시 후 다시 시도하거나, 크롬 익스텐션 방식을 사용하세요.")
+             browser.close()
+             return None
+
+        with timer.span("settle"):
+            time.sleep(3)
+        with timer.span("review_frame"):
+            target_frame = load_review_frame(gui, page)
+        
+        if target_frame is page and target_frame.url == url and page.locator(".IwcuBUIAKf").count() == 0:
+            gui.log("❌ 리뷰 섹션 로드 실패.")
+            browser.close()
+            return None
+            
+        # 페이지마다 바로 파일에 기록 (CSV/JSONL 은 중간에 멈춰도 그때까지는 저장됨)
+        with open_review_writer(fmt, save_path, product_id) as writer:
+            for n in range(1, limit_pages + 1):
+                timer.page(n)
+                gui.log(f"📌 페이지 {n} 수집 중…")
+                with timer.span("scroll"):
+                    scrolled, seconds = scroll_reviews(target_frame, scroll)
+                gui.log(f"   (스크롤 {scrolled['steps']}회, {seconds:.2f}s)")
+                with timer.span("content"):
+                    html = target_frame.content()
+                with timer.span("parse"):
+                    page_reviews = parse_reviews_html(html)
+                with timer.span("dedup"):
+                    fps = [fingerprint_review(r) for r in page_reviews]
+                    known = set()
+                    if store is not None:
+                        known = store.merge(product_id, zip(fps, page_reviews))
+
+                with timer.span("write"):
+                    current_page_reviews = writer.write_page(
+                        info for info, fp in zip(page_reviews, fps) if fp not in known and seen.add(fp)
+                    )
+                gui.log(f"   └ 신규: {current_page_reviews}건 (누적: {writer.count}건)")
+                if store is not None and fps and all(fp in known for fp in fps):
+                    gui.log("⏹ 모두 이미 수집한 리뷰 → 증분 수집 종료")
+                    break
+                with timer.span("paginate"):
+                    has_next = load_next_page(gui, target_frame, n)
+                if not has_next:
+                    gui.log("⛔ 다음 페이지 없음")
+                    break
+        browser.close()
+
+    if store is not None:
+        gui.log(f"🗄 저장소 누적: {store.count(product_id)}건 ({STORE_PATH})")
+
+    gui.log("====================================")
+    gui.log(f"✅ 총 {writer.count}건 수집 완료")
+    gui.log(f"📁 파일 저장 완료: {save_path}")
+    gui.log(f"⏱ 단계별 시간: {timer.summary()}")
+    if scroll.pages:
+        gui.log(f"🖱 스크롤: {scroll.steps}회 {scroll.seconds:.2f}s (고정 스크롤 대비 {scroll.saved():.2f}s 절약)")
+    try:
+        timer.save(timings_path(save_path))
+    except OSError:
+        pass
+    return save_path
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = ScraperGUI(root)
+    # --startup-report: 시작 시간만 기록하고 종료 (빌드별 측정용)
+    if "--startup-report" in sys.argv:
+        def close_when_preloaded():
+            if app.preloaded.is_set():
+                print(json.dumps(STARTUP.as_dict(), ensure_ascii=False))
+                root.destroy()
+            else:
+                root.after(50, close_when_preloaded)
+        root.after(0, close_when_preloaded)
+    root.mainloop()
@@ -0,0 +1,383 @@
+# smartstore_jobs.py
+"""
+비동기 수집 작업 큐
+- POST /jobs 는 job id 만 바로 돌려주고, 실제 수집은 프로세스 내 워커가 처리
+- 진행 상황(현재 페이지, 누적 리뷰 수) 조회
+- 끝난 작업 결과는 result_ttl 동안만 보관
+- 같은 요청(url, 페이지 수, 엔진, 쿠키)이 아직 진행 중이면 새로 만들지 않고 기존 job 을 돌려줌
+- 멀티 프로세스 모드용 SQLite 공유 큐 (SqliteJobQueue): 상품 id 로 샤드를 정해
+  같은 상품은 항상 같은 워커 프로세스가 처리
+  · DB 파일은 JOB_DB_PATH (기본: API 를 실행한 폴더의 jobs.sqlite3)
+  · 요청 쿠키(cookie_data)는 워커가 job 을 가져가는 순간(claim) DB 에서 지움 → 대기 중일 때만 파일에 남음
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from smartstore_review_store import product_id_from_url
+
+logger = logging.getLogger("scraper")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, url: str, limit_pages: int, engine: str, cookie_data: dict, key: str, incremental: bool = False):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.limit_pages = limit_pages
+        self.engine = engine
+        self.incremental = incremental
+        self.cookie_data = cookie_data
+        self.key = key
+        self.state = QUEUED
+        self.page = 0
+        self.count = 0
+        self.error: Optional[str] = None
+        self.result: Optional[List[dict]] = None
+        self.report: dict = {}  # 수집 중 채워지는 부가 정보 (network 등)
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def finished_state(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+    def progress(self, page: int, count: int):
+        self.page = page
+        self.count = count
+
+    def status(self) -> dict:
+        now = time.time()
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "url": self.url,
+            "limit_pages": self.limit_pages,
+            "engine": self.engine,
+            "incremental": self.incremental,
+            "page": self.page,
+            "count": self.count,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "elapsed": round((self.finished or now) - self.started, 3) if self.started else None,
+            **self.report,
+        }
+
+
+class JobQueue:
+    def __init__(
+        self,
+        runner: Callable[[Job], Awaitable[List[dict]]],
+        workers: int = 2,
+        result_ttl: float = 3600.0,
+        max_queued: int = 1000,
+    ):
+        self._runner = runner
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[str, Job] = {}  # key → 진행 중인 job
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"🧵 작업 큐 시작 (workers={self.workers}, result_ttl={self.result_ttl}s)")
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, url: str, limit_pages: int, engine: str, cookie_data: dict, key: str, incremental: bool = False) -> Job:
+        self._purge()
+        existing = self._active.get(key)
+        if existing is not None:
+            return existing
+        if self._queue is None:
+            raise RuntimeError("job queue not started")
+        if self._queue.qsize() >= self.max_queued:
+            raise QueueFull(f"job queue is full ({self.max_queued})")
+
+        job = Job(url, limit_pages, engine, cookie_data, key, incremental)
+        self._jobs[job.id] = job
+        self._active[key] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def _purge(self):
+        cutoff = time.time() - self.result_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_state and job.finished < cutoff:
+                del self._jobs[job_id]
+
+    async def _worker(self, idx: int):
+        while True:
+            job = await self._queue.get()
+            job.state = RUNNING
+            job.started = time.time()
+            logger.info(f"🧵 [worker {idx}] 작업 시작 {job.id} ({job.url})")
+            try:
+                job.result = await self._runner(job)
+                job.count = len(job.result)
+                job.state = DONE
+            except asyncio.CancelledError:
+                job.state = FAILED
+                job.error = "cancelled"
+                raise
+            except Exception as e:
+                job.state = FAILED
+                job.error = getattr(e, "detail", None) or str(e)
+                logger.error(f"🧵 [worker {idx}] 작업 실패 {job.id}: {job.error}")
+            finally:
+                job.finished = time.time()
+                job.cookie_data = None
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        states: Dict[str, int] = {}
+        for job in self._jobs.values():
+            states[job.state] = states.get(job.state, 0) + 1
+        return {"workers": self.workers, "queued": self._queue.qsize() if self._queue else 0, "jobs": states}
+
+
+def shard_for(product_id: str, shards: int) -> int:
+    """프로세스마다 달라지는 hash() 대신 crc32 로 고정된 샤드 번호"""
+    return zlib.crc32(product_id.encode("utf-8")) % max(1, shards)
+
+
+class SharedJob(Job):
+    """SqliteJobQueue 의 job. 진행 상황을 DB 에 바로 기록"""
+
+    def __init__(self, queue: "SqliteJobQueue", row: sqlite3.Row):
+        super().__init__(row["url"], row["limit_pages"], row["engine"], json.loads(row["cookie_data"] or "{}"),
+                         row["key"], bool(row["incremental"]))
+        self._queue = queue
+        self.id = row["id"]
+        self.shard = row["shard"]
+        self.state = row["state"]
+        self.page = row["page"]
+        self.count = row["count"]
+        self.error = row["error"]
+        self.result = json.loads(row["result"]) if row["result"] is not None else None
+        self.report = json.loads(row["report"] or "{}")
+        self.created = row["created"]
+        self.started = row["started"]
+        self.finished = row["finished"]
+        self._saving: Optional[asyncio.Task] = None
+
+    def progress(self, page: int, count: int):
+        """
+        메모리 값은 바로 바꾸고, DB 기록은 스레드에서 (쓰기 잠금 대기가 이벤트 루프를 막지 않게).
+        기록 중에 들어온 진행 상황은 최신 값 하나로 합쳐서 이어서 기록
+        """
+        super().progress(page, count)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._queue.progress(self.id, page, count)
+            return
+        if self._saving is None or self._saving.done():
+            self._saving = loop.create_task(self._save_progress())
+
+    async def _save_progress(self):
+        saved = None
+        try:
+            while saved != (self.page, self.count):
+                saved = (self.page, self.count)
+                await asyncio.to_thread(self._queue.progress, self.id, *saved)
+        except Exception as e:
+            logger.warning(f"⚠️ 작업 진행 상황 기록 실패 {self.id}: {e}")
+
+    async def flush_progress(self):
+        """finish 전에 호출: 밀린 진행 상황 기록이 끝난 뒤에 결과를 씀"""
+        if self._saving is not None:
+            await self._saving
+
+
+class SqliteJobQueue:
+    """
+    여러 프로세스가 공유하는 작업 큐 (JobQueue 와 같은 submit/get/stats 인터페이스).
+    API 프로세스는 submit/get 만 하고, 샤드별 워커 프로세스가 claim/finish 로 처리.
+    """
+
+    def __init__(self, path: str, shards: int, result_ttl: float = 3600.0, max_queued: int = 1000):
+        self.path = path
+        self.shards = max(1, shards)
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id          TEXT PRIMARY KEY,
+                key         TEXT NOT NULL,
+                shard       INTEGER NOT NULL,
+                state       TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                limit_pages INTEGER NOT NULL,
+                engine      TEXT NOT NULL,
+                incremental INTEGER NOT NULL,
+                cookie_data TEXT,
+                page        INTEGER DEFAULT 0,
+                count       INTEGER DEFAULT 0,
+                error       TEXT,
+                result      TEXT,
+                report      TEXT,
+                created     REAL NOT NULL,
+                started     REAL,
+                finished    REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (shard, state, created)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, state)")
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _one(self, sql: str, args=()) -> Optional[sqlite3.Row]:
+        return self._conn.execute(sql, args).fetchone()
+
+    def submit(self, url: str, limit_pages: int, engine: str, cookie_data: dict, key: str, incremental: bool = False) -> Job:
+        self._purge()
+        job_id = uuid.uuid4().hex
+        shard = shard_for(product_id_from_url(url), self.shards)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._one(f"SELECT * FROM jobs WHERE key = ? AND state IN ('{QUEUED}', '{RUNNING}')", (key,))
+                if row is None:
+                    queued = self._one(f"SELECT COUNT(*) FROM jobs WHERE state = '{QUEUED}'")[0]
+                    if queued >= self.max_queued:
+                        raise QueueFull(f"job queue is full ({self.max_queued})")
+                    self._conn.execute(
+                        "INSERT INTO jobs (id, key, shard, state, url, limit_pages, engine, incremental, cookie_data, created) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, key, shard, QUEUED, url, limit_pages, engine, int(incremental),
+                         json.dumps(cookie_data or {}, ensure_ascii=False), time.time()),
+                    )
+                    row = self._one("SELECT * FROM jobs WHERE id = ?", (job_id,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return SharedJob(self, row)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        with self._lock:
+            row = self._one("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return SharedJob(self, row) if row is not None else None
+
+    async def wait(self, job_id: str, interval: float = 0.2) -> Job:
+        """job 이 끝날 때까지 폴링 (SQLite 읽기는 스레드에서 → 이벤트 루프를 막지 않음)"""
+        while True:
+            job = await asyncio.to_thread(self.get, job_id)
+            if job is None or job.finished_state:
+                return job
+            await asyncio.sleep(interval)
+
+    def _purge(self):
+        with self._lock:
+            self._conn.execute(
+                f"DELETE FROM jobs WHERE state IN ('{DONE}', '{FAILED}') AND finished < ?",
+                (time.time() - self.result_ttl,),
+            )
+
+    # ---- 워커 프로세스 쪽 ----
+
+    def requeue_orphans(self, shard: int) -> int:
+        """
+        죽은 워커가 running 으로 남긴 job 을 다시 queued 로 (샤드는 한 프로세스만 담당하므로 시작 시 호출).
+        쿠키는 claim 때 이미 지워졌으므로 다시 실행할 때는 쿠키 없이 수집함
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                f"UPDATE jobs SET state = '{QUEUED}', started = NULL WHERE shard = ? AND state = '{RUNNING}'", (shard,)
+            )
+            return cur.rowcount
+
+    def claim(self, shard: int) -> Optional[SharedJob]:
+        """가장 오래된 queued job 을 running 으로. 쿠키는 메모리의 job 에만 남기고 DB 에서는 같은 트랜잭션에서 지움"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"UPDATE jobs SET state = '{RUNNING}', started = ? WHERE id = ("
+                    f"SELECT id FROM jobs WHERE shard = ? AND state = '{QUEUED}' ORDER BY created LIMIT 1"
+                    f") RETURNING *",
+                    (time.time(), shard),
+                ).fetchall()
+                if rows:
+                    self._conn.execute("UPDATE jobs SET cookie_data = NULL WHERE id = ?", (rows[0]["id"],))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return SharedJob(self, rows[0]) if rows else None
+
+    def progress(self, job_id: str, page: int, count: int):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET page = ?, count = ? WHERE id = ?", (page, count, job_id))
+
+    def finish(self, job: Job, result: Optional[List[dict]] = None, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, count = ?, error = ?, result = ?, report = ?, finished = ?, cookie_data = NULL "
+                "WHERE id = ?",
+                (
+                    FAILED if error is not None else DONE,
+                    len(result) if result is not None else job.count,
+                    error,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    json.dumps(job.report, ensure_ascii=False),
+                    time.time(),
+                    job.id,
+                ),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT shard, state, COUNT(*) FROM jobs GROUP BY shard, state").fetchall()
+        states: Dict[str, int] = {}
+        shards: Dict[int, Dict[str, int]] = {}
+        for shard, state, n in rows:
+            states[state] = states.get(state, 0) + n
+            shards.setdefault(shard, {})[state] = n
+        return {"shards": self.shards, "queued": states.get(QUEUED, 0), "jobs": states, "by_shard": shards}
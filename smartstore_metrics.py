@@ -0,0 +1,245 @@
+# smartstore_metrics.py
+"""
+Prometheus 텍스트 형식 메트릭 (외부 라이브러리 없이 최소 구현)
+- Counter / Gauge / Histogram, 라벨 지원
+- 값 갱신은 이벤트 루프 스레드에서 float 덧셈 한 번 (락 없음) → 페이지 루프에 부담 없음
+- 풀/큐/RSS 처럼 이미 다른 곳에 있는 값은 fn 으로 넘겨서 /metrics 요청 때만 읽음
+- 이벤트 루프 지연(lag) 측정 태스크
+"""
+
+import asyncio
+import bisect
+import os
+import sys
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        # fn: 수집 시점에 값을 읽는 함수. 라벨이 있으면 {라벨값 tuple: 값} 을 돌려줌
+        self.fn = fn
+        self._children: Dict[Tuple, object] = {}
+        if not self.labelnames and fn is None:
+            self.labels()  # 라벨 없는 메트릭은 처음부터 0 으로 노출
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def _samples(self):
+        if self.fn is not None:
+            value = self.fn()
+            if self.labelnames:
+                return [(tuple(k), v) for k, v in (value or {}).items()]
+            return [((), value)]
+        return [(k, c.value) for k, c in self._children.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in self._samples():
+            if value is not None:
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_num(value)}")
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, n: float = 1):
+        self.value += n
+
+    def dec(self, n: float = 1):
+        self.value -= n
+
+    def set(self, v: float):
+        self.value = v
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, n: float = 1):
+        self._default().inc(n)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, v: float):
+        self._default().set(v)
+
+    def inc(self, n: float = 1):
+        self._default().inc(n)
+
+    def dec(self, n: float = 1):
+        self._default().dec(n)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float):
+        i = bisect.bisect_left(self.buckets, v)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += v
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, v: float):
+        self._default().observe(v)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, h in self._children.items():
+            acc = 0
+            for le, n in zip(self.buckets, h.counts):
+                acc += n
+                bucket = _labels(self.labelnames, key, 'le="%s"' % _num(le))
+                lines.append(f"{self.name}_bucket{bucket} {acc}")
+            bucket = _labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {h.count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(h.sum)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {h.count}")
+        return "\n".join(lines)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable] = None) -> Counter:
+        return self.register(Counter(name, help, labelnames, fn))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable] = None) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, fn))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        out = []
+        for metric in self._metrics.values():
+            try:
+                out.append(metric.render())
+            except Exception:
+                # 값 읽기 실패(종료 중인 풀 등)가 /metrics 전체를 막지 않게
+                continue
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ==========================================
+# 프로세스 / 이벤트 루프
+# ==========================================
+def process_rss_bytes() -> Optional[int]:
+    """현재 RSS. /proc 이 없으면 (macOS / Windows) 최대 RSS 로 대신함"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+class LoopLagMonitor:
+    """interval 마다 깨어나서 예정보다 늦은 만큼을 이벤트 루프 지연으로 기록"""
+
+    def __init__(self, gauge: Gauge, histogram: Histogram, interval: float = 0.5):
+        self.gauge = gauge
+        self.histogram = histogram
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            t = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - t - self.interval)
+            self.gauge.set(lag)
+            self.histogram.observe(lag)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,126 @@
+# smartstore_resource_block.py
+"""
+리뷰 수집용 네트워크 차단 프로필
+- 리뷰 iframe 의 텍스트만 읽으므로 이미지/미디어/폰트, 분석·광고 도메인 요청은 abort
+- allowlist 에 걸리는 URL 은 항상 통과 (리뷰 카드 렌더링에 필요한 리소스)
+- 요청 단위(page.route)로 걸어서 작업별로 차단/로드 통계를 냄
+  (컨텍스트는 캐시로 여러 작업이 공유하기 때문)
+- 참고: Playwright 는 route 가 걸린 동안 HTTP 캐시를 쓰지 않음
+"""
+
+import os
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_BLOCK_TYPES = ("image", "media", "font")
+DEFAULT_BLOCK_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "criteo.com",
+    "wcs.naver.net",
+    "wcs.naver.com",
+    "lcs.naver.com",
+    "nelo2-col.navercorp.com",
+    "tivan.naver.com",
+    "veta.naver.com",
+)
+
+# 차단한 요청은 실제로 받지 않으므로 크기를 알 수 없음 → 유형별 대략적인 평균 크기로 추정
+TYPICAL_BYTES = {"image": 40_000, "media": 400_000, "font": 60_000, "script": 30_000}
+DEFAULT_TYPICAL_BYTES = 5_000
+
+
+def _split_env(name: str, default: Iterable[str]) -> tuple:
+    raw = os.getenv(name)
+    if raw is None:
+        return tuple(default)
+    return tuple(x.strip().lower() for x in raw.split(",") if x.strip())
+
+
+class BlockProfile:
+    def __init__(self, types: Iterable[str] = DEFAULT_BLOCK_TYPES, domains: Iterable[str] = DEFAULT_BLOCK_DOMAINS,
+                 allow: Iterable[str] = ()):
+        self.types = frozenset(types)
+        self.domains = tuple(domains)
+        self.allow = tuple(allow)
+
+    @classmethod
+    def from_env(cls) -> "BlockProfile":
+        """BLOCK_RESOURCE_TYPES / BLOCK_DOMAINS / BLOCK_ALLOW (쉼표 구분, 빈 값이면 끔)"""
+        return cls(
+            _split_env("BLOCK_RESOURCE_TYPES", DEFAULT_BLOCK_TYPES),
+            _split_env("BLOCK_DOMAINS", DEFAULT_BLOCK_DOMAINS),
+            _split_env("BLOCK_ALLOW", ()),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.types or self.domains)
+
+    def reason(self, resource_type: str, url: str) -> Optional[str]:
+        """차단 사유 (type:image, domain:doubleclick.net) 또는 None"""
+        lower = url.lower()
+        if any(a in lower for a in self.allow):
+            return None
+        if resource_type in self.types:
+            return f"type:{resource_type}"
+        host = urlsplit(lower).hostname or ""
+        for d in self.domains:
+            if host == d or host.endswith("." + d):
+                return f"domain:{d}"
+        return None
+
+
+class BlockStats:
+    def __init__(self):
+        self.requests_blocked = 0
+        self.requests_allowed = 0
+        self.bytes_loaded = 0
+        self.bytes_saved_est = 0
+        self.blocked_by: Dict[str, int] = {}
+
+    def blocked(self, reason: str, resource_type: str):
+        self.requests_blocked += 1
+        self.blocked_by[reason] = self.blocked_by.get(reason, 0) + 1
+        self.bytes_saved_est += TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES)
+
+    def loaded(self, response):
+        self.requests_allowed += 1
+        try:
+            self.bytes_loaded += int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+
+    def as_dict(self) -> dict:
+        return {
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_saved_est": self.bytes_saved_est,
+            "blocked_by": dict(sorted(self.blocked_by.items(), key=lambda kv: -kv[1])),
+        }
+
+
+async def install_blocking(page, profile: BlockProfile) -> BlockStats:
+    """page 에 차단 route 를 걸고, 이 page 의 통계 객체를 돌려줌"""
+    stats = BlockStats()
+    page.on("response", stats.loaded)
+    if not profile.enabled:
+        return stats
+
+    async def handle(route):
+        request = route.request
+        reason = profile.reason(request.resource_type, request.url)
+        try:
+            if reason:
+                stats.blocked(reason, request.resource_type)
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+        except Exception:
+            pass  # 페이지가 이미 닫힌 경우
+
+    await page.route("**/*", handle)
+    return stats
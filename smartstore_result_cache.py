@@ -0,0 +1,182 @@
+# smartstore_result_cache.py
+"""
+/scrape 결과 캐시
+- 키: 상품 id (URL 정규화) , 페이지별 결과를 그대로 보관
+- 더 깊게 수집해 둔 결과로 얕은 요청(limit_pages 가 작은 요청)도 응답
+- TTL + 메모리 상한(LRU), 선택적으로 디스크 계층 (JSON 파일)
+- 디스크 읽기/쓰기가 있으므로 API 에서는 asyncio.to_thread 로 호출
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from smartstore_review_store import product_id_from_url
+
+logger = logging.getLogger("scraper")
+
+
+class _Entry:
+    __slots__ = ("pages", "depth", "complete", "created", "size")
+
+    def __init__(self, pages: List[List[dict]], depth: int, complete: bool, created: float, size: int):
+        self.pages = pages
+        self.depth = depth
+        self.complete = complete  # 마지막 페이지까지 다 읽음 → 어떤 깊이든 응답 가능
+        self.created = created
+        self.size = size
+
+    def covers(self, limit_pages: int) -> bool:
+        return self.complete or self.depth >= limit_pages
+
+    def reviews(self, limit_pages: int) -> List[dict]:
+        return [r for page in self.pages[:limit_pages] for r in page]
+
+
+class ResultCache:
+    def __init__(self, ttl: float = 600.0, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir or None
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+        self._mem: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return product_id_from_url(url)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _drop(self, key: str):
+        entry = self._mem.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _store_mem(self, key: str, entry: _Entry):
+        self._drop(key)
+        if entry.size > self.max_bytes:
+            return
+        self._mem[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            _, old = self._mem.popitem(last=False)
+            self._bytes -= old.size
+
+    def _load_disk(self, key: str) -> Optional[_Entry]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if raw.get("key") != key:
+            return None
+        return _Entry(raw["pages"], raw["depth"], raw["complete"], raw["created"], raw.get("size", 0))
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        entry = self._mem.get(key)
+        if entry is None:
+            entry = self._load_disk(key)
+            if entry is not None and time.time() - entry.created < self.ttl:
+                self._store_mem(key, entry)
+        if entry is None:
+            return None
+        if time.time() - entry.created >= self.ttl:
+            self._drop(key)
+            if self.disk_dir:
+                try:
+                    os.remove(self._disk_path(key))
+                except OSError:
+                    pass
+            return None
+        if key in self._mem:  # 메모리 상한보다 큰 디스크 항목은 메모리에 올리지 않고 그대로 응답
+            self._mem.move_to_end(key)
+        return entry
+
+    def get(self, url: str, limit_pages: int) -> Optional[Tuple[List[dict], float]]:
+        """(리뷰 목록, 캐시 나이[초]) 또는 None"""
+        key = self.key(url)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or not entry.covers(limit_pages):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.reviews(limit_pages), time.time() - entry.created
+
+    def put(self, url: str, pages: List[List[dict]], complete: bool = False):
+        """
+        pages: 실제로 받은 페이지들 → 깊이는 len(pages) (중간에 멈춘 결과를 요청 깊이만큼으로 보지 않음)
+        complete: 수집기가 마지막 페이지(다음 페이지 없음)를 실제로 확인함 → 더 깊은 요청에도 이 결과로 응답
+        한 페이지도 못 받은 결과는 저장하지 않음
+        """
+        if not pages:
+            return
+        key = self.key(url)
+        depth = len(pages)
+        data = json.dumps(pages, ensure_ascii=False)
+        entry = _Entry(pages, depth, complete, time.time(), len(data.encode("utf-8")))
+        with self._lock:
+            current = self._lookup(key)
+            # 더 깊은 최신 결과가 있으면 얕은 결과로 덮어쓰지 않음
+            if current is not None and current.covers(depth) and not entry.covers(current.depth):
+                return
+            self._store_mem(key, entry)
+        if self.disk_dir:
+            try:
+                tmp = self._disk_path(key) + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(
+                        f'{{"key": {json.dumps(key)}, "depth": {depth}, "complete": {json.dumps(complete)}, '
+                        f'"created": {entry.created}, "size": {entry.size}, "pages": {data}}}'
+                    )
+                os.replace(tmp, self._disk_path(key))
+            except OSError as e:
+                logger.warning(f"⚠️ 결과 캐시 디스크 저장 실패: {e}")
+
+    def invalidate(self, url: Optional[str] = None) -> int:
+        """url 이 없으면 전체 삭제. 삭제된 항목 수를 돌려줌"""
+        with self._lock:
+            if url is None:
+                names = {os.path.basename(self._disk_path(k)) for k in self._mem} if self.disk_dir else set()
+                count = len(self._mem)
+                self._mem.clear()
+                self._bytes = 0
+                if self.disk_dir:
+                    for name in os.listdir(self.disk_dir):
+                        if name.endswith(".json"):
+                            count += name not in names
+                            os.remove(os.path.join(self.disk_dir, name))
+                return count
+            key = self.key(url)
+            count = 1 if key in self._mem else 0
+            self._drop(key)
+            if self.disk_dir and os.path.exists(self._disk_path(key)):
+                os.remove(self._disk_path(key))
+                count = 1
+            return count
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._mem),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "disk": self.disk_dir,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,194 +1,939 @@
-import logging
-import json
-import asyncio
-import sys
-import uvicorn
-from typing import Optional, List
-
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.middleware.cors import CORSMiddleware
-from playwright.async_api import async_playwright, Browser, Page
-from bs4 import BeautifulSoup
-
-# 윈도우 에러 방지
-if sys.platform == 'win32':
-    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-
-logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s: %(message)s")
-logger = logging.getLogger("scraper")
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-
-async def launch_browser(p) -> Browser:
-    return await p.chromium.launch(
-        headless=False,  # 화면 보임 (필수)
-        args=[
-            "--disable-blink-features=AutomationControlled",
-            "--no-sandbox",
-            "--disable-infobars",
-            f"--user-agent={UA}"
-        ]
-    )
-
-def normalize_cookie(c: dict) -> dict:
-    raw_same = str(c.get("sameSite", "None")).lower()
-    same_site = "None"
-    if raw_same == "lax": same_site = "Lax"
-    elif raw_same == "strict": same_site = "Strict"
-    
-    expires = c.get("expires", 0)
-    try: expires = float(expires)
-    except: expires = 0
-
-    return {
-        "name": c["name"],
-        "value": c["value"],
-        "domain": c["domain"],
-        "path": c.get("path", "/"),
-        "expires": expires,
-        "httpOnly": c.get("httpOnly", False),
-        "secure": c.get("secure", True),
-        "sameSite": same_site,
-    }
-
-async def create_page(browser: Browser, cookie_data: dict) -> Page:
-    context = await browser.new_context(
-        locale="ko-KR",
-        user_agent=UA,
-        viewport={"width": 1920, "height": 1080}
-    )
-    await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    
-    if cookie_data and "cookies" in cookie_data:
-        try:
-            clean_cookies = [normalize_cookie(c) for c in cookie_data["cookies"]]
-            await context.add_cookies(clean_cookies)
-            logger.info(f"🍪 쿠키 {len(clean_cookies)}개 로드 시도")
-        except Exception as e:
-            logger.error(f"⚠️ 쿠키 로드 실패: {e}")
-
-    return await context.new_page()
-
-def parse_review_card(card):
-    try:
-        nickname = card.select_one(".Db9Dtnf7gY strong").get_text(strip=True)
-    except: nickname = "익명"
-    try: date = card.select_one(".Db9Dtnf7gY span:nth-of-type(1)").get_text(strip=True)
-    except: date = ""
-    try: rating = int(card.select_one("em.n6zq2yy0KA").get_text(strip=True))
-    except: rating = 5
-    content = ""
-    try:
-        content_box = card.select_one(".KqJ8Qqw082")
-        if content_box:
-            spans = content_box.select("span")
-            if len(spans) >= 2: content = spans[-1].get_text(" ", strip=True)
-            elif len(spans) == 1: content = spans[0].get_text(" ", strip=True)
-    except: pass
-    return {"user": nickname, "date": date, "rating": rating, "content": content}
-
-async def load_review_frame(page: Page):
-    try:
-        btn = page.locator("[data-name='REVIEW']").first
-        if await btn.is_visible():
-            await btn.click()
-            await page.wait_for_timeout(2000)
-    except: pass
-    for _ in range(30):
-        for frame in page.frames:
-            if "review" in frame.url.lower(): return frame
-        await page.wait_for_timeout(500)
-    return page
-
-async def scrape_reviews(url: str, limit_pages: int, cookie_data: dict):
-    async with async_playwright() as p:
-        browser = await launch_browser(p)
-        page = await create_page(browser, cookie_data)
-
-        try:
-            logger.info(f"이동 중: {url}")
-            await page.goto(url, timeout=90000, wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
-            
-            # 👇👇👇 [핵심 수정] 차단 감지 시 30초 대기 기능 👇👇👇
-            content = await page.content()
-            if "서비스 접속이 불가합니다" in content or "Access Denied" in content:
-                logger.warning("🚨 네이버 차단 화면 감지됨! 30초 대기합니다. 화면에서 직접 풀어주세요!")
-                # 사용자가 풀 시간 30초 줌
-                await page.wait_for_timeout(30000) 
-                
-                # 30초 뒤에 다시 확인
-                content = await page.content()
-                if "서비스 접속이 불가합니다" in content:
-                     raise HTTPException(503, "네이버 차단이 해제되지 않았습니다.")
-            # 👆👆👆 ----------------------------------------- 👆👆👆
-
-            iframe = await load_review_frame(page)
-            results = []
-            seen = set()
-
-            for n in range(1, limit_pages + 1):
-                logger.info(f"페이지 {n} 수집 중...")
-                await iframe.evaluate("window.scrollBy(0, 1000)")
-                await page.wait_for_timeout(1500)
-
-                soup = BeautifulSoup(await iframe.content(), "lxml")
-                cards = soup.select(".IwcuBUIAKf")
-                
-                if not cards: break
-
-                for card in cards:
-                    info = parse_review_card(card)
-                    if info:
-                        key = f"{info['user']}|{info['content'][:15]}"
-                        if key not in seen:
-                            seen.add(key)
-                            results.append(info)
-                
-                try:
-                    next_btn = iframe.locator(f"a.U7Lsd_y9Gg:has-text('{n+1}')").first
-                    if await next_btn.count() > 0:
-                        await next_btn.click()
-                        await page.wait_for_timeout(2500)
-                    else: break
-                except: break
-            
-            return results
-        finally:
-            await browser.close()
-
-@app.post("/scrape")
-async def scrape_endpoint(
-    url: str = Form(...),
-    limit_pages: int = Form(3),
-    cookie_file: Optional[UploadFile] = File(None)
-):
-    cookie_data = {}
-    if cookie_file:
-        content = await cookie_file.read()
-        try: cookie_data = json.loads(content)
-        except: pass
-
-    try:
-        data = await scrape_reviews(url, limit_pages, cookie_data)
-        return {"status": "success", "count": len(data), "reviews": data}
-    except Exception as e:
-        logger.error(str(e))
-        raise HTTPException(500, f"Scraping Failed: {str(e)}")
-
-@app.get("/")
-async def root():
-    return {"status": "ok", "message": "Yonghwa's Local Scraper Ready"}
-
-if __name__ == "__main__":
-    uvicorn.run("smartstore_review_api:app", host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+import argparse
+import logging
+import json
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+import uvicorn
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from typing import Dict, Optional, List
+from urllib.parse import urlsplit
+
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from playwright.async_api import Browser, BrowserContext, Page
+from pydantic import BaseModel
+
+from smartstore_browser_pool import BrowserPool, ContextCache, cookie_key
+from smartstore_frame import (
+    NEXT_GROUP_SELECTOR, SCROLL_MODE, ScrollStats, adaptive_scroll, extract_card_fields, jump_to_page, page_state,
+    wait_for_page_advance,
+)
+from smartstore_review_parser import api_review_from_fields, card_fields_from_html, review_from_fields
+from smartstore_review_store import ReviewStore, product_id_from_url
+from smartstore_dedup import DedupIndex, fingerprint_review
+from smartstore_review_xhr import ReviewXhrCollector
+from smartstore_jobs import Job, JobQueue, QueueFull, SqliteJobQueue, DONE, FAILED
+from smartstore_result_cache import ResultCache
+from smartstore_resource_block import BlockProfile, install_blocking
+from smartstore_timing import StageTimer
+from smartstore_metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, LoopLagMonitor, process_rss_bytes
+
+# 윈도우 에러 방지
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s: %(message)s")
+logger = logging.getLogger("scraper")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 멀티 프로세스 모드에서는 워커 프로세스가 브라우저를 띄움
+    if not SCRAPE_SHARDS:
+        await browser_pool.start()
+    await job_queue.start()
+    loop_lag_monitor.start()
+    try:
+        yield
+    finally:
+        await loop_lag_monitor.stop()
+        await job_queue.close()
+        await context_cache.close()
+        await browser_pool.close()
+        shutdown_parse_pool()
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# 추출 엔진: dom(iframe HTML 파싱) / js(iframe 안에서 카드 필드만 추출) / xhr(리뷰 JSON 응답 캡처, 실패 시 dom)
+ENGINES = ("dom", "js", "xhr")
+XHR_WAIT_TIMEOUT = float(os.getenv("XHR_WAIT_TIMEOUT", "5"))
+
+# 스트리밍 응답 형식 (/scrape stream=ndjson|sse)
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+# 배치 요청 동시 실행 수 (브라우저 풀 용량을 넘지 않음)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+# 멀티 프로세스 모드 (--workers N): 수집은 샤드별 워커 프로세스가 하고, 이 프로세스는 SQLite 큐에 넣고 기다림
+SCRAPE_SHARDS = int(os.getenv("SCRAPE_SHARDS", "0"))
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.sqlite3")  # 실행 폴더 기준. 대기 중인 job 의 쿠키가 잠시 저장됨
+SHARD_POLL_INTERVAL = float(os.getenv("SHARD_POLL_INTERVAL", "0.2"))
+
+# ==========================================
+# 메트릭 (GET /metrics, Prometheus 텍스트 형식)
+# 멀티 프로세스 모드에서는 수집이 워커 프로세스에서 일어나므로 이 프로세스에는 큐/작업 수치만 잡힘
+# ==========================================
+SCRAPE_BUCKETS = (1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+PAGE_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 30)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+M_JOBS = REGISTRY.counter("scraper_jobs_total", "완료된 작업 수 (POST /jobs)", ["result"])
+M_SCRAPES = REGISTRY.counter("scraper_scrapes_total", "수집 실행 수 (캐시 HIT 제외)", ["engine", "result"])
+M_SCRAPE_SECONDS = REGISTRY.histogram("scraper_scrape_duration_seconds", "상품 하나 수집 시간", ["engine"], SCRAPE_BUCKETS)
+M_PAGES = REGISTRY.counter("scraper_pages_total", "수집한 리뷰 페이지 수", ["engine"])
+M_PAGE_SECONDS = REGISTRY.histogram("scraper_page_duration_seconds", "리뷰 페이지 하나 처리 시간", ["engine"], PAGE_BUCKETS)
+M_REVIEWS = REGISTRY.counter("scraper_reviews_parsed_total", "파싱한 리뷰 카드 수", ["engine"])
+M_DUPLICATES = REGISTRY.counter("scraper_duplicates_dropped_total", "중복/이미 저장됨으로 버린 리뷰 수", ["engine"])
+M_BLOCKED = REGISTRY.counter("scraper_blocked_pages_total", "네이버 차단 화면 감지 수")
+M_BROWSER_LAUNCHES = REGISTRY.counter("scraper_browser_launches_total", "Chromium 실행 수")
+M_LOOP_LAG = REGISTRY.gauge("scraper_event_loop_lag_last_seconds", "마지막으로 잰 이벤트 루프 지연")
+M_LOOP_LAG_HIST = REGISTRY.histogram("scraper_event_loop_lag_seconds", "이벤트 루프 지연 분포", buckets=LAG_BUCKETS)
+REGISTRY.gauge("scraper_process_resident_memory_bytes", "API 프로세스 RSS", fn=process_rss_bytes)
+REGISTRY.gauge("scraper_browser_active_contexts", "사용 중인 브라우저 컨텍스트 수",
+               fn=lambda: browser_pool.stats()["active_contexts"])
+REGISTRY.gauge("scraper_cached_contexts", "쿠키 세트별로 캐시된 컨텍스트 수", fn=lambda: context_cache.stats()["contexts"])
+# 작업 큐 통계는 /metrics 가 렌더링 전에 읽어 둔 값 (SQLite 큐 조회를 이벤트 루프 밖에서 하기 위해)
+job_stats_snapshot: dict = {"queued": 0, "jobs": {}}
+REGISTRY.gauge("scraper_jobs_queued", "대기 중인 작업 수", fn=lambda: job_stats_snapshot["queued"])
+REGISTRY.gauge("scraper_jobs", "상태별 작업 수 (보관 중인 것 포함)", ["state"],
+               fn=lambda: {(k,): v for k, v in job_stats_snapshot["jobs"].items()})
+REGISTRY.gauge("scraper_result_cache_entries", "결과 캐시 항목 수", fn=lambda: result_cache.stats().get("entries"))
+
+loop_lag_monitor = LoopLagMonitor(M_LOOP_LAG, M_LOOP_LAG_HIST, float(os.getenv("LOOP_LAG_INTERVAL", "0.5")))
+
+# 화면 없이 실행 (로컬 목업 벤치마크 / CI 용. 실제 네이버 수집은 화면 보임이 필요)
+HEADLESS = os.getenv("SCRAPER_HEADLESS", "0") == "1"
+
+UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+async def launch_browser(p) -> Browser:
+    M_BROWSER_LAUNCHES.inc()
+    return await p.chromium.launch(
+        headless=HEADLESS,  # 화면 보임 (필수, SCRAPER_HEADLESS=1 은 목업 벤치마크용)
+        args=[
+            "--disable-blink-features=AutomationControlled",
+            "--no-sandbox",
+            "--disable-infobars",
+            f"--user-agent={UA}"
+        ]
+    )
+
+# 브라우저 풀 (요청마다 Chromium 을 새로 띄우지 않음)
+browser_pool = BrowserPool(
+    launch_browser,
+    size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+    contexts_per_browser=int(os.getenv("BROWSER_POOL_CONTEXTS", "4")),
+    max_uses=int(os.getenv("BROWSER_POOL_MAX_USES", "200")),
+)
+
+def normalize_cookie(c: dict) -> dict:
+    raw_same = str(c.get("sameSite", "None")).lower()
+    same_site = "None"
+    if raw_same == "lax": same_site = "Lax"
+    elif raw_same == "strict": same_site = "Strict"
+    
+    expires = c.get("expires", 0)
+    try: expires = float(expires)
+    except: expires = 0
+
+    return {
+        "name": c["name"],
+        "value": c["value"],
+        "domain": c["domain"],
+        "path": c.get("path", "/"),
+        "expires": expires,
+        "httpOnly": c.get("httpOnly", False),
+        "secure": c.get("secure", True),
+        "sameSite": same_site,
+    }
+
+def normalize_cookies(cookie_data: dict) -> List[dict]:
+    if not cookie_data or "cookies" not in cookie_data:
+        return []
+    try:
+        return [normalize_cookie(c) for c in cookie_data["cookies"]]
+    except Exception as e:
+        logger.error(f"⚠️ 쿠키 로드 실패: {e}")
+        return []
+
+async def create_context(browser: Browser, cookies: List[dict], storage_state: Optional[dict] = None) -> BrowserContext:
+    context = await browser.new_context(
+        locale="ko-KR",
+        user_agent=UA,
+        viewport={"width": 1920, "height": 1080},
+        storage_state=storage_state,
+    )
+    await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    # 스냅샷에서 복원한 컨텍스트는 쿠키가 이미 들어있음
+    if cookies and storage_state is None:
+        try:
+            await context.add_cookies(cookies)
+            logger.info(f"🍪 쿠키 {len(cookies)}개 로드 시도")
+        except Exception as e:
+            logger.error(f"⚠️ 쿠키 로드 실패: {e}")
+
+    return context
+
+# 같은 쿠키 세트로 반복 호출 시 컨텍스트 재사용
+context_cache = ContextCache(
+    browser_pool,
+    create_context,
+    max_size=int(os.getenv("CONTEXT_CACHE_SIZE", "16")),
+    ttl=float(os.getenv("CONTEXT_CACHE_TTL", "900")),
+)
+
+# 리뷰 텍스트만 읽으므로 이미지/폰트/분석 스크립트 등은 받지 않음 (BLOCK_* 환경변수로 조정)
+block_profile = BlockProfile.from_env()
+
+# iframe HTML 파싱은 이벤트 루프 밖(스레드/프로세스 풀)에서 → 파싱하는 동안 다음 페이지로 이동
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "thread")  # thread | process
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+
+_parse_pool: Optional[Executor] = None
+
+def get_parse_pool() -> Executor:
+    global _parse_pool
+    if _parse_pool is None:
+        if PARSE_EXECUTOR == "process":
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            _parse_pool = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+        logger.info(f"🧩 파서 풀 시작 ({PARSE_EXECUTOR}, workers={PARSE_WORKERS})")
+    return _parse_pool
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+async def parse_frame_dom(iframe, timer: StageTimer) -> asyncio.Future:
+    """iframe HTML 스냅샷만 뜨고, 파싱은 풀에 넘긴 future 로 돌려줌"""
+    with timer.span("content"):
+        html = await iframe.content()
+    return asyncio.get_running_loop().run_in_executor(get_parse_pool(), card_fields_from_html, html)
+
+def ready_rows(rows) -> asyncio.Future:
+    fut = asyncio.get_running_loop().create_future()
+    fut.set_result(rows)
+    return fut
+
+async def go_next_page(iframe, n: int) -> Optional[bool]:
+    """
+    n+1 페이지 버튼 클릭 후 전환까지 대기.
+    다음 페이지 버튼이 없으면 False (= n 이 마지막 페이지), 클릭 등이 실패해서 못 넘어가면 None
+    """
+    try:
+        next_btn = iframe.locator(f"a.U7Lsd_y9Gg:has-text('{n+1}')").first
+        if await next_btn.count() == 0:
+            if await iframe.locator(".LiT9lKOVbw").count() == 0:
+                return None  # 페이지네이션 자체가 안 보이면 마지막인지 알 수 없음
+            if await iframe.locator(NEXT_GROUP_SELECTOR).count() == 0:
+                return False
+            # 번호 묶음의 끝 (예: 10) → '다음' 으로 다음 묶음(11~) 으로 넘어감
+            return True if await jump_to_page(iframe, n + 1) else None
+        before = await page_state(iframe)
+        await next_btn.click()
+        if not await wait_for_page_advance(iframe, before):
+            logger.warning(f"⚠️ 페이지 {n+1} 전환 신호 없음 (timeout) → 계속 진행")
+        return True
+    except:
+        return None
+
+async def load_review_frame(page: Page):
+    try:
+        btn = page.locator("[data-name='REVIEW']").first
+        if await btn.is_visible():
+            await btn.click()
+            await page.wait_for_timeout(2000)
+    except: pass
+    for _ in range(30):
+        for frame in page.frames:
+            if "review" in frame.url.lower(): return frame
+        await page.wait_for_timeout(500)
+    return page
+
+_review_store: Optional[ReviewStore] = None
+
+def get_review_store() -> ReviewStore:
+    global _review_store
+    if _review_store is None:
+        _review_store = ReviewStore()
+    return _review_store
+
+# 예전 고정 스크롤: 1000px 한 번 + 1.5초 대기 (절약 시간 계산 기준)
+FIXED_SCROLL_WAIT = 1.5
+
+async def scroll_reviews(tab: Page, frame, scroll: ScrollStats):
+    """카드 수가 더 늘지 않을 때까지 스크롤. SCROLL_MODE=fixed 이거나 실패하면 예전 고정 스크롤"""
+    t = time.perf_counter()
+    result = await adaptive_scroll(frame) if SCROLL_MODE != "fixed" else None
+    if result is None or "error" in result:
+        await frame.evaluate("window.scrollBy(0, 1000)")
+        await tab.wait_for_timeout(FIXED_SCROLL_WAIT * 1000)
+        result = dict(result or {}, steps=1)
+    scroll.add(result, time.perf_counter() - t)
+
+async def scroll_and_parse(tab: Page, frame, engine: str, timer: StageTimer, scroll: ScrollStats) -> asyncio.Future:
+    """지연 로딩 카드를 띄우고 파싱 future 를 돌려줌 (dom 은 파서 풀에서, js 는 이미 끝난 future)"""
+    with timer.span("scroll"):
+        await scroll_reviews(tab, frame, scroll)
+    if engine == "js":
+        with timer.span("extract"):
+            return ready_rows(await extract_card_fields(frame))
+    return await parse_frame_dom(frame, timer)
+
+async def sequential_rows(page: Page, iframe, limit_pages: int, engine: str, collector, timer: StageTimer,
+                          scroll: ScrollStats, end: dict):
+    """한 탭에서 1 페이지부터 차례로 (페이지 번호, 필드 행) 을 내보냄. 마지막 페이지를 확인하면 end["last_page"]"""
+    for n in range(1, limit_pages + 1):
+        logger.info(f"페이지 {n} 수집 중...")
+        timer.page(n)
+        parsed = None
+        if collector is not None:
+            with timer.span("xhr_wait"):
+                rows = await collector.next_batch(XHR_WAIT_TIMEOUT)
+            if rows is None:
+                # 한 번 놓치면 이후 페이지도 XHR 이 안 잡힐 가능성이 높음 → 페이지마다 타임아웃을 기다리지 않음
+                logger.info("   (리뷰 XHR 응답 없음 → 이번 수집은 DOM 파싱으로 전환)")
+                collector.detach()
+                collector = None
+            else:
+                parsed = ready_rows(rows)
+
+        if parsed is None:
+            parsed = await scroll_and_parse(page, iframe, engine, timer, scroll)
+
+        # 페이지 n 을 파싱하는 동안 n+1 로 이동. 종료 조건(빈 페이지/이미 저장된 페이지)은 한 페이지 늦게 확인됨
+        with timer.span("paginate"):
+            has_next = await go_next_page(iframe, n) if n < limit_pages else True
+        if has_next is False:
+            end["last_page"] = n
+        # 파싱은 이동과 겹쳐서 진행되므로 여기서는 남은 대기 시간만 잡힘
+        with timer.span("parse"):
+            rows = await parsed
+
+        if not rows: return
+        yield n, rows
+        if not has_next: return
+
+# ==========================================
+# 여러 탭 병렬 수집 (fan-out)
+# - 같은 컨텍스트(쿠키)에서 탭 K 개를 열고, 페이지 범위를 K 등분해 각 탭이 자기 시작 페이지로 이동 후 차례로 수집
+# - 결과는 페이지 순서대로 내보냄 (중복 제거는 호출 쪽에서 순서대로)
+# - 호스트별 추가 탭 예산(TAB_HOST_BUDGET)을 넘으면 가능한 만큼만 열고, 못 연 범위는 남은 탭이 이어서 처리
+# ==========================================
+FANOUT_TABS = int(os.getenv("FANOUT_TABS", "1"))
+FANOUT_MAX_TABS = int(os.getenv("FANOUT_MAX_TABS", "8"))
+TAB_HOST_BUDGET = int(os.getenv("TAB_HOST_BUDGET", "6"))
+
+_host_budgets: Dict[str, asyncio.Semaphore] = {}
+
+def host_budget(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc.lower()
+    sem = _host_budgets.get(host)
+    if sem is None:
+        sem = _host_budgets[host] = asyncio.Semaphore(TAB_HOST_BUDGET)
+    return sem
+
+def fanout_ranges(limit_pages: int, tabs: int) -> List[tuple]:
+    chunk = -(-limit_pages // tabs)
+    return [(first, min(first + chunk - 1, limit_pages)) for first in range(1, limit_pages + 1, chunk)]
+
+async def open_review_tab(context: BrowserContext, url: str, timer: StageTimer):
+    """추가 탭: 상품 페이지를 열고 리뷰 iframe 까지. (탭, iframe, 네트워크 통계)"""
+    tab = await context.new_page()
+    net = await install_blocking(tab, block_profile)
+    with timer.span("goto"):
+        await tab.goto(url, timeout=90000, wait_until="domcontentloaded")
+    with timer.span("block_check"):
+        content = await tab.content()
+        if "서비스 접속이 불가합니다" in content or "Access Denied" in content:
+            M_BLOCKED.inc()
+            raise HTTPException(503, "네이버 차단 화면 (추가 탭)")
+    with timer.span("review_frame"):
+        iframe = await load_review_frame(tab)
+    return tab, iframe, net
+
+async def fanout_rows(page: Page, iframe, url: str, limit_pages: int, engine: str, tabs: int, timer: StageTimer,
+                      fanout: dict, scroll: ScrollStats, end: dict):
+    """
+    탭 여러 개로 나눠 수집하고 (페이지 번호, 필드 행) 을 페이지 순서대로 내보냄.
+    fanout 에 탭별 통계를, 어느 탭이든 마지막 페이지를 확인하면 end["last_page"] 를 채움
+    """
+    loop = asyncio.get_running_loop()
+    engine = "js" if engine == "js" else "dom"  # 추가 탭에는 XHR 수집기가 없으므로 DOM 기준으로 통일
+    budget = host_budget(url)
+    acquired = 0
+    for _ in range(tabs - 1):
+        if budget.locked():
+            break
+        await budget.acquire()  # 잠겨 있지 않으면 기다리지 않음
+        acquired += 1
+    ranges = fanout_ranges(limit_pages, acquired + 1)
+    while acquired > len(ranges) - 1:  # 페이지 수가 적어 등분이 덜 나온 경우 남는 예산 반납
+        budget.release()
+        acquired -= 1
+    futures = {n: loop.create_future() for n in range(1, limit_pages + 1)}
+    tab_timers = [timer] + [StageTimer() for _ in ranges[1:]]
+    tab_nets = []
+    opened = []
+    logger.info(f"🗂 탭 {len(ranges)}개로 나눠 수집: {ranges}")
+
+    def finish_range(first: int, last: int, error: Optional[BaseException] = None):
+        """아직 안 채운 페이지를 빈 결과(= 끝)로. 에러면 첫 빈 페이지에 에러를 실어 보냄"""
+        for n in range(first, last + 1):
+            fut = futures[n]
+            if fut.done():
+                continue
+            if error is not None:
+                fut.set_exception(error)
+                error = None
+            else:
+                fut.set_result([])
+
+    async def worker(i: int, first: int, last: int):
+        tab_timer = tab_timers[i]
+        try:
+            if i == 0:
+                tab, frame = page, iframe
+            else:
+                tab, frame, net = await open_review_tab(page.context, url, tab_timer)
+                opened.append(tab)
+                tab_nets.append(net)
+                with tab_timer.span("jump"):
+                    if not await jump_to_page(frame, first):
+                        logger.info(f"   (탭 {i + 1}: {first} 페이지 없음)")
+                        return
+            for n in range(first, last + 1):
+                tab_timer.page(n)
+                parsed = await scroll_and_parse(tab, frame, engine, tab_timer, scroll)
+                with tab_timer.span("paginate"):
+                    has_next = await go_next_page(frame, n) if n < last else True
+                if has_next is False:
+                    end["last_page"] = n
+                with tab_timer.span("parse"):
+                    rows = await parsed
+                futures[n].set_result(rows)
+                if not rows or not has_next:
+                    return
+        except Exception as e:
+            finish_range(first, last, e)
+        finally:
+            finish_range(first, last)
+
+    tasks = [asyncio.create_task(worker(i, first, last)) for i, (first, last) in enumerate(ranges)]
+    try:
+        for n in range(1, limit_pages + 1):
+            rows = await futures[n]
+            if not rows:
+                return
+            yield n, rows
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for fut in futures.values():
+            if fut.done() and not fut.cancelled():
+                fut.exception()  # 소비되지 않은 에러 경고 방지
+        for tab in opened:
+            try:
+                await tab.close()
+            except Exception:
+                pass
+        for _ in range(acquired):
+            budget.release()
+        fanout.update({
+            "tabs": len(ranges),
+            "ranges": ranges,
+            "tab_timings": [t.as_dict() for t in tab_timers[1:]],
+            "tab_network": [net.as_dict() for net in tab_nets],
+        })
+
+async def iter_review_pages(url: str, limit_pages: int, cookie_data: dict, engine: str = "dom", incremental: bool = False,
+                            report: Optional[dict] = None, tabs: Optional[int] = None):
+    """
+    페이지마다 (페이지 번호, 새로 수집된 리뷰 목록) 을 내보냄.
+    incremental 이면 리뷰 저장소에 없던 리뷰만 내보내고, 전부 이미 저장된 페이지에서 멈춤.
+    tabs > 1 이면 탭 여러 개로 페이지를 나눠 수집 (증분 수집은 앞에서부터 멈춰야 하므로 항상 한 탭).
+    report 를 주면 끝난 뒤 네트워크 통계("network"), 단계별 시간("timings"), 스크롤 통계("scroll"),
+    마지막 페이지 확인 여부("last_page_reached")를 채워 줌.
+    """
+    store = get_review_store() if incremental else None
+    product_id = product_id_from_url(url)
+    tabs = max(1, min(FANOUT_TABS if tabs is None else tabs, FANOUT_MAX_TABS, limit_pages))
+    if incremental:
+        tabs = 1
+    timer = StageTimer()
+    fanout = {}
+    end = {}  # 마지막 페이지를 실제로 확인했을 때만 "last_page" (결과 캐시의 complete 판단용)
+    last_yielded = None
+    scroll = ScrollStats(FIXED_SCROLL_WAIT)
+    m_pages, m_page_seconds = M_PAGES.labels(engine), M_PAGE_SECONDS.labels(engine)
+    m_reviews, m_duplicates = M_REVIEWS.labels(engine), M_DUPLICATES.labels(engine)
+    result = "error"
+    async with context_cache.page(normalize_cookies(cookie_data)) as page:
+        net = await install_blocking(page, block_profile)
+        collector = ReviewXhrCollector(page) if engine == "xhr" and tabs == 1 else None
+        try:
+            logger.info(f"이동 중: {url}")
+            with timer.span("goto"):
+                await page.goto(url, timeout=90000, wait_until="domcontentloaded")
+            with timer.span("settle"):
+                await page.wait_for_timeout(3000)
+            
+            # 👇👇👇 [핵심 수정] 차단 감지 시 30초 대기 기능 👇👇👇
+            with timer.span("block_check"):
+                content = await page.content()
+                if "서비스 접속이 불가합니다" in content or "Access Denied" in content:
+                    logger.warning("🚨 네이버 차단 화면 감지됨! 30초 대기합니다. 화면에서 직접 풀어주세요!")
+                    M_BLOCKED.inc()
+                    # 사용자가 풀 시간 30초 줌
+                    await page.wait_for_timeout(30000) 
+                    
+                    # 30초 뒤에 다시 확인
+                    content = await page.content()
+                    if "서비스 접속이 불가합니다" in content:
+                         raise HTTPException(503, "네이버 차단이 해제되지 않았습니다.")
+            # 👆👆👆 ----------------------------------------- 👆👆👆
+
+            with timer.span("review_frame"):
+                iframe = await load_review_frame(page)
+            seen = DedupIndex.from_env()
+
+            if tabs > 1:
+                source = fanout_rows(page, iframe, url, limit_pages, engine, tabs, timer, fanout, scroll, end)
+            else:
+                source = sequential_rows(page, iframe, limit_pages, engine, collector, timer, scroll, end)
+            page_started = time.perf_counter()
+            async with aclosing(source) as pages_it:
+                async for n, rows in pages_it:
+                    with timer.span("dedup"):
+                        records = [review_from_fields(r) for r in rows]
+                        fps = [fingerprint_review(r) for r in records]
+                        known = set()
+                        if store is not None:
+                            known = await asyncio.to_thread(store.merge, product_id, zip(fps, records))
+
+                    new_reviews = []
+                    for row, fp in zip(rows, fps):
+                        if fp not in known and seen.add(fp):
+                            new_reviews.append(api_review_from_fields(row))
+                    m_pages.inc()
+                    m_page_seconds.observe(time.perf_counter() - page_started)
+                    m_reviews.inc(len(rows))
+                    m_duplicates.inc(len(rows) - len(new_reviews))
+                    last_yielded = n
+                    yield n, new_reviews
+                    page_started = time.perf_counter()
+
+                    if store is not None and all(fp in known for fp in fps):
+                        logger.info(f"⏹ 페이지 {n}: 모두 이미 저장된 리뷰 → 증분 수집 종료")
+                        break
+            result = "success"
+        except GeneratorExit:
+            # 소비하는 쪽이 중간에 닫음 (스트리밍 클라이언트 연결 끊김 등)
+            result = "cancelled"
+            raise
+        except Exception:
+            # 에러 난 세션은 다음 요청에 물려주지 않음
+            await context_cache.discard(page.context)
+            raise
+        finally:
+            if collector is not None:
+                collector.detach()
+            M_SCRAPES.labels(engine, result).inc()
+            M_SCRAPE_SECONDS.labels(engine).observe(timer.elapsed())
+            logger.info(f"🛡 요청 차단 {net.requests_blocked}건 (약 {net.bytes_saved_est // 1024}KB 절약), "
+                        f"로드 {net.requests_allowed}건 {net.bytes_loaded // 1024}KB")
+            if scroll.pages:
+                logger.info(f"🖱 스크롤 {scroll.pages}페이지 {scroll.steps}회 {scroll.seconds:.2f}s "
+                            f"(고정 스크롤 대비 {scroll.saved():.2f}s 절약)")
+            logger.info(f"⏱ {timer.summary()}")
+            if report is not None:
+                report["network"] = net.as_dict()
+                report["timings"] = timer.as_dict()
+                # 마지막 페이지까지 빠짐없이 받았음 (클릭 실패/차단/이동 실패로 멈춘 경우는 False)
+                report["last_page_reached"] = result == "success" and last_yielded is not None and \
+                    last_yielded == end.get("last_page")
+                if scroll.pages:
+                    report["scroll"] = scroll.as_dict()
+                if fanout:
+                    report["fanout"] = fanout
+
+# 결과 캐시 (상품 + 페이지 깊이). 증분 수집/스트리밍은 캐시를 거치지 않음
+result_cache = ResultCache(
+    ttl=float(os.getenv("RESULT_CACHE_TTL", "600")),
+    max_bytes=int(float(os.getenv("RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    disk_dir=os.getenv("RESULT_CACHE_DIR") or None,
+)
+
+async def scrape_reviews(url: str, limit_pages: int, cookie_data: dict, engine: str = "dom",
+                         incremental: bool = False, job: Optional[Job] = None, report: Optional[dict] = None,
+                         tabs: Optional[int] = None):
+    results = []
+    pages = []
+    if report is None:
+        report = job.report if job is not None else {}
+    async with aclosing(iter_review_pages(url, limit_pages, cookie_data, engine, incremental, report, tabs)) as it:
+        async for n, new_reviews in it:
+            pages.append(new_reviews)
+            results.extend(new_reviews)
+            if job is not None:
+                job.progress(n, len(results))
+    if not incremental:
+        await asyncio.to_thread(result_cache.put, url, pages, report.get("last_page_reached", False))
+    return results
+
+async def cached_scrape_reviews(url: str, limit_pages: int, cookie_data: dict, engine: str = "dom",
+                                incremental: bool = False, job: Optional[Job] = None, report: Optional[dict] = None,
+                                tabs: Optional[int] = None):
+    """(리뷰 목록, 캐시 상태 HIT/MISS/BYPASS, 캐시 나이[초])"""
+    if incremental:
+        return await scrape_reviews(url, limit_pages, cookie_data, engine, incremental, job, report, tabs), "BYPASS", None
+    hit = await asyncio.to_thread(result_cache.get, url, limit_pages)
+    if hit is not None:
+        reviews, age = hit
+        if job is not None:
+            job.progress(0, len(reviews))
+        return reviews, "HIT", age
+    return await scrape_reviews(url, limit_pages, cookie_data, engine, incremental, job, report, tabs), "MISS", None
+
+def stream_event(fmt: str, payload: dict) -> str:
+    data = json.dumps(payload, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {payload['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+async def stream_reviews(url: str, limit_pages: int, cookie_data: dict, engine: str, incremental: bool, fmt: str,
+                         timings: bool = False, tabs: Optional[int] = None):
+    """페이지가 끝날 때마다 새 리뷰를 내보내고, 마지막에 합계/소요시간 trailer (timings 면 단계별 시간 포함)"""
+    started = time.monotonic()
+    total = pages = 0
+    report = {}
+    try:
+        async with aclosing(iter_review_pages(url, limit_pages, cookie_data, engine, incremental, report, tabs)) as it:
+            async for n, new_reviews in it:
+                total += len(new_reviews)
+                pages = n
+                yield stream_event(fmt, {"type": "page", "page": n, "count": len(new_reviews), "reviews": new_reviews})
+        if not timings:
+            report.pop("timings", None)
+        yield stream_event(fmt, {"type": "done", "status": "success", "count": total, "pages": pages,
+                                 "elapsed": round(time.monotonic() - started, 3), **report})
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"스트리밍 수집 실패: {detail}")
+        if not timings:
+            report.pop("timings", None)
+        yield stream_event(fmt, {"type": "error", "status": "error", "error": detail, "count": total, "pages": pages,
+                                 "elapsed": round(time.monotonic() - started, 3), **report})
+
+async def run_job(job: Job):
+    try:
+        reviews, cache_status, age = await cached_scrape_reviews(job.url, job.limit_pages, job.cookie_data, job.engine,
+                                                                 job.incremental, job=job)
+    except Exception:
+        M_JOBS.labels("error").inc()
+        raise
+    M_JOBS.labels("success").inc()
+    job.report["cache"] = cache_status
+    if age is not None:
+        job.report["cache_age"] = int(age)
+    return reviews
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "1000"))
+JOB_RETRY_AFTER = int(os.getenv("JOB_RETRY_AFTER", "10"))  # 큐가 가득 찼을 때 Retry-After (초)
+
+# 비동기 작업 큐 (POST /jobs). 멀티 프로세스 모드에서는 워커 프로세스와 공유하는 SQLite 큐
+if SCRAPE_SHARDS:
+    job_queue = SqliteJobQueue(JOB_DB_PATH, SCRAPE_SHARDS, result_ttl=JOB_RESULT_TTL, max_queued=JOB_QUEUE_MAX)
+else:
+    job_queue = JobQueue(run_job, workers=JOB_WORKERS, result_ttl=JOB_RESULT_TTL, max_queued=JOB_QUEUE_MAX)
+
+async def job_queue_call(fn, *args, **kwargs):
+    """
+    SQLite 공유 큐 호출은 스레드에서 (timeout=30 / BEGIN IMMEDIATE 잠금 대기가 이벤트 루프를 막지 않게).
+    메모리 큐(JobQueue)는 asyncio.Queue 를 쓰므로 루프에서 바로
+    """
+    if isinstance(job_queue, SqliteJobQueue):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
+
+def queue_full_error(e: QueueFull) -> HTTPException:
+    return HTTPException(503, str(e), headers={"Retry-After": str(JOB_RETRY_AFTER)})
+
+def job_key(url: str, limit_pages: int, engine: str, incremental: bool, cookie_data: dict) -> str:
+    return f"{url}|{limit_pages}|{engine}|{incremental}|{cookie_key(normalize_cookies(cookie_data))}"
+
+async def dispatch_scrape(url: str, limit_pages: int, cookie_data: dict, engine: str, incremental: bool, report: dict,
+                          tabs: Optional[int] = None):
+    """
+    단일 프로세스면 바로 수집, 멀티 프로세스 모드면 샤드 큐에 넣고 끝날 때까지 대기. (리뷰, 캐시 상태, 캐시 나이)
+    멀티 프로세스 모드의 탭 수는 워커의 FANOUT_TABS 를 따름
+    """
+    if not SCRAPE_SHARDS:
+        return await cached_scrape_reviews(url, limit_pages, cookie_data, engine, incremental, report=report, tabs=tabs)
+    try:
+        job = await asyncio.to_thread(job_queue.submit, url, limit_pages, engine, cookie_data,
+                                      job_key(url, limit_pages, engine, incremental, cookie_data), incremental=incremental)
+    except QueueFull as e:
+        raise queue_full_error(e)
+    job = await job_queue.wait(job.id, SHARD_POLL_INTERVAL)
+    if job is None:
+        raise HTTPException(500, "job expired")
+    if job.state == FAILED:
+        raise HTTPException(500, job.error)
+    extra = dict(job.report)
+    cache_status = extra.pop("cache", "MISS")
+    age = extra.pop("cache_age", None)
+    report.update(extra)
+    return job.result, cache_status, age
+
+# ==========================================
+# 샤드 워커 프로세스
+# ==========================================
+async def shard_worker(shard: int, shards: int, db_path: str):
+    queue = SqliteJobQueue(db_path, shards, result_ttl=JOB_RESULT_TTL, max_queued=JOB_QUEUE_MAX)
+    orphans = await asyncio.to_thread(queue.requeue_orphans, shard)
+    if orphans:
+        logger.warning(f"🧵 [shard {shard}] 중단됐던 작업 {orphans}개 재시도")
+    await browser_pool.start()
+    logger.info(f"🧵 [shard {shard}/{shards}] 워커 시작 (pid={os.getpid()}, 동시 {JOB_WORKERS})")
+
+    async def consume():
+        while True:
+            job = await asyncio.to_thread(queue.claim, shard)
+            if job is None:
+                await asyncio.sleep(SHARD_POLL_INTERVAL)
+                continue
+            logger.info(f"🧵 [shard {shard}] 작업 시작 {job.id} ({job.url})")
+            try:
+                result = await run_job(job)
+                await job.flush_progress()
+                await asyncio.to_thread(queue.finish, job, result)
+            except Exception as e:
+                error = getattr(e, "detail", None) or str(e)
+                logger.error(f"🧵 [shard {shard}] 작업 실패 {job.id}: {error}")
+                await job.flush_progress()
+                await asyncio.to_thread(queue.finish, job, error=error)
+
+    try:
+        await asyncio.gather(*(consume() for _ in range(JOB_WORKERS)))
+    finally:
+        await context_cache.close()
+        await browser_pool.close()
+        shutdown_parse_pool()
+        await queue.close()
+
+def run_shard_worker(shard: int, shards: int, db_path: str):
+    try:
+        asyncio.run(shard_worker(shard, shards, db_path))
+    except KeyboardInterrupt:
+        pass
+
+async def read_cookie_file(cookie_file: Optional[UploadFile]) -> dict:
+    cookie_data = {}
+    if cookie_file:
+        content = await cookie_file.read()
+        try: cookie_data = json.loads(content)
+        except: pass
+    return cookie_data
+
+@app.post("/scrape")
+async def scrape_endpoint(
+    response: Response,
+    url: str = Form(...),
+    limit_pages: int = Form(3),
+    engine: str = Form("dom"),
+    stream: str = Form(""),
+    incremental: bool = Form(False),
+    timings: bool = Form(False),
+    tabs: Optional[int] = Form(None),
+    cookie_file: Optional[UploadFile] = File(None)
+):
+    if engine not in ENGINES:
+        raise HTTPException(400, f"engine must be one of {ENGINES}")
+    if stream and stream not in STREAM_MEDIA_TYPES:
+        raise HTTPException(400, f"stream must be one of {tuple(STREAM_MEDIA_TYPES)}")
+    if stream and SCRAPE_SHARDS:
+        raise HTTPException(400, "stream is not available in multi-process mode (use /jobs)")
+
+    cookie_data = await read_cookie_file(cookie_file)
+
+    if stream:
+        return StreamingResponse(
+            stream_reviews(url, limit_pages, cookie_data, engine, incremental, stream, timings, tabs),
+            media_type=STREAM_MEDIA_TYPES[stream],
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    report = {}
+    try:
+        data, cache_status, age = await dispatch_scrape(url, limit_pages, cookie_data, engine, incremental, report, tabs)
+        response.headers["X-Cache"] = cache_status
+        if age is not None:
+            response.headers["X-Cache-Age"] = str(int(age))
+        # 단계별 시간은 요청했을 때만 (캐시 HIT 이면 수집을 안 했으므로 없음)
+        if not timings:
+            report.pop("timings", None)
+        return {"status": "success", "count": len(data), "reviews": data, **report}
+    except Exception as e:
+        if isinstance(e, HTTPException) and e.status_code == 503:
+            raise  # 작업 큐가 가득 참 → Retry-After 와 함께 그대로
+        logger.error(str(e))
+        raise HTTPException(500, f"Scraping Failed: {str(e)}")
+
+class BatchItem(BaseModel):
+    url: str
+    limit_pages: int = 3
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    engine: str = "dom"
+    incremental: bool = False
+    concurrency: Optional[int] = None
+    cookies: Optional[dict] = None  # 쿠키 파일과 같은 형식 {"cookies": [...]}
+    timings: bool = False  # 항목별 단계 시간 포함
+    tabs: Optional[int] = None  # 상품당 병렬 탭 수 (기본 FANOUT_TABS)
+
+@app.post("/scrape/batch")
+async def scrape_batch_endpoint(req: BatchRequest):
+    if req.engine not in ENGINES:
+        raise HTTPException(400, f"engine must be one of {ENGINES}")
+    if len(req.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(400, f"too many items (max {BATCH_MAX_ITEMS})")
+
+    capacity = browser_pool.capacity * max(1, SCRAPE_SHARDS)
+    concurrency = max(1, min(req.concurrency or BATCH_CONCURRENCY, capacity))
+    sem = asyncio.Semaphore(concurrency)
+    cookie_data = req.cookies or {}
+    started = time.monotonic()
+
+    async def run_one(item: BatchItem) -> dict:
+        async with sem:
+            t0 = time.monotonic()
+            report = {}
+            try:
+                data, cache_status, _ = await dispatch_scrape(item.url, item.limit_pages, cookie_data, req.engine, req.incremental,
+                                                              report, req.tabs)
+                if not req.timings:
+                    report.pop("timings", None)
+                return {"url": item.url, "status": "success", "count": len(data), "reviews": data,
+                        "cache": cache_status, "elapsed": round(time.monotonic() - t0, 3), **report}
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.error(f"배치 항목 실패 ({item.url}): {detail}")
+                return {"url": item.url, "status": "error", "error": detail,
+                        "elapsed": round(time.monotonic() - t0, 3)}
+
+    logger.info(f"📦 배치 수집 시작: {len(req.items)}개 (동시 {concurrency})")
+    results = await asyncio.gather(*(run_one(item) for item in req.items))
+    elapsed = time.monotonic() - started
+    succeeded = sum(1 for r in results if r["status"] == "success")
+
+    return {
+        "status": "success",
+        "count": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "concurrency": concurrency,
+        "elapsed": round(elapsed, 3),
+        "products_per_minute": round(len(results) / elapsed * 60, 2) if elapsed > 0 else None,
+        "results": results,
+    }
+
+@app.post("/jobs", status_code=202)
+async def submit_job_endpoint(
+    url: str = Form(...),
+    limit_pages: int = Form(3),
+    engine: str = Form("dom"),
+    incremental: bool = Form(False),
+    cookie_file: Optional[UploadFile] = File(None)
+):
+    if engine not in ENGINES:
+        raise HTTPException(400, f"engine must be one of {ENGINES}")
+
+    cookie_data = await read_cookie_file(cookie_file)
+    key = job_key(url, limit_pages, engine, incremental, cookie_data)
+    try:
+        job = await job_queue_call(job_queue.submit, url, limit_pages, engine, cookie_data, key, incremental=incremental)
+    except QueueFull as e:
+        raise queue_full_error(e)
+    return {"job_id": job.id, "state": job.state}
+
+@app.get("/jobs/{job_id}")
+async def job_status_endpoint(job_id: str):
+    job = await job_queue_call(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(404, "job not found (or expired)")
+    return job.status()
+
+@app.get("/jobs/{job_id}/result")
+async def job_result_endpoint(job_id: str):
+    job = await job_queue_call(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(404, "job not found (or expired)")
+    if job.state == FAILED:
+        raise HTTPException(500, f"Scraping Failed: {job.error}")
+    if job.state != DONE:
+        raise HTTPException(409, f"job is {job.state}")
+    return {"status": "success", "count": len(job.result), "reviews": job.result}
+
+@app.delete("/cache")
+async def invalidate_cache_endpoint(url: Optional[str] = None):
+    """url 을 주면 해당 상품만, 없으면 전체 결과 캐시 삭제"""
+    return {"status": "success", "invalidated": await asyncio.to_thread(result_cache.invalidate, url)}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    job_stats_snapshot.update(await job_queue_call(job_queue.stats))
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/")
+async def root():
+    return {"status": "ok", "message": "Yonghwa's Local Scraper Ready", "pool": browser_pool.stats(), "contexts": context_cache.stats(), "jobs": await job_queue_call(job_queue.stats), "cache": result_cache.stats()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SmartStore review scraper API")
+    parser.add_argument("--workers", type=int, default=SCRAPE_SHARDS,
+                        help="수집 워커 프로세스 수 (0 이면 API 프로세스에서 직접 수집)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    procs = []
+    if args.workers > 0:
+        # uvicorn 이 다시 import 하는 app 모듈과 워커 프로세스가 같은 설정을 보도록 환경변수로 전달
+        os.environ["SCRAPE_SHARDS"] = str(args.workers)
+        os.environ["JOB_DB_PATH"] = os.path.abspath(JOB_DB_PATH)
+        mp = multiprocessing.get_context("spawn")
+        procs = [mp.Process(target=run_shard_worker, args=(i, args.workers, os.environ["JOB_DB_PATH"]), name=f"shard-{i}")
+                 for i in range(args.workers)]
+        for proc in procs:
+            proc.start()
+        logger.info(f"🧵 워커 프로세스 {args.workers}개 시작 (queue={os.environ['JOB_DB_PATH']})")
+
+    try:
+        uvicorn.run("smartstore_review_api:app", host=args.host, port=args.port, reload=False)
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.join(10)
\ No newline at end of file
@@ -0,0 +1,161 @@
+# smartstore_review_parser.py
+"""
+리뷰 카드 파서 (GUI / CLI / API / 디버그 스크립트 공용)
+- 셀렉터 표(SELECTORS)를 모듈 로드 시 XPath 로 한 번만 컴파일
+- BeautifulSoup 객체 모델 없이 lxml 트리에서 바로 필드 추출
+- 모든 추출 경로(DOM / XHR / in-frame JS)는 같은 '필드 행'(FIELDS 순서의 tuple)을 만들고
+  여기서 GUI/CLI 형태 또는 API 형태의 dict 로 바꿈
+- 닉네임 요소가 아예 없으면 필드 행의 nickname 은 None (GUI/CLI 는 "", API 는 "익명"),
+  요소는 있는데 비어 있으면 "" (API 도 "" 그대로) → 예전 파서들과 같은 결과
+"""
+
+from typing import List
+
+from lxml import etree
+from lxml import html as lxml_html
+
+FIELDS = ("nickname", "date", "rating", "option", "auto_label", "tags", "body", "image_count")
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 필드 → (원래 CSS 셀렉터, 같은 의미의 XPath)
+SELECTORS = {
+    "card": (".IwcuBUIAKf", f"//*[{_has_class('IwcuBUIAKf')}]"),
+    "nickname": (".Db9Dtnf7gY strong", f".//*[{_has_class('Db9Dtnf7gY')}]//strong"),
+    "date": (".Db9Dtnf7gY span:nth-of-type(1)", f".//*[{_has_class('Db9Dtnf7gY')}]//span[not(preceding-sibling::span)]"),
+    "rating": ("em.n6zq2yy0KA", f".//em[{_has_class('n6zq2yy0KA')}]"),
+    "option": (".b_caIle8kC", f".//*[{_has_class('b_caIle8kC')}]"),
+    "buyer": (".eWRrdDdSzW", f".//*[{_has_class('eWRrdDdSzW')}]"),
+    "label": (".h8uqAeqIe7", f".//*[{_has_class('h8uqAeqIe7')}]"),
+    "content": (".KqJ8Qqw082", f".//*[{_has_class('KqJ8Qqw082')}]"),
+    "content_spans": ("span", ".//span"),
+    "image_box": (".s30AvhHfb0", f".//*[{_has_class('s30AvhHfb0')}]"),
+    "image_count": (".lOzR1kO8jf", f".//*[{_has_class('lOzR1kO8jf')}]"),
+    "images": ("img", ".//img"),
+}
+
+_XPATH = {name: etree.XPath(xpath, smart_strings=False) for name, (_, xpath) in SELECTORS.items()}
+
+# BeautifulSoup 과 같이 주석/스크립트/스타일 텍스트는 제외
+_TEXT = etree.XPath(".//text()[not(parent::script or parent::style)]", smart_strings=False)
+
+
+def _strings(el) -> List[str]:
+    """stripped_strings 와 동일"""
+    return [s for s in (t.strip() for t in _TEXT(el)) if s]
+
+
+def _text(el, sep: str = "") -> str:
+    """get_text(sep, strip=True) 와 동일"""
+    return sep.join(_strings(el)) if el is not None else ""
+
+
+def _one(name: str, el):
+    found = _XPATH[name](el)
+    return found[0] if found else None
+
+
+def card_fields(card) -> tuple:
+    """lxml 카드 요소 → 필드 행"""
+    nickname_el = _one("nickname", card)
+    nickname = _text(nickname_el) if nickname_el is not None else None
+    date = _text(_one("date", card))
+    rating = _text(_one("rating", card))
+
+    option = ""
+    option_box = _one("option", card)
+    if option_box is not None:
+        all_texts = _strings(option_box)
+        option = all_texts[0] if all_texts else ""
+
+    buyer_info = _text(_one("buyer", card), " ")
+    label_info = _text(_one("label", card), " ")
+    auto_label = " | ".join(x for x in [buyer_info, label_info] if x)
+
+    tags = []
+    body = ""
+    content_box = _one("content", card)
+    if content_box is not None:
+        spans = _XPATH["content_spans"](content_box)
+        if len(spans) >= 2:
+            tags = [_text(s) for s in spans[:-1]]
+            body = _text(spans[-1], " ")
+        elif len(spans) == 1:
+            body = _text(spans[0], " ")
+
+    image_count = 0
+    img_box = _one("image_box", card)
+    if img_box is not None:
+        count_span = _one("image_count", img_box)
+        if count_span is not None:
+            number = "".join(c for c in _text(count_span) if c.isdigit())
+            if number:
+                image_count = int(number)
+        elif _XPATH["images"](img_box):
+            image_count = 1
+
+    return (nickname, date, rating, option, auto_label, tags, body, image_count)
+
+
+def card_fields_from_html(html: str) -> List[tuple]:
+    """iframe HTML → 카드별 필드 행 (문서 순서)"""
+    if not html or not html.strip():
+        return []
+    doc = lxml_html.fromstring(html)
+    return [card_fields(card) for card in _XPATH["card"](doc)]
+
+
+def review_from_fields(fields) -> dict:
+    """GUI/CLI 형태 (reviews.csv 컬럼)"""
+    nickname, date, rating, option, auto_label, tags, body, image_count = fields
+    # 마지막 span 이전의 태그(한달사용, 재구매 등) + 본문
+    content = " ".join(list(tags) + [body]) if tags else body
+    return {
+        "nickname": nickname or "",
+        "date": date,
+        "rating": rating,
+        "option": option,
+        "auto_label": auto_label,
+        "content": content,
+        "image_count": image_count,
+    }
+
+
+def api_review_from_fields(fields) -> dict:
+    """API 형태 (/scrape 응답)"""
+    try:
+        rating = int(fields[2])
+    except Exception:
+        rating = 5
+    return {"user": "익명" if fields[0] is None else fields[0], "date": fields[1], "rating": rating, "content": fields[6]}
+
+
+def parse_review_card(card) -> dict:
+    return review_from_fields(card_fields(card))
+
+
+def parse_reviews_html(html: str, content_mode: str = "spans", skip_empty_option: bool = False) -> List[dict]:
+    """
+    GUI/CLI 형태 리뷰 목록.
+    content_mode="box": 본문을 span 단위가 아니라 본문 박스(.KqJ8Qqw082) 전체 텍스트(get_text(" "))로
+    skip_empty_option: 옵션 박스는 있는데 글자가 없는 카드는 건너뜀
+    (둘 다 smartstore_review_api_2511252315 의 예전 파서 동작)
+    """
+    if content_mode == "spans" and not skip_empty_option:
+        return [review_from_fields(f) for f in card_fields_from_html(html)]
+    if not html or not html.strip():
+        return []
+    reviews = []
+    for card in _XPATH["card"](lxml_html.fromstring(html)):
+        if skip_empty_option:
+            option_box = _one("option", card)
+            if option_box is not None and not _strings(option_box):
+                continue
+        review = review_from_fields(card_fields(card))
+        if content_mode == "box":
+            review["content"] = _text(_one("content", card), " ")
+        reviews.append(review)
+    return reviews
@@ -1,180 +1,165 @@
-# smartstore_review_scraper.py
-
-import time
-import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-
-
-# ================================
-# 리뷰 카드 파싱
-# ================================
-def parse_review_card(card):
-
-    # 닉네임
-    nickname_el = card.select_one(".Db9Dtnf7gY strong")
-    nickname = nickname_el.get_text(strip=True) if nickname_el else ""
-
-    # 날짜
-    date_el = card.select_one(".Db9Dtnf7gY span:nth-of-type(1)")
-    date = date_el.get_text(strip=True) if date_el else ""
-
-    # 평점
-    rating_el = card.select_one("em.n6zq2yy0KA")
-    rating = rating_el.get_text(strip=True) if rating_el else ""
-
-    # 옵션 (맨 첫 줄만)
-    option = ""
-    option_box = card.select_one(".b_caIle8kC")
-    if option_box:
-        all_texts = list(option_box.stripped_strings)
-        option = all_texts[0] if all_texts else ""
-
-    # 구매자 정보
-    buyer_el = card.select_one(".eWRrdDdSzW")
-    buyer_info = buyer_el.get_text(" ", strip=True) if buyer_el else ""
-
-    # 자동 라벨
-    label_el = card.select_one(".h8uqAeqIe7")
-    label_info = label_el.get_text(" ", strip=True) if label_el else ""
-
-    auto_label = " | ".join(x for x in [buyer_info, label_info] if x)
-
-    # 본문
-    content = ""
-    content_box = card.select_one(".KqJ8Qqw082")
-    if content_box:
-        spans = content_box.select("span")
-
-        # 모든 span 중 마지막을 '본문'으로 처리하고
-        # 마지막 이전 span들은 모두 태그(한달사용, 재구매 등)
-        if len(spans) >= 2:
-            tags = [s.get_text(strip=True) for s in spans[:-1]]     # 한달사용, 재구매 등
-            body = spans[-1].get_text(" ", strip=True)               # 실제 본문
-            content = " ".join(tags + [body])
-        elif len(spans) == 1:
-            content = spans[0].get_text(" ", strip=True)
-
-
-    # 이미지 개수
-    image_count = 0
-    img_box = card.select_one(".s30AvhHfb0")
-
-    if img_box:
-        count_span = img_box.select_one(".lOzR1kO8jf")
-        if count_span:
-            number = "".join(c for c in count_span.get_text(strip=True) if c.isdigit())
-            if number:
-                image_count = int(number)
-        else:
-            imgs = img_box.select("img")
-            if len(imgs) >= 1:
-                image_count = 1
-
-    return {
-        "nickname": nickname,
-        "date": date,
-        "rating": rating,
-        "option": option,
-        "auto_label": auto_label,
-        "content": content,
-        "image_count": image_count,
-    }
-
-
-# ================================
-# 리뷰탭 클릭 + iframe 자동 탐지
-# ================================
-def load_review_frame(page):
-
-    print("🔎 리뷰탭 탐색 중…")
-
-    # 리뷰탭 보일 때까지 스크롤
-    for _ in range(40):
-        btn = page.locator('[data-name="REVIEW"]').first
-        if btn.is_visible():
-            btn.scroll_into_view_if_needed()
-            btn.click()
-            print("✔ 리뷰탭 클릭 성공")
-            break
-        page.mouse.wheel(0, 600)
-        time.sleep(0.2)
-    else:
-        print("❌ 리뷰탭 못 찾음")
-        return None
-
-    # iframe 찾기
-    print("⌛ 리뷰 iframe 로딩 대기…")
-    for _ in range(80):
-        for f in page.frames:
-            lower = f.url.lower()
-            if ("review" in lower) or ("reviews" in lower) or ("pstatic" in lower):
-                print(f"✔ iframe 감지됨: {f.url}")
-                return f
-        time.sleep(0.25)
-
-    print("❌ iframe 감지 실패")
-    return None
-
-
-# ================================
-# 리뷰 전체 수집
-# ================================
-def extract_reviews_to_csv(url, limit_pages=13):
-    reviews = []
-    seen = set()
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        print("⏳ 페이지 접속 중…")
-        page.goto(url, timeout=60000)
-        time.sleep(3)
-
-        iframe = load_review_frame(page)
-
-        # iframe 없는 구버전 (DOM 직접 렌더링)
-        if iframe is None:
-            print("👉 iframe 없음 → 구버전 리뷰 방식으로 전환")
-            iframe = page
-
-        for n in range(1, limit_pages + 1):
-            print(f"\n📌 페이지 {n} 수집…")
-
-            soup = BeautifulSoup(iframe.content(), "lxml")
-            review_cards = soup.select(".IwcuBUIAKf")
-            print(f"  - 리뷰 감지: {len(review_cards)}")
-
-            for card in review_cards:
-                info = parse_review_card(card)
-                key = f"{info['nickname']}|{info['date']}|{info['content'][:20]}"
-                if key not in seen:
-                    seen.add(key)
-                    reviews.append(info)
-
-            # 다음 페이지 버튼 클릭
-            pagination = iframe.locator(".LiT9lKOVbw")
-            next_btn = pagination.locator(f'a:has-text("{n+1}")').first
-
-            if next_btn.count() > 0:
-                print(f"➡ 페이지 {n+1} 이동")
-                next_btn.click()
-                time.sleep(2)
-            else:
-                print("⛔ 다음 페이지 없음")
-                break
-
-        browser.close()
-
-    # 저장
-    df = pd.DataFrame(reviews)
-    df.to_csv("reviews.csv", index=False, encoding="utf-8-sig")
-    print("\n====================================")
-    print(f"✅ 총 리뷰 수집 완료: {len(reviews)}")
-    print("📁 reviews.csv 저장됨")
-    print("====================================")
-
-
-if __name__ == "__main__":
-    test_url = "https://smartstore.naver.com/contentking/products/10639139232"
-    extract_reviews_to_csv(test_url)
+# smartstore_review_scraper.py
+
+import argparse
+import os
+import time
+from playwright.sync_api import sync_playwright
+
+from smartstore_frame import click_next_group_sync, page_state_sync, wait_for_page_advance_sync
+from smartstore_review_parser import parse_reviews_html
+from smartstore_review_store import DEFAULT_STORE_PATH, ReviewStore, product_id_from_url
+from smartstore_dedup import DedupIndex, fingerprint_review
+from smartstore_export import EXPORT_FORMATS, EXTENSIONS, check_export_format, open_review_writer
+from smartstore_timing import StageTimer, timings_path
+
+# 화면 없이 실행 (로컬 목업 벤치마크용, 기본은 화면 보임)
+HEADLESS = os.getenv("SCRAPER_HEADLESS", "0") == "1"
+
+
+# ================================
+# 리뷰탭 클릭 + iframe 자동 탐지
+# ================================
+def load_review_frame(page):
+
+    print("🔎 리뷰탭 탐색 중…")
+
+    # 리뷰탭 보일 때까지 스크롤
+    for _ in range(40):
+        btn = page.locator('[data-name="REVIEW"]').first
+        if btn.is_visible():
+            btn.scroll_into_view_if_needed()
+            btn.click()
+            print("✔ 리뷰탭 클릭 성공")
+            break
+        page.mouse.wheel(0, 600)
+        time.sleep(0.2)
+    else:
+        print("❌ 리뷰탭 못 찾음")
+        return None
+
+    # iframe 찾기
+    print("⌛ 리뷰 iframe 로딩 대기…")
+    for _ in range(80):
+        for f in page.frames:
+            lower = f.url.lower()
+            if ("review" in lower) or ("reviews" in lower) or ("pstatic" in lower):
+                print(f"✔ iframe 감지됨: {f.url}")
+                return f
+        time.sleep(0.25)
+
+    print("❌ iframe 감지 실패")
+    return None
+
+
+# ================================
+# 리뷰 전체 수집
+# ================================
+def extract_reviews_to_csv(url, limit_pages=13, incremental=False, store_path=DEFAULT_STORE_PATH,
+                           out_path=None, fmt="csv", dataset=None):
+    """
+    fmt: csv / jsonl / parquet / arrow
+    dataset 을 주면 out_path 대신 <dataset>/product_id=<id>/ 아래 새 파일로 추가
+    """
+    check_export_format(fmt)  # 브라우저를 띄우기 전에 형식/pyarrow 확인
+    # 증분 수집: 저장소에 없던 리뷰만 모으고, 전부 저장된 페이지가 나오면 중단 (에러가 나도 저장소는 닫음)
+    store = ReviewStore(store_path) if incremental else None
+    try:
+        return _extract_reviews(url, limit_pages, store, store_path, out_path, fmt, dataset)
+    finally:
+        if store is not None:
+            store.close()
+
+
+def _extract_reviews(url, limit_pages, store, store_path, out_path, fmt, dataset):
+    seen = DedupIndex.from_env()
+    timer = StageTimer()
+    out_path = out_path or "reviews" + EXTENSIONS[fmt]
+    product_id = product_id_from_url(url)
+
+    with sync_playwright() as p:
+        with timer.span("launch"):
+            browser = p.chromium.launch(headless=HEADLESS)
+        page = browser.new_page()
+        print("⏳ 페이지 접속 중…")
+        with timer.span("goto"):
+            page.goto(url, timeout=60000)
+        with timer.span("settle"):
+            time.sleep(3)
+
+        with timer.span("review_frame"):
+            iframe = load_review_frame(page)
+
+        # iframe 없는 구버전 (DOM 직접 렌더링)
+        if iframe is None:
+            print("👉 iframe 없음 → 구버전 리뷰 방식으로 전환")
+            iframe = page
+
+        # 페이지마다 바로 파일에 기록 (CSV/JSONL 은 중간에 멈춰도 그때까지는 저장됨)
+        with open_review_writer(fmt, out_path, product_id, dataset) as writer:
+            for n in range(1, limit_pages + 1):
+                timer.page(n)
+                print(f"\n📌 페이지 {n} 수집…")
+
+                with timer.span("content"):
+                    html = iframe.content()
+                with timer.span("parse"):
+                    page_reviews = parse_reviews_html(html)
+                print(f"  - 리뷰 감지: {len(page_reviews)}")
+
+                with timer.span("dedup"):
+                    fps = [fingerprint_review(r) for r in page_reviews]
+                    known = set()
+                    if store is not None:
+                        known = store.merge(product_id, zip(fps, page_reviews))
+                if store is not None:
+                    print(f"  - 이미 저장된 리뷰: {len(known)}")
+
+                with timer.span("write"):
+                    writer.write_page(info for info, fp in zip(page_reviews, fps) if fp not in known and seen.add(fp))
+
+                if store is not None and fps and all(fp in known for fp in fps):
+                    print("⏹ 모두 이미 저장된 리뷰 → 증분 수집 종료")
+                    break
+
+                # 다음 페이지 버튼 클릭
+                with timer.span("paginate"):
+                    pagination = iframe.locator(".LiT9lKOVbw")
+                    next_btn = pagination.locator(f'a:has-text("{n+1}")').first
+                    has_next = next_btn.count() > 0
+                    if has_next:
+                        print(f"➡ 페이지 {n+1} 이동")
+                        before = page_state_sync(iframe)
+                        next_btn.click()
+                        if not wait_for_page_advance_sync(iframe, before):
+                            print("  - 페이지 전환 신호 없음 (timeout) → 계속 진행")
+                    elif click_next_group_sync(iframe):
+                        has_next = True
+                        print(f"➡ 페이지 {n+1} 이동 (다음 번호 묶음)")
+                if not has_next:
+                    print("⛔ 다음 페이지 없음")
+                    break
+
+        browser.close()
+
+    if store is not None:
+        print(f"🗄 저장소 누적: {store.count(product_id)}건 ({store_path})")
+
+    print("\n====================================")
+    print(f"✅ 총 리뷰 수집 완료: {writer.count}")
+    print(f"📁 {writer.path} 저장됨")
+    print(f"⏱ 단계별 시간: {timer.summary()}")
+    print("====================================")
+    timer.save(timings_path(writer.path, hidden=bool(dataset)))
+    return writer.path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스마트스토어 리뷰 수집 (CLI)")
+    parser.add_argument("url", nargs="?", default="https://smartstore.naver.com/contentking/products/10639139232")
+    parser.add_argument("--pages", type=int, default=13)
+    parser.add_argument("--incremental", action="store_true", help="이미 저장된 리뷰만 나오는 페이지에서 중단")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--out", help="저장 파일 (기본: reviews.<형식>)")
+    parser.add_argument("--dataset", help="상품별 파티션 데이터셋 폴더 (지정하면 --out 대신 여기에 추가)")
+    args = parser.parse_args()
+    extract_reviews_to_csv(args.url, args.pages, args.incremental, out_path=args.out, fmt=args.format, dataset=args.dataset)
@@ -0,0 +1,89 @@
+# smartstore_review_store.py
+"""
+로컬 SQLite 리뷰 저장소
+- (상품 id, 리뷰 fingerprint) 키로 한 번 본 리뷰를 계속 기억
+- 증분 수집: 한 페이지의 리뷰가 전부 이미 저장된 것이면 거기서 페이지 넘기기를 멈춤
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, Set, Tuple
+
+DEFAULT_STORE_PATH = os.getenv("REVIEW_STORE_PATH", "reviews.sqlite3")
+
+_PRODUCT_ID = re.compile(r"/products/(\d+)")
+
+
+def product_id_from_url(url: str) -> str:
+    m = _PRODUCT_ID.search(url)
+    if m:
+        return m.group(1)
+    # 상품 번호가 없는 URL 은 쿼리를 뺀 주소 자체를 id 로 사용
+    return url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+
+
+class ReviewStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reviews (
+                product_id  TEXT    NOT NULL,
+                fingerprint INTEGER NOT NULL,
+                nickname    TEXT,
+                date        TEXT,
+                rating      TEXT,
+                option      TEXT,
+                auto_label  TEXT,
+                content     TEXT,
+                image_count INTEGER,
+                first_seen  REAL,
+                PRIMARY KEY (product_id, fingerprint)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def merge(self, product_id: str, items: Iterable[Tuple[int, dict]]) -> Set[int]:
+        """
+        (fingerprint, GUI/CLI 형태 dict) 목록을 저장하고, 이 호출 전에 이미 있던 fingerprint 를 돌려줌.
+        """
+        items = list(items)
+        if not items:
+            return set()
+        fps = [fp for fp, _ in items]
+        now = time.time()
+        with self._lock, self._conn:
+            placeholders = ",".join("?" * len(fps))
+            known = {
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT fingerprint FROM reviews WHERE product_id = ? AND fingerprint IN ({placeholders})",
+                    [product_id, *fps],
+                )
+            }
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (product_id, fp, r["nickname"], r["date"], str(r["rating"]), r["option"],
+                     r["auto_label"], r["content"], r["image_count"], now)
+                    for fp, r in items
+                    if fp not in known
+                ],
+            )
+        return known
+
+    def count(self, product_id: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reviews WHERE product_id = ?", (product_id,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,164 @@
+# smartstore_review_xhr.py
+"""
+리뷰 XHR 캡처 엔진
+- 리뷰 iframe 은 JSON 백엔드에서 채워지므로, 렌더링된 HTML 을 다시 파싱하지 않고
+  응답 JSON 을 바로 필드 행(smartstore_review_parser.FIELDS)으로 변환
+- 응답 필드명은 공개 스펙이 아니라서 후보 키 목록으로 최대한 따라감
+- 페이로드를 못 잡으면 호출 쪽에서 DOM 파싱으로 fallback
+"""
+
+import asyncio
+import logging
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+logger = logging.getLogger("scraper")
+
+REVIEW_URL_HINTS = ("review",)
+
+LIST_KEYS = ("contents", "reviews", "reviewList", "items", "list", "data")
+NICKNAME_KEYS = ("writerMemberNickname", "writerNickname", "writerMemberMaskedId", "writerMemberId", "nickname")
+DATE_KEYS = ("createDate", "createdDate", "reviewDate", "createdAt", "date")
+RATING_KEYS = ("reviewScore", "score", "rating", "starScore")
+CONTENT_KEYS = ("reviewContent", "content", "body")
+OPTION_KEYS = ("productOptionContent", "optionContent", "option")
+ATTACH_KEYS = ("reviewAttaches", "attaches", "images", "photos")
+
+# 화면에서 본문 앞에 붙는 태그
+REVIEW_TYPE_TAGS = {"AFTER_USE": "한달사용"}
+
+_ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+KST = timezone(timedelta(hours=9))  # 화면 날짜는 한국 시간 기준 (서버/PC 시간대와 무관하게 DOM 결과와 맞춤)
+
+
+def _first(item: dict, keys, default=None):
+    for k in keys:
+        v = item.get(k)
+        if v not in (None, ""):
+            return v
+    return default
+
+
+def format_review_date(value) -> str:
+    """화면 표기(24.11.25., 한국 시간)에 맞춤"""
+    if value in (None, ""):
+        return ""
+    if isinstance(value, (int, float)):
+        ts = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(ts, KST).strftime("%y.%m.%d.")
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if parsed.tzinfo is not None:
+            return parsed.astimezone(KST).strftime("%y.%m.%d.")
+    except ValueError:
+        pass
+    m = _ISO_DATE.match(str(value))
+    if m:
+        return f"{m.group(1)[2:]}.{m.group(2)}.{m.group(3)}."
+    return str(value)
+
+
+def _looks_like_review(item) -> bool:
+    return isinstance(item, dict) and _first(item, CONTENT_KEYS) is not None and _first(item, RATING_KEYS) is not None
+
+
+def _find_review_list(data, depth: int = 0) -> Optional[list]:
+    if depth > 4:
+        return None
+    if isinstance(data, list):
+        if data and all(_looks_like_review(x) for x in data):
+            return data
+        return None
+    if isinstance(data, dict):
+        for k in LIST_KEYS:
+            found = _find_review_list(data.get(k), depth + 1)
+            if found is not None:
+                return found
+        for v in data.values():
+            if isinstance(v, (dict, list)):
+                found = _find_review_list(v, depth + 1)
+                if found is not None:
+                    return found
+    return None
+
+
+def review_fields_from_item(item: dict) -> tuple:
+    tags = []
+    tag = REVIEW_TYPE_TAGS.get(str(item.get("reviewType", "")).upper())
+    if tag:
+        tags.append(tag)
+    if item.get("repurchase") is True:
+        tags.append("재구매")
+
+    attaches = _first(item, ATTACH_KEYS, [])
+    # 닉네임 키가 아예 없으면 None, 있는데 비어 있으면 "" (DOM 에서 닉네임 요소가 없을 때/비어 있을 때와 같게)
+    nickname = _first(item, NICKNAME_KEYS)
+    if nickname is None and any(k in item for k in NICKNAME_KEYS):
+        nickname = ""
+    return (
+        None if nickname is None else str(nickname).strip(),
+        format_review_date(_first(item, DATE_KEYS)),
+        str(_first(item, RATING_KEYS, "")).strip(),
+        str(_first(item, OPTION_KEYS, "")).strip().split("\n")[0].strip(),
+        "",
+        tags,
+        " ".join(str(_first(item, CONTENT_KEYS, "")).split()),
+        len(attaches) if isinstance(attaches, list) else 0,
+    )
+
+
+def decode_review_payload(data) -> Optional[List[tuple]]:
+    """리뷰 목록처럼 생긴 JSON 이면 필드 행 목록, 아니면 None"""
+    items = _find_review_list(data)
+    if items is None:
+        return None
+    return [review_fields_from_item(x) for x in items]
+
+
+class ReviewXhrCollector:
+    """page 의 response 이벤트(iframe 포함)에서 리뷰 JSON 을 가로채 페이지 단위로 쌓아둠"""
+
+    def __init__(self, page):
+        self._page = page
+        self._batches = deque()
+        self._event = asyncio.Event()
+        self.payloads = 0
+        page.on("response", self._on_response)
+
+    async def _on_response(self, response):
+        try:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if not any(h in response.url.lower() for h in REVIEW_URL_HINTS):
+                return
+            rows = decode_review_payload(await response.json())
+        except Exception:
+            return
+        if rows is None:
+            return
+        self.payloads += 1
+        self._batches.append(rows)
+        self._event.set()
+
+    async def next_batch(self, timeout: float) -> Optional[List[tuple]]:
+        """
+        현재 페이지의 리뷰 행. 그 사이 여러 응답이 왔으면 마지막 것(현재 화면 상태)을 사용.
+        timeout 안에 못 받으면 None.
+        """
+        if not self._batches:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        rows = self._batches[-1]
+        self._batches.clear()
+        return rows
+
+    def detach(self):
+        try:
+            self._page.remove_listener("response", self._on_response)
+        except Exception:
+            pass
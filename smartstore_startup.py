@@ -0,0 +1,67 @@
+# smartstore_startup.py
+"""
+GUI 시작 시간 측정
+- 모듈 import 구간별 시간 + 첫 창 표시까지 걸린 시간
+- 무거운 모듈(playwright, lxml 파서)은 창이 뜬 뒤 백그라운드에서 미리 import 하면서 시간 기록
+- 빌드끼리 비교할 수 있도록 JSONL 파일에 한 줄씩 누적
+"""
+
+import importlib
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+class StartupReport:
+    def __init__(self, t0: Optional[float] = None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks: Dict[str, float] = {}    # 시작 후 경과 시간 (초)
+        self.imports: Dict[str, float] = {}  # 모듈별 import 소요 시간 (초)
+        self._last = self.t0
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> float:
+        """시작 후 경과 시간 기록 (첫 창 표시 등)"""
+        now = time.perf_counter()
+        with self._lock:
+            self.marks[name] = round(now - self.t0, 4)
+            self._last = now
+        return self.marks[name]
+
+    def span(self, name: str) -> float:
+        """이전 mark 이후 구간을 import 항목으로 기록"""
+        now = time.perf_counter()
+        with self._lock:
+            self.imports[name] = round(now - self._last, 4)
+            self._last = now
+        return self.imports[name]
+
+    def timed_import(self, module: str):
+        t = time.perf_counter()
+        mod = importlib.import_module(module)
+        with self._lock:
+            self.imports.setdefault(module, round(time.perf_counter() - t, 4))
+        return mod
+
+    def as_dict(self) -> dict:
+        return {
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "marks": dict(self.marks),
+            "imports": dict(self.imports),
+        }
+
+    def summary(self) -> str:
+        parts = [f"{k} {v:.2f}s" for k, v in self.marks.items()]
+        heavy = sorted(self.imports.items(), key=lambda kv: -kv[1])[:4]
+        return " / ".join(parts) + " | import: " + ", ".join(f"{k} {v:.2f}s" for k, v in heavy)
+
+    def save(self, path: str):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.as_dict(), ensure_ascii=False) + "\n")
@@ -0,0 +1,73 @@
+# smartstore_timing.py
+"""
+수집 단계별 시간 측정 (어디서 시간이 가는지 확인용)
+- 단계: goto / block_check / review_frame / scroll / content / parse / paginate ...
+- span("단계") 로 감싼 구간의 시간을 전체 합계와 페이지별로 누적 (page(n) 이후 구간은 n 페이지 몫)
+- perf_counter 두 번 + dict 덧셈뿐이라 항상 켜 둬도 부담 없음
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class StageTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.pages: Dict[int, Dict[str, float]] = {}
+        self._page: Optional[int] = None
+
+    def page(self, n: int):
+        """이후 구간을 n 페이지 몫으로 기록"""
+        self._page = n
+        self.pages.setdefault(n, {})
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+        if self._page is not None:
+            page = self.pages[self._page]
+            page[stage] = page.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def span(self, stage: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - t)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def as_dict(self) -> dict:
+        total = self.elapsed()
+        return {
+            "total": round(total, 3),
+            "stages": {k: {"seconds": round(v, 3), "count": self.counts[k]} for k, v in self.stages.items()},
+            "other": round(max(0.0, total - sum(self.stages.values())), 3),
+            "pages": [{"page": n, **{k: round(v, 3) for k, v in stages.items()}} for n, stages in sorted(self.pages.items())],
+        }
+
+    def summary(self) -> str:
+        """시간이 큰 단계 순으로 한 줄 요약"""
+        total = self.elapsed()
+        parts = [f"{k} {v:.2f}s ({v / total:.0%})" for k, v in sorted(self.stages.items(), key=lambda kv: -kv[1])]
+        return f"총 {total:.2f}s | " + ", ".join(parts)
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
+
+
+def timings_path(output_path: str, hidden: bool = False) -> str:
+    """
+    결과 파일 옆 <이름>.timings.json
+    hidden: 파티션 데이터셋 안이면 _<이름>.timings.json (pyarrow 데이터셋 탐색은 _ / . 로 시작하는 파일을 건너뜀)
+    """
+    folder, name = os.path.split(os.path.splitext(output_path)[0] + ".timings.json")
+    return os.path.join(folder, "_" + name if hidden else name)